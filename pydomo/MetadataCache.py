@@ -0,0 +1,160 @@
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from pydomo.common import Metrics
+
+DEFAULT_TTL = 300
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+# Responses under these path segments are data or job state, not metadata
+UNCACHED_SEGMENTS = frozenset(['data', 'executions', 'query', 'oauth'])
+# Path segments that name a collection-level view rather than one object
+COLLECTION_SEGMENTS = frozenset(['search'])
+# Writes to one family that change the collection views of another,
+# e.g. deleting a DataSet removes its Stream
+RELATED_FAMILIES = {
+    'datasets': ('streams',),
+    'streams': ('datasets',),
+}
+
+_Entry = namedtuple('_Entry', ['response', 'size', 'expires', 'resource'])
+
+
+class MetadataCache(object):
+    """Read-through cache of GET responses for metadata endpoints.
+
+    Successful JSON GET responses (DataSets, Streams, users, groups,
+    pages, accounts) are kept for `ttl` seconds. The cache holds at most
+    `max_entries` responses and `max_bytes` of response bodies, evicting
+    the least recently used ones first. Expired entries that came with an
+    ETag or Last-Modified header are revalidated with a conditional
+    request, and kept if the API answers 304 Not Modified.
+
+    Any other request sent through the transport invalidates the entries
+    of the object it targets, plus the lists and searches of its family,
+    so updates, deletes and PDP changes made through the same client are
+    visible to the next read. Changes made by other clients are only seen
+    once entries expire.
+
+    'hits', 'misses', 'revalidations', 'evictions' and 'invalidations' are
+    counted in `metrics`.
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.metrics = Metrics()
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def resource(path):
+        """Return the (family, object id) a path belongs to.
+
+        The id is None for collection-level paths such as lists and
+        searches.
+        """
+        parts = [part for part in path.split('?')[0].split('/') if part]
+        if parts and parts[0].startswith('v') and parts[0][1:].isdigit():
+            parts = parts[1:]
+        family = parts[0] if parts else ''
+        object_id = parts[1] if len(parts) > 1 and parts[1] not in COLLECTION_SEGMENTS else None
+        return family, object_id
+
+    @staticmethod
+    def cacheable(path):
+        return not UNCACHED_SEGMENTS.intersection(path.split('?')[0].split('/'))
+
+    def fetch(self, path, params, send):
+        """Return the response for GET `path`, calling `send` on a miss.
+
+        `send(headers)` sends the request with the given extra headers and
+        returns the 'requests' response.
+        """
+        key = (path, tuple(sorted((str(k), str(v)) for k, v in (params or {}).items())))
+        with self._lock:
+            entry = self._entries.get(key)
+            generation = self._generation
+            if entry is not None and entry.expires > time.monotonic():
+                self._entries.move_to_end(key)
+                self.metrics.increment('hits')
+                return entry.response
+
+        validators = self._validators(entry.response) if entry is not None else {}
+        response = send(validators)
+        if validators and response.status_code == 304:
+            response.close()
+            self.metrics.increment('revalidations')
+            self._store(key, entry.response, entry.size, generation)
+            return entry.response
+
+        self.metrics.increment('misses')
+        if response.status_code == 200:
+            self._store(key, response, len(response.content), generation)
+        return response
+
+    def invalidate(self, path):
+        """Drop the entries a write to `path` may have changed."""
+        family, object_id = self.resource(path)
+        related = RELATED_FAMILIES.get(family, ())
+        with self._lock:
+            self._generation += 1
+            stale = [key for key, entry in self._entries.items()
+                     if self._is_stale(entry.resource, family, object_id, related)]
+            for key in stale:
+                self._remove(key)
+        if stale:
+            self.metrics.increment('invalidations', len(stale))
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Return the counters along with the current entry count and size."""
+        with self._lock:
+            stats = {'entries': len(self._entries), 'bytes': self._bytes}
+        stats.update(self.metrics.snapshot())
+        return stats
+
+    @staticmethod
+    def _is_stale(resource, family, object_id, related):
+        entry_family, entry_id = resource
+        if entry_family == family:
+            return entry_id is None or entry_id == object_id
+        return entry_family in related and entry_id is None
+
+    @staticmethod
+    def _validators(response):
+        validators = {}
+        if response.headers.get('ETag'):
+            validators['If-None-Match'] = response.headers['ETag']
+        if response.headers.get('Last-Modified'):
+            validators['If-Modified-Since'] = response.headers['Last-Modified']
+        return validators
+
+    def _store(self, key, response, size, generation):
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            # A write invalidated the cache while this response was in flight
+            if generation != self._generation:
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _Entry(response, size, time.monotonic() + self.ttl, self.resource(key[0]))
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.metrics.increment('evictions')
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
@@ -0,0 +1,104 @@
+import asyncio
+import threading
+import time
+
+ENDPOINT_FAMILIES = ('datasets', 'streams', 'users', 'groups', 'pages', 'accounts', 'oauth')
+
+
+class TokenBucket(object):
+    """Allow `rate` operations per second with bursts of up to `capacity`.
+
+    Callers reserve a token and are told how long to wait for it, so the
+    same bucket can pace threads (`acquire`) and asyncio tasks
+    (`acquire_async`) without either blocking the other. Reservations are
+    handed out in arrival order.
+    """
+
+    def __init__(self, rate, capacity=None):
+        if rate <= 0:
+            raise ValueError('rate must be positive')
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(rate, 1))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens=1):
+        """Take `tokens` and return the seconds to wait before using them."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self, tokens=1):
+        wait = self.reserve(tokens)
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens=1):
+        wait = self.reserve(tokens)
+        if wait:
+            await asyncio.sleep(wait)
+        return wait
+
+
+class RateLimiter(object):
+    """Client-side rate limits for Domo API calls.
+
+    Every call takes a token from the global bucket (if `global_rate` is
+    set) and from the bucket of its endpoint family, determined from the
+    URL: datasets, streams, users, groups, pages, accounts or oauth.
+    Rates are in requests per second; bursts default to one second's
+    worth of requests.
+
+    >>> limiter = RateLimiter(global_rate=20, family_rates={'groups': 5})
+    >>> domo = Domo(client_id, client_secret, rate_limiter=limiter)
+
+    A limiter can be shared by several Domo / AsyncDomo instances.
+    """
+
+    def __init__(self, global_rate=None, global_burst=None, family_rates=None, family_bursts=None):
+        family_rates = family_rates or {}
+        family_bursts = family_bursts or {}
+        unknown = set(family_rates).difference(ENDPOINT_FAMILIES)
+        if unknown:
+            raise ValueError('Unknown endpoint families: {}'.format(sorted(unknown)))
+        self.global_bucket = TokenBucket(global_rate, global_burst) if global_rate else None
+        self.family_buckets = {family: TokenBucket(rate, family_bursts.get(family))
+                               for family, rate in family_rates.items()}
+
+    @staticmethod
+    def family(url):
+        """Endpoint family of an API path such as '/v1/datasets/abc'."""
+        parts = [p for p in url.split('?')[0].split('/') if p]
+        if parts and parts[0] == 'oauth':
+            return 'oauth'
+        if len(parts) > 1 and parts[1] in ENDPOINT_FAMILIES:
+            return parts[1]
+        return None
+
+    def reserve(self, url):
+        wait = 0.0
+        if self.global_bucket is not None:
+            wait = self.global_bucket.reserve()
+        bucket = self.family_buckets.get(self.family(url))
+        if bucket is not None:
+            wait = max(wait, bucket.reserve())
+        return wait
+
+    def acquire(self, url):
+        wait = self.reserve(url)
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, url):
+        wait = self.reserve(url)
+        if wait:
+            await asyncio.sleep(wait)
+        return wait
@@ -0,0 +1,62 @@
+import random
+import time
+from email.utils import parsedate_to_datetime
+
+RETRY_STATUSES = frozenset([429, 502, 503, 504])
+IDEMPOTENT_METHODS = frozenset(['GET', 'PUT', 'DELETE'])
+
+
+class RetryPolicy(object):
+    """When and how long to wait before re-sending a failed request.
+
+    - Responses with a status in `statuses` are retried for idempotent
+      methods (GET, PUT, DELETE). A 429 means the request was rejected
+      before being processed, so it is retried for every method
+    - Connection errors and timeouts are retried for idempotent methods
+    - Waits use exponential backoff with full jitter, capped at
+      `max_backoff` seconds; a `Retry-After` header is honored (up to
+      `max_retry_after` seconds) when `respect_retry_after` is set
+
+    Pass `RetryPolicy(max_retries=0)` to disable retries.
+    """
+
+    def __init__(self, max_retries=5, backoff_factor=0.5, max_backoff=60,
+                 statuses=RETRY_STATUSES, methods=IDEMPOTENT_METHODS,
+                 respect_retry_after=True, max_retry_after=300):
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.statuses = frozenset(statuses)
+        self.methods = frozenset(methods)
+        self.respect_retry_after = respect_retry_after
+        self.max_retry_after = max_retry_after
+
+    def retry_response(self, method, status_code, attempt):
+        if attempt >= self.max_retries or status_code not in self.statuses:
+            return False
+        return status_code == 429 or method in self.methods
+
+    def retry_error(self, method, attempt):
+        return attempt < self.max_retries and method in self.methods
+
+    def backoff(self, attempt, response=None):
+        """Seconds to wait before retry number `attempt` (starting at 0)."""
+        if response is not None and self.respect_retry_after:
+            retry_after = self._parse_retry_after(response.headers.get('Retry-After'))
+            if retry_after is not None:
+                return min(retry_after, self.max_retry_after)
+        ceiling = min(self.max_backoff, self.backoff_factor * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    @staticmethod
+    def _parse_retry_after(value):
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
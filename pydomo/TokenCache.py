@@ -0,0 +1,82 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+from pydomo.common import FileLock, default_cache_dir
+
+
+class FileTokenCache(object):
+    """Share access tokens between processes through files on disk.
+
+    Tokens are stored per client_id + scope + api_host in `cache_dir`
+    (default: the 'tokens' directory under the pydomo cache root), one
+    file per key, readable only by the current user. Reads and renewals
+    happen under a file lock, so processes starting together make one
+    token request between them and then reuse its result until the
+    token's JWT expiration.
+    """
+
+    def __init__(self, cache_dir=None):
+        if cache_dir is None:
+            cache_dir = default_cache_dir('tokens')
+        else:
+            cache_dir = os.path.expanduser(cache_dir)
+            os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+        self.cache_dir = cache_dir
+
+    @staticmethod
+    def key(client_id, scope, api_host):
+        scope = ' '.join(sorted(scope)) if scope else ''
+        raw = '\n'.join([str(client_id), scope, api_host])
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def load_or_fetch(self, key, fetch, min_ttl=0, exclude=None):
+        """Return a cached (access_token, expiration), calling `fetch` if needed.
+
+        A cached token is reused only if it expires more than `min_ttl`
+        seconds from now and is not `exclude` (a token known to be stale
+        or rejected). Tokens fetched here are written back to the cache.
+        """
+        path = os.path.join(self.cache_dir, key + '.json')
+        with FileLock(path + '.lock'):
+            cached = self._read(path)
+            if (cached is not None and cached['access_token'] != exclude
+                    and cached['expiration'] - min_ttl > time.time()):
+                return cached['access_token'], cached['expiration']
+
+            access_token, expiration = fetch()
+            # Tokens without a readable expiration cannot be safely shared
+            if expiration:
+                self._write(path, {'access_token': access_token, 'expiration': expiration})
+            return access_token, expiration
+
+    def clear(self, key):
+        path = os.path.join(self.cache_dir, key + '.json')
+        with FileLock(path + '.lock'):
+            if os.path.exists(path):
+                os.remove(path)
+
+    @staticmethod
+    def _read(path):
+        try:
+            with open(path, 'r') as token_file:
+                cached = json.load(token_file)
+            return {'access_token': cached['access_token'],
+                    'expiration': float(cached['expiration'])}
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    @staticmethod
+    def _write(path, cached):
+        handle, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'w') as token_file:
+                json.dump(cached, token_file)
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
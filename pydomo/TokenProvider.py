@@ -0,0 +1,84 @@
+import threading
+import time
+
+DEFAULT_REFRESH_MARGIN = 60
+
+
+class TokenProvider(object):
+    """Thread-safe holder of an OAuth access token.
+
+    - Callers that find the token expired share a single renewal; the
+      others wait for it and reuse its result
+    - Within `refresh_margin` seconds of expiry the token is renewed on a
+      background thread, while callers keep using the current token
+    - `invalidate(token)` forces the next caller to renew, e.g. after the
+      API rejected the token with a 401
+
+    `fetch` is a callable returning an (access_token, expiration) tuple,
+    with the expiration as a UTC timestamp.
+    """
+
+    def __init__(self, fetch, logger, refresh_margin=DEFAULT_REFRESH_MARGIN):
+        self._fetch = fetch
+        self.logger = logger
+        self.refresh_margin = refresh_margin
+        self.access_token = None
+        self.expiration = 0
+        self._renew_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self._refreshing = False
+
+    def get_token(self):
+        token, expiration = self.access_token, self.expiration
+        now = time.time()
+        if token is not None and now < expiration - self.refresh_margin:
+            return token
+        if token is not None and now < expiration:
+            self._refresh_in_background(token)
+            return token
+        self.logger.debug("Access token is expired")
+        return self._renew(token)
+
+    def renew(self):
+        """Fetch a new token unconditionally."""
+        with self._renew_lock:
+            return self._store(*self._fetch())
+
+    def invalidate(self, token):
+        """Mark `token` as unusable if it is still the current token."""
+        with self._state_lock:
+            if self.access_token == token:
+                self.expiration = 0
+
+    def _renew(self, stale_token):
+        with self._renew_lock:
+            # Another caller may have renewed while this one waited
+            if self.access_token != stale_token and time.time() < self.expiration:
+                return self.access_token
+            return self._store(*self._fetch())
+
+    def _store(self, access_token, expiration):
+        with self._state_lock:
+            self.access_token = access_token
+            self.expiration = expiration
+        return access_token
+
+    def _refresh_in_background(self, token):
+        with self._state_lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        thread = threading.Thread(target=self._background_refresh, args=(token,),
+                                  name='pydomo-token-refresh', daemon=True)
+        thread.start()
+
+    def _background_refresh(self, token):
+        try:
+            self._renew(token)
+        except Exception as err:
+            # The current token is still valid; a later call will retry
+            self.logger.debug('Background token renewal failed. '
+                              '{}: {}'.format(type(err).__name__, err))
+        finally:
+            with self._state_lock:
+                self._refreshing = False
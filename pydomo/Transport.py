@@ -1,10 +1,19 @@
 import requests
 import json
 import base64
+import time
 from collections import namedtuple
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
 from requests_toolbelt.utils import dump
-from datetime import datetime, timezone
+from urllib3.util.retry import Retry
+
+from pydomo.common import Metrics
+from pydomo.RetryPolicy import RetryPolicy
+from pydomo.TokenProvider import DEFAULT_REFRESH_MARGIN, TokenProvider
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
 
 
 class DomoAPITransport:
@@ -13,16 +22,76 @@ class DomoAPITransport:
 
     OAuth2 authentication is handled automatically, as well as the
     serialization and deserialization of objects.
+
+    All requests are sent through a single pooled 'requests.Session', so
+    connections to the API host are kept alive and reused. The pool is
+    configured with:
+      - `pool_connections`: number of per-host pools to cache
+      - `pool_maxsize`: max connections kept alive per host; set this to
+        at least the number of threads sharing the transport
+      - `max_retries`: connection-level retries performed by the adapter
+        (failed DNS lookups, refused connections, dropped sockets)
+      - `pool_block`: block when the pool is exhausted instead of opening
+        a throwaway connection
+
+    The access token is managed by a thread-safe TokenProvider, so one
+    transport can be shared by many threads: concurrent callers trigger a
+    single renewal, the token is renewed in the background
+    `token_refresh_margin` seconds before it expires, and a request
+    rejected with a 401 is retried once with a fresh token.
+
+    With a `token_cache` (see FileTokenCache), tokens are shared with
+    other processes using the same client id, scope and API host, and a
+    new token is only requested when no cached one is still valid.
+
+    With `lazy_auth`, no token is requested until the first API call.
+
+    Throttled (429) and transiently failing (502/503/504, dropped
+    connections) requests are re-sent according to `retry_policy`
+    (default: RetryPolicy()), as long as the body can be replayed: bytes,
+    strings and seekable files are, generators are not. Counters such as
+    'requests', 'retries' and 'retry_sleep_seconds' are kept in
+    `metrics`.
+
+    With a `rate_limiter` (see RateLimiter), every request, including
+    retries and token requests, first waits for its endpoint family's and
+    the global rate limit; the time waited is counted as
+    'rate_limit_wait_seconds'.
+
+    With a `metadata_cache` (see MetadataCache), JSON GET requests for
+    metadata are answered from the cache while fresh, and every other
+    request invalidates the cached entries of the object it changes.
     """
 
-    def __init__(self, client_id, client_secret, api_host, use_https, logger, request_timeout, scope):
+    def __init__(self, client_id, client_secret, api_host, use_https, logger, request_timeout, scope,
+                 pool_connections=DEFAULT_POOL_CONNECTIONS, pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                 max_retries=0, pool_block=False, token_refresh_margin=DEFAULT_REFRESH_MARGIN,
+                 token_cache=None, lazy_auth=False, retry_policy=None, rate_limiter=None,
+                 metadata_cache=None):
         self.apiHost = self._build_apihost(api_host, use_https)
         self.clientId = client_id
         self.clientSecret = client_secret
         self.logger = logger
         self.request_timeout = request_timeout
         self.scope = scope
-        self._renew_access_token()
+        self.session = self._build_session(pool_connections, pool_maxsize, max_retries, pool_block)
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.metrics = Metrics()
+        self.rate_limiter = rate_limiter
+        self.metadata_cache = metadata_cache
+        self.token_cache = token_cache
+        fetch = self._fetch_access_token if token_cache is None else self._load_or_fetch_access_token
+        self.token_provider = TokenProvider(fetch, logger, token_refresh_margin)
+        if not lazy_auth:
+            self._renew_access_token()
+
+    @property
+    def access_token(self):
+        return self.token_provider.access_token
+
+    @property
+    def token_expiration(self):
+        return self.token_provider.expiration
 
     @staticmethod
     def _build_apihost(host, use_https):
@@ -32,9 +101,58 @@ class DomoAPITransport:
             host = 'http://' + host
         return host
 
+    @staticmethod
+    def _build_session(pool_connections, pool_maxsize, max_retries, pool_block):
+        # Status-based retries are not handled here; the adapter only
+        # retries failures that happen before a response is received.
+        retries = Retry(total=max_retries, connect=max_retries, read=0,
+                        status=0, redirect=0, raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=pool_connections,
+                              pool_maxsize=pool_maxsize,
+                              max_retries=retries,
+                              pool_block=pool_block)
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def pool_stats(self):
+        """Return connection pool statistics, keyed by 'scheme://host:port'.
+
+        Each entry reports the number of connections opened, the number of
+        requests sent, the connections currently idle in the pool and the
+        pool's max size.
+        """
+        stats = {}
+        adapters = {id(a): a for a in self.session.adapters.values()}
+        for adapter in adapters.values():
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                host = '{}://{}:{}'.format(key.key_scheme, key.key_host, key.key_port)
+                stats[host] = {
+                    'connections_opened': pool.num_connections,
+                    'requests': pool.num_requests,
+                    'idle_connections': pool.pool.qsize() if pool.pool is not None else 0,
+                    'maxsize': pool.pool.maxsize if pool.pool is not None else 0,
+                }
+        return stats
+
+    def close(self):
+        """Close all pooled connections."""
+        self.session.close()
+
     def get(self, url, params):
         headers = self._headers_default_receive_json()
-        return self.request(url, HTTPMethod.GET, headers, params)
+        if self.metadata_cache is None or not self.metadata_cache.cacheable(url):
+            return self.request(url, HTTPMethod.GET, headers, params)
+
+        def send(validators):
+            headers.update(validators)
+            return self.request(url, HTTPMethod.GET, headers, params)
+        return self.metadata_cache.fetch(url, params, send)
 
     def get_csv(self, url, params):
         headers = self._headers_receive_csv()
@@ -68,6 +186,15 @@ class DomoAPITransport:
         return self.request(url, HTTPMethod.DELETE, headers)
 
     def request(self, url, method, headers, params=None, body=None):
+        if method == HTTPMethod.GET or self.metadata_cache is None:
+            return self._send(url, method, headers, params, body)
+        try:
+            return self._send(url, method, headers, params, body)
+        finally:
+            self.metadata_cache.invalidate(url)
+
+    def _send(self, url, method, headers, params=None, body=None):
+        path = url
         url = self.apiHost + url
         self.logger.debug('{} {} {}'.format(method, url, body))
         request_args = {'method': method, 'url': url, 'headers': headers,
@@ -75,15 +202,86 @@ class DomoAPITransport:
         if self.request_timeout:
             request_args['timeout'] = self.request_timeout
 
-        # Expiration date should be in UTC
-        if datetime.now(timezone.utc).timestamp() > self.token_expiration:
-            self.logger.debug("Access token is expired")
-            self._renew_access_token()
-            headers['Authorization'] = 'bearer ' + self.access_token
+        body_position = self._body_position(body)
+        renewed_token = False
+        attempt = 0
+        while True:
+            token = self.token_provider.get_token()
+            headers['Authorization'] = 'bearer ' + token
+            self._throttle(path)
+            self.metrics.increment('requests')
+            try:
+                response = self.session.request(**request_args)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as err:
+                if not (self.retry_policy.retry_error(method, attempt)
+                        and self._rewind_body(body, body_position)):
+                    raise
+                delay = self.retry_policy.backoff(attempt)
+                reason = type(err).__name__
+            else:
+                if (response.status_code == requests.codes.unauthorized and not renewed_token
+                        and self._rewind_body(body, body_position)):
+                    self.logger.debug("Access token was rejected, retrying with a new token")
+                    response.close()
+                    self.token_provider.invalidate(token)
+                    renewed_token = True
+                    continue
+                if not (self.retry_policy.retry_response(method, response.status_code, attempt)
+                        and self._rewind_body(body, body_position)):
+                    if attempt and response.status_code in self.retry_policy.statuses:
+                        self.metrics.increment('retries_exhausted')
+                    return response
+                delay = self.retry_policy.backoff(attempt, response)
+                reason = response.status_code
+                response.close()
+
+            attempt += 1
+            self.metrics.increment('retries')
+            self.metrics.increment('retry_sleep_seconds', delay)
+            self.logger.debug('Retrying {} {} ({}) in {:.2f}s, attempt {}'
+                              .format(method, url, reason, delay, attempt))
+            time.sleep(delay)
+
+    def _throttle(self, path):
+        if self.rate_limiter is not None:
+            waited = self.rate_limiter.acquire(path)
+            if waited:
+                self.metrics.increment('rate_limit_wait_seconds', waited)
 
-        return requests.request(**request_args)
+    @staticmethod
+    def _body_position(body):
+        if hasattr(body, 'seek') and hasattr(body, 'tell'):
+            try:
+                return body.tell()
+            except (OSError, ValueError):
+                return None
+        return None
+
+    @staticmethod
+    def _rewind_body(body, position):
+        """Prepare `body` to be sent again, returning False if it cannot be."""
+        if body is None or isinstance(body, (str, bytes, bytearray, dict)):
+            return True
+        if position is None:
+            return False
+        try:
+            body.seek(position)
+            return True
+        except (OSError, ValueError):
+            return False
 
     def _renew_access_token(self):
+        self.token_provider.renew()
+
+    def _load_or_fetch_access_token(self):
+        key = self.token_cache.key(self.clientId, self.scope, self.apiHost)
+        # The provider only asks for a token when its current one is
+        # unusable, so never hand that one back from the cache
+        return self.token_cache.load_or_fetch(key, self._fetch_access_token,
+                                              min_ttl=self.token_provider.refresh_margin,
+                                              exclude=self.token_provider.access_token)
+
+    def _fetch_access_token(self):
         self.logger.debug("Renewing Access Token")
         # scope == None means use all scopes from client
         scope = ' '.join(self.scope) if self.scope else None
@@ -97,10 +295,11 @@ class DomoAPITransport:
         if self.request_timeout:
             request_args['timeout'] = self.request_timeout
 
-        response = requests.request(**request_args)
+        self._throttle('/oauth/token')
+        response = self.session.request(**request_args)
         if response.status_code == requests.codes.OK:
-            self.access_token = response.json()['access_token']
-            self.token_expiration = self._extract_expiration(self.access_token)
+            access_token = response.json()['access_token']
+            return access_token, self._extract_expiration(access_token)
         else:
             self.logger.debug('Error retrieving access token: ' + self.dump_response(response))
             raise Exception("Error retrieving a Domo API Access Token: " + response.text)
@@ -140,8 +339,8 @@ class DomoAPITransport:
         return json.dumps(obj, default=str)
 
     def _headers_default_receive_json(self):
+        # The Authorization header is added by request() at send time
         return {
-            'Authorization': 'bearer ' + self.access_token,
             'Accept': 'application/json'
         }
 
@@ -1,22 +1,86 @@
-from pydomo.Transport import DomoAPITransport
-from pydomo.datasets import DataSetClient
-from pydomo.datasets import DataSetRequest
-from pydomo.datasets import Schema
-from pydomo.datasets import Column
-from pydomo.datasets import ColumnType
-from pydomo.groups import GroupClient
-from pydomo.pages import PageClient
-from pydomo.streams import StreamClient
-from pydomo.users import UserClient
-from pydomo.users import CreateUserRequest
-from pydomo.accounts import AccountClient
-from pydomo.utilities import UtilitiesClient
-from pandas import read_csv
-from pandas import DataFrame
-from io import StringIO
+"""
+    pydomo - the Python3 Domo API SDK
+
+    Client classes and pandas are imported on first use, so scripts that
+    only manage users, groups or pages never load pandas, and
+    `Domo(..., lazy_auth=True)` defers the token request to the first API
+    call.
+"""
+import importlib
 import logging
 import json
 import csv
+import threading
+from io import TextIOWrapper
+
+from pydomo.common import (DEFAULT_COMMIT_INTERVAL, DEFAULT_FLUSH_INTERVAL, DEFAULT_LIST_WORKERS,
+                           DEFAULT_MEMBERSHIP_WORKERS, DEFAULT_PART_COMPRESS_LEVEL, DEFAULT_PART_KBYTES,
+                           DEFAULT_SPILL_BYTES, DEFAULT_UPLOAD_WORKERS, fetch_all_pages,
+                           pages_to_frame)
+from pydomo.Transport import DomoAPITransport
+
+# Names re-exported from pydomo, imported from their modules on first access
+_LAZY_EXPORTS = {
+    'DataSetClient': 'pydomo.datasets',
+    'DataSetRequest': 'pydomo.datasets',
+    'Schema': 'pydomo.datasets',
+    'Column': 'pydomo.datasets',
+    'ColumnType': 'pydomo.datasets',
+    'GroupClient': 'pydomo.groups',
+    'PageClient': 'pydomo.pages',
+    'StreamClient': 'pydomo.streams',
+    'UserClient': 'pydomo.users',
+    'CreateUserRequest': 'pydomo.users',
+    'AccountClient': 'pydomo.accounts',
+    'UtilitiesClient': 'pydomo.utilities',
+    'FileTokenCache': 'pydomo.TokenCache',
+    'RetryPolicy': 'pydomo.RetryPolicy',
+    'RateLimiter': 'pydomo.RateLimiter',
+    'MetadataCache': 'pydomo.MetadataCache',
+    'StreamIndex': 'pydomo.streams',
+    'StreamWriter': 'pydomo.streams',
+    'ExecutionCoordinator': 'pydomo.streams',
+    'AsyncDomo': 'pydomo.aio',
+    'read_csv': 'pandas',
+    'DataFrame': 'pandas',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        value = getattr(importlib.import_module(_LAZY_EXPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError("module 'pydomo' has no attribute '{}'".format(name))
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_EXPORTS))
+
+
+class _LazyClient(object):
+    """Domo attribute that builds its API client on first access."""
+    _lock = threading.Lock()
+
+    def __init__(self, module, class_name):
+        self.module = module
+        self.class_name = class_name
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, domo, owner=None):
+        if domo is None:
+            return self
+        with self._lock:
+            client = domo.__dict__.get(self.name)
+            if client is None:
+                client_class = getattr(importlib.import_module(self.module), self.class_name)
+                options = domo.__dict__.get('_client_options', {}).get(self.name, {})
+                client = client_class(domo.transport, domo.logger, **options)
+                domo.__dict__[self.name] = client
+        return client
+
 
 DOMO = """####################################################################################################
 ####################################################################################################
@@ -70,11 +134,62 @@ DOMO = """######################################################################
 ####################################################################################################
 ####################################################################################################"""
 
+# Optional Domo() keyword arguments passed through to DomoAPITransport
+TRANSPORT_KWARGS = (
+    'pool_connections',
+    'pool_maxsize',
+    'max_retries',
+    'pool_block',
+    'token_refresh_margin',
+    'lazy_auth',
+    'retry_policy',
+    'rate_limiter',
+)
+
 parent_logger = logging.getLogger('pydomo')
 parent_logger.setLevel(logging.WARNING)
 
 
+def resolve_credentials(client_id, client_secret, connection_file, api_host, use_https):
+    """Validate credential inputs, reading them from `connection_file` if given.
+
+    Returns a (client_id, client_secret, api_host, use_https) tuple.
+    """
+    if connection_file:
+        if client_id or client_secret:
+            raise ValueError("Cannot specify both connection_file and client_id/client_secret")
+        try:
+            import configparser
+            config = configparser.ConfigParser()
+            config.read(connection_file)
+            if 'client_auth' not in config:
+                raise ValueError("connection_file must contain a [client_auth] section")
+            client_auth = config['client_auth']
+            client_id = client_auth.get('client')
+            client_secret = client_auth.get('secret')
+
+            if not client_id or not client_secret:
+                raise ValueError("connection_file must contain both client and secret in [client_auth] section")
+            # Optional overrides from config
+            api_host = client_auth.get('api_host', api_host)
+            if 'use_https' in client_auth:
+                use_https = client_auth.get('use_https').lower() == 'true'
+        except Exception as e:
+            raise ValueError(f"Error reading connection_file: {str(e)}")
+    elif not client_id or not client_secret:
+        raise ValueError("Must provide either connection_file or both client_id and client_secret")
+    return client_id, client_secret, api_host, use_https
+
+
 class Domo:
+    datasets = _LazyClient('pydomo.datasets', 'DataSetClient')
+    groups = _LazyClient('pydomo.groups', 'GroupClient')
+    pages = _LazyClient('pydomo.pages', 'PageClient')
+    streams = _LazyClient('pydomo.streams', 'StreamClient')
+    users = _LazyClient('pydomo.users', 'UserClient')
+    accounts = _LazyClient('pydomo.accounts', 'AccountClient')
+    utilities = _LazyClient('pydomo.utilities', 'UtilitiesClient')
+
     def __init__(self, client_id=None, client_secret=None, connection_file=None, api_host='api.domo.com', **kwargs):
         if 'logger_name' in kwargs:
             self.logger = parent_logger.getChild(kwargs['logger_name'])
@@ -84,44 +199,60 @@ class Domo:
         timeout = kwargs.get('request_timeout', None)
         scope = kwargs.get('scope')
         use_https = kwargs.get('use_https', True)
+        transport_args = {k: kwargs[k] for k in TRANSPORT_KWARGS if k in kwargs}
+        token_cache = kwargs.get('token_cache')
+        if token_cache is True or isinstance(token_cache, str):
+            from pydomo.TokenCache import FileTokenCache
+            transport_args['token_cache'] = FileTokenCache(None if token_cache is True else token_cache)
+        elif token_cache:
+            transport_args['token_cache'] = token_cache
+        metadata_cache = kwargs.get('metadata_cache')
+        if metadata_cache is True:
+            from pydomo.MetadataCache import MetadataCache
+            transport_args['metadata_cache'] = MetadataCache()
+        elif metadata_cache:
+            transport_args['metadata_cache'] = metadata_cache
 
         if kwargs.get('log_level'):
             self.logger.setLevel(kwargs['log_level'])
-        self.logger.debug("\n" + DOMO + "\n")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("\n" + DOMO + "\n")
 
-        # Validate credential inputs
-        if connection_file:
-            if client_id or client_secret:
-                raise ValueError("Cannot specify both connection_file and client_id/client_secret")
-            try:
-                import configparser
-                config = configparser.ConfigParser()
-                config.read(connection_file)
-                if 'client_auth' not in config:
-                    raise ValueError("connection_file must contain a [client_auth] section")
-                client_auth = config['client_auth']
-                client_id = client_auth.get('client')
-                client_secret = client_auth.get('secret')
-
-                if not client_id or not client_secret:
-                    raise ValueError("connection_file must contain both client and secret in [client_auth] section")
-                # Optional overrides from config
-                api_host = client_auth.get('api_host', api_host)
-                if 'use_https' in client_auth:
-                    use_https = client_auth.get('use_https').lower() == 'true'
-            except Exception as e:
-                raise ValueError(f"Error reading connection_file: {str(e)}")
-        elif not client_id or not client_secret:
-            raise ValueError("Must provide either connection_file or both client_id and client_secret")
-
-        self.transport = DomoAPITransport(client_id, client_secret, api_host, use_https, self.logger, request_timeout = timeout, scope = scope)
-        self.datasets = DataSetClient(self.transport, self.logger)
-        self.groups = GroupClient(self.transport, self.logger)
-        self.pages = PageClient(self.transport, self.logger)
-        self.streams = StreamClient(self.transport, self.logger)
-        self.users = UserClient(self.transport, self.logger)
-        self.accounts = AccountClient(self.transport, self.logger)
-        self.utilities = UtilitiesClient(self.transport, self.logger)
+        client_id, client_secret, api_host, use_https = resolve_credentials(
+            client_id, client_secret, connection_file, api_host, use_https)
+
+        self.transport = DomoAPITransport(client_id, client_secret, api_host, use_https, self.logger,
+                                          request_timeout = timeout, scope = scope, **transport_args)
+
+        self._client_options = {}
+        stream_index = kwargs.get('stream_index')
+        if stream_index is True or isinstance(stream_index, str):
+            from pydomo.streams import StreamIndex
+            namespace = StreamIndex.namespace_for(self.transport.apiHost, client_id)
+            stream_index = StreamIndex(namespace, None if stream_index is True else stream_index)
+        utilities_options = {}
+        if stream_index:
+            utilities_options['stream_index'] = stream_index
+        coordinator = kwargs.get('execution_coordinator')
+        if coordinator is True:
+            from pydomo.streams import ExecutionCoordinator
+            coordinator = ExecutionCoordinator.default()
+        if coordinator:
+            utilities_options['coordinator'] = coordinator
+        if utilities_options:
+            self._client_options['utilities'] = utilities_options
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+            Close the pooled HTTP connections shared by all clients
+        """
+        self.transport.close()
 
 
 ######### Datasets #########
@@ -179,6 +310,7 @@ class Domo:
         if df_output == False:
             out = list(datasources)
         else:
+            from pandas import DataFrame
             out = DataFrame(list(datasources))
         return out
 
@@ -200,11 +332,12 @@ class Domo:
         """
         output = self.datasets.query(dataset_id, query)
         if(return_data == True):
+            from pandas import DataFrame
             output = DataFrame(output['rows'], columns = output['columns'])
         return output
 
 
-    def ds_get(self, dataset_id, use_schema=True) -> DataFrame:
+    def ds_get(self, dataset_id, use_schema=True) -> 'DataFrame':
         """
             Export data to pandas Dataframe
 
@@ -218,8 +351,7 @@ class Domo:
             :Returns:
             pandas dataframe
         """
-        csv_download = self.datasets.data_export(dataset_id, include_csv_header=True)
-        content = StringIO(csv_download)
+        from pandas import read_csv
 
         if use_schema:
             try:
@@ -227,40 +359,100 @@ class Domo:
 
                 if "schema" in schema_dict and "columns" in schema_dict["schema"]:
 
-                    dtype_dict = {}
-                    date_columns = []
-
-                    for column in schema_dict["schema"]["columns"]:
-                        col_name = column["name"]
-                        col_type = column["type"]
+                    dtype_dict, date_columns = self.utilities.schema_to_pandas_types(
+                        schema_dict["schema"]["columns"])
 
-
-                        if self.utilities.is_date_type(col_type):
-                            date_columns.append(col_name)
-                        else:
-                            dtype_dict[col_name] = self.utilities.convert_domo_type_to_pandas_type(col_type)
-
-                    return read_csv(
-                        content, dtype=dtype_dict, parse_dates=date_columns
-                    )
+                    content = self.datasets.data_export_stream(dataset_id, include_csv_header=True)
+                    try:
+                        return read_csv(
+                            content, dtype=dtype_dict, parse_dates=date_columns
+                        )
+                    finally:
+                        content.close()
 
             except Exception as err:
                 print(f"""An error occurred while converting domo schema to pandas dtypes. 
                 Letting pandas attempt to read the data. Error={err}""")
 
-                content.seek(0)
+        # The export is streamed straight into the parser, so a failed
+        # typed read is retried with a fresh download rather than a rewind
+        content = self.datasets.data_export_stream(dataset_id, include_csv_header=True)
+        try:
+            return self.utilities.read_content_to_dataframe(content, dataset_id)
+        finally:
+            content.close()
+
+    def ds_get_chunks(self, dataset_id, rows_per_chunk=100000, use_schema=True):
+        """
+            Export data as a generator of pandas DataFrames
+
+            The export is streamed and parsed rows_per_chunk rows at a time,
+            so only one chunk is held in memory.
+
+            >>> for df in domo.ds_get_chunks('80268aef-e6a1-44f6-a84c-f849d9db05fb', rows_per_chunk=500000):
+            ...     totals.append(df.groupby('make')['dollars'].sum())
+
+            :Parameters:
+            - `dataset_id`:     id of a dataset (str)
+            - `rows_per_chunk`: rows in each DataFrame. Default 100000 (int)
+            - `use_schema`:     whether to use the dataset schema to determine column types (bool, default True)
+                                    if false, pandas determines types from each chunk independently
+            :Returns:
+            generator of pandas dataframes
+        """
+        from pandas import read_csv
 
-        return self.utilities.read_content_to_dataframe(content)
+        read_args = {}
+        if use_schema:
+            schema_dict = self.ds_meta(dataset_id)
+            if "schema" in schema_dict and "columns" in schema_dict["schema"]:
+                dtype_dict, date_columns = self.utilities.schema_to_pandas_types(
+                    schema_dict["schema"]["columns"])
+                read_args = {'dtype': dtype_dict, 'parse_dates': date_columns}
+
+        content = self.datasets.data_export_stream(dataset_id, include_csv_header=True)
+        try:
+            with read_csv(content, chunksize=rows_per_chunk, **read_args) as reader:
+                for chunk in reader:
+                    yield chunk
+        finally:
+            content.close()
 
-    
     def ds_get_dict(self,ds_id):
-        my_data = self.datasets.data_export(ds_id,True)
-        dr = csv.DictReader(StringIO(my_data))
-        data_list = list(dr)
+        content = self.datasets.data_export_stream(ds_id, True)
+        try:
+            dr = csv.DictReader(TextIOWrapper(content, encoding='utf-8', newline=''))
+            data_list = list(dr)
+        finally:
+            content.close()
         return(data_list)
 
     def ds_create(self, df_up, name, description='',
-                  update_method='REPLACE', key_column_names=[]):
+                  update_method='REPLACE', key_column_names=[],
+                  max_workers=DEFAULT_UPLOAD_WORKERS, max_inflight_bytes=None,
+                  part_kbytes=DEFAULT_PART_KBYTES, compression=None,
+                  compresslevel=DEFAULT_PART_COMPRESS_LEVEL, encode_processes=None):
+        """
+            Create a new DataSet from a pandas DataFrame
+
+            :Parameters:
+            - `df_up`:              data to upload (DataFrame)
+            - `name`:               name of the new dataset (str)
+            - `description`:        description of the new dataset (str)
+            - `update_method`:      'REPLACE', 'APPEND' or 'UPSERT' (str)
+            - `key_column_names`:   key columns when update_method is 'UPSERT' (list)
+            - `max_workers`:        parts uploaded in parallel. Default 4 (int)
+            - `max_inflight_bytes`: cap on the estimated bytes of parts held in memory at once (int)
+            - `part_kbytes`:        target size of each uploaded part in KB. Default 30000 (int)
+            - `compression`:        None, 'gzip' to gzip parts, or 'auto' to gzip only when it
+                                    beats the measured upload speed (str)
+            - `compresslevel`:      gzip level from 1 (fastest) to 9 (smallest). Default 6 (int)
+            - `encode_processes`:   serialize parts in a pool of this many processes instead of
+                                    in the upload threads, for CPU-bound wide frames (int)
+
+            :Returns:
+            id of the new dataset
+        """
         new_stream = self.utilities.stream_create(df_up,
                                                   name,
                                                   description,
@@ -269,14 +461,83 @@ class Domo:
         if "dataSet" in new_stream:
             ds_id = new_stream['dataSet']['id']
             self.utilities.stream_upload(ds_id, df_up,
-                                         warn_schema_change=False)
+                                         warn_schema_change=False,
+                                         max_workers=max_workers,
+                                         max_inflight_bytes=max_inflight_bytes,
+                                         part_kbytes=part_kbytes,
+                                         compression=compression,
+                                         compresslevel=compresslevel,
+                                         encode_processes=encode_processes)
             return ds_id
         else:
             raise Exception(("Stream creation didn't work as expected. "
                              "Response: {}").format(new_stream))
 
-    def ds_update(self, ds_id, df_up):
-        return self.utilities.stream_upload(ds_id, df_up)
+    def ds_update(self, ds_id, df_up, max_workers=DEFAULT_UPLOAD_WORKERS, max_inflight_bytes=None,
+                  part_kbytes=DEFAULT_PART_KBYTES, compression=None,
+                  compresslevel=DEFAULT_PART_COMPRESS_LEVEL, encode_processes=None,
+                  resumable=False, update_method=None):
+        """
+            Upload a pandas DataFrame to an existing DataSet
+
+            :Parameters:
+            - `ds_id`:              id of a dataset created through the API (str)
+            - `df_up`:              data to upload (DataFrame)
+            - `max_workers`:        parts uploaded in parallel. Default 4 (int)
+            - `max_inflight_bytes`: cap on the estimated bytes of parts held in memory at once (int)
+            - `part_kbytes`:        target size of each uploaded part in KB. Default 30000 (int)
+            - `compression`:        None, 'gzip' to gzip parts, or 'auto' to gzip only when it
+                                    beats the measured upload speed (str)
+            - `compresslevel`:      gzip level from 1 (fastest) to 9 (smallest). Default 6 (int)
+            - `encode_processes`:   serialize parts in a pool of this many processes instead of
+                                    in the upload threads, for CPU-bound wide frames (int)
+            - `resumable`:          record uploaded parts in a local manifest so that a rerun after
+                                    a failure continues the open execution (bool)
+            - `update_method`:      'APPEND' or 'REPLACE' for this upload, instead of the stream's
+                                    own; with an execution_coordinator, concurrent appends to the
+                                    dataset are merged into one execution (str)
+        """
+        return self.utilities.stream_upload(ds_id, df_up,
+                                            max_workers=max_workers,
+                                            max_inflight_bytes=max_inflight_bytes,
+                                            part_kbytes=part_kbytes,
+                                            compression=compression,
+                                            compresslevel=compresslevel,
+                                            encode_processes=encode_processes,
+                                            resumable=resumable,
+                                            update_method=update_method)
+
+    def ds_writer(self, ds_id, part_kbytes=DEFAULT_PART_KBYTES, flush_interval=DEFAULT_FLUSH_INTERVAL,
+                  commit_interval=DEFAULT_COMMIT_INTERVAL, spill_bytes=DEFAULT_SPILL_BYTES, spill_dir=None,
+                  compression=None, compresslevel=DEFAULT_PART_COMPRESS_LEVEL):
+        """
+            Open a StreamWriter that appends rows to an existing DataSet
+
+            Small writes are buffered and uploaded as large parts of one
+            APPEND execution, which is committed on a schedule and when the
+            writer is closed. Rows must be in the DataSet's column order.
+
+            :Parameters:
+            - `ds_id`:              id of a dataset created through the API (str)
+            - `part_kbytes`:        buffered KB that trigger uploading a part. Default 30000 (int)
+            - `flush_interval`:     seconds rows may wait before being uploaded, None to disable.
+                                    Default 60 (int)
+            - `commit_interval`:    seconds before an execution is committed, None to commit only
+                                    on commit() and close(). Default 300 (int)
+            - `spill_bytes`:        buffered bytes held in memory before spilling to disk.
+                                    Default 64 MiB (int)
+            - `spill_dir`:          directory of spilled buffers (str)
+            - `compression`:        None, or 'gzip' to gzip parts (str)
+            - `compresslevel`:      gzip level from 1 (fastest) to 9 (smallest). Default 6 (int)
+
+            :Returns:
+            a StreamWriter; use it as a context manager or call close()
+        """
+        stream_id = self.utilities.get_stream_id(ds_id)
+        from pydomo.streams import StreamWriter
+        return StreamWriter(self.streams, stream_id, part_kbytes * 1000, flush_interval,
+                            commit_interval, spill_bytes, spill_dir, compression, compresslevel,
+                            self.logger)
 
 ######### PDP #########
 
@@ -341,6 +602,7 @@ class Domo:
         """
         output = self.datasets.list_pdps(dataset_id)
         if(df_output == True):
+            from pandas import DataFrame
             output = DataFrame(output)
         return output
 
@@ -560,18 +822,16 @@ class Domo:
 
 ######### Groups #########
 
-    def groups_add_users(self, group_id, user_id):
+    def groups_add_users(self, group_id, user_id, max_workers=DEFAULT_MEMBERSHIP_WORKERS, report=False):
         """
-            Add a User to a Group
+            Add a User (or list of Users) to a Group
+            Up to `max_workers` users are added at a time. With report=True
+            returns {'succeeded': [...], 'failed': {user_id: error}};
+            otherwise returns 'success', or raises if any user failed.
         """
-
-        if isinstance(user_id,list):
-            for x in user_id:
-                self.groups.add_user(group_id, x)
-        else:
-            self.groups.add_user(group_id, user_id)
-
-        return 'success'
+        user_ids = user_id if isinstance(user_id, list) else [user_id]
+        result = self.groups.add_users(group_id, user_ids, max_workers)
+        return self._membership_result(result, report, "adding Users to a Group")
 
 
 
@@ -588,12 +848,12 @@ class Domo:
 
 
 
-    def groups_delete(self, group_id):
+    def groups_delete(self, group_id, max_workers=DEFAULT_MEMBERSHIP_WORKERS):
         """
             Delete a Group
         """
         existing_users = self.groups_list_users(group_id)
-        self.groups_remove_users(group_id,existing_users)
+        self.groups_remove_users(group_id, existing_users, max_workers)
         return self.groups.delete(group_id)
 
 
@@ -606,50 +866,55 @@ class Domo:
 
 
 
-    def groups_list(self):
+    def groups_list(self, max_workers=DEFAULT_LIST_WORKERS, columnar=False):
         """
             List all groups in Domo instance in a pandas dataframe.
+            Pages are requested `max_workers` at a time; `columnar`
+            builds the dataframe column by column.
         """
-        grps = []
-        n_ret = 1
-        off = 0
-        batch_size = 500
-        while n_ret > 0:
-            gg = self.groups.list(batch_size,off*batch_size)
-            grps.extend(gg)
-            n_ret = gg.__len__()
-            off += 1
-        return DataFrame(grps)
+        pages = fetch_all_pages(self.groups.list, 500, max_workers)
+        return pages_to_frame(pages, columnar)
 
 
-    def groups_list_users(self, group_id):
+    def groups_list_users(self, group_id, max_workers=DEFAULT_LIST_WORKERS):
         """
             List Users in a Group
+            Pages are requested `max_workers` at a time.
         """
-        user_list = []
-        n_ret = 1
-        off = 0
-        batch_size=500
-        while n_ret > 0:
-            i_users = self.groups.list_users(group_id,limit=batch_size,offset=off*batch_size)
-            user_list.extend(i_users)
-            n_ret = i_users.__len__()
-            off += 1
+        return self.groups.list_all_users(group_id, max_workers=max_workers)
 
-        return user_list
 
 
+    def groups_remove_users(self, group_id, user_id, max_workers=DEFAULT_MEMBERSHIP_WORKERS, report=False):
+        """
+            Remove a User (or list of Users) from a Group
+            Up to `max_workers` users are removed at a time. With report=True
+            returns {'succeeded': [...], 'failed': {user_id: error}};
+            otherwise returns 'success', or raises if any user failed.
+        """
+        user_ids = user_id if isinstance(user_id, list) else [user_id]
+        result = self.groups.remove_users(group_id, user_ids, max_workers)
+        return self._membership_result(result, report, "removing Users from a Group")
+
 
-    def groups_remove_users(self, group_id, user_id):
+
+    def groups_sync_members(self, group_id, user_ids, max_workers=DEFAULT_MEMBERSHIP_WORKERS):
         """
-            Remove a User to a Group
+            Make a Group's members exactly `user_ids`
+            Only the missing users are added and only the extra users are
+            removed. Returns {'added': report, 'removed': report}.
         """
-        if isinstance(user_id,list):
-            for x in user_id:
-                self.groups.remove_user(group_id, x)
-        else:
-            self.groups.remove_user(group_id, user_id)
+        return self.groups.sync_members(group_id, user_ids, max_workers)
+
 
+    @staticmethod
+    def _membership_result(result, report, action):
+        if report:
+            return result
+        if result['failed']:
+            failures = '; '.join('{}: {}'.format(user_id, err) for user_id, err in result['failed'].items())
+            raise Exception("Error " + action + " for {} of {} users: {}".format(
+                len(result['failed']), len(result['failed']) + len(result['succeeded']), failures))
         return 'success'
 
 
@@ -730,6 +995,7 @@ class Domo:
 
 ######### Users #########
     def users_add(self, x_name, x_email, x_role, x_sendInvite=False):
+        from pydomo.users import CreateUserRequest
         uu = CreateUserRequest()
         uu.name = x_name
         uu.email = x_email
@@ -739,8 +1005,8 @@ class Domo:
     def users_get(self, user_id):
         return self.users.get(user_id)
 
-    def users_list(self,df_output=True):
-        return self.users.list_all(df_output)
+    def users_list(self, df_output=True, max_workers=DEFAULT_LIST_WORKERS, columnar=False):
+        return self.users.list_all(df_output, max_workers=max_workers, columnar=columnar)
 
     def users_update(self, user_id, user_def):
         return self.users.update(user_id, user_def)
@@ -1,5 +1,6 @@
 import requests
 
+from pydomo.common import DEFAULT_PREFETCH_PAGES, Paginator
 from pydomo.DomoAPIClient import DomoAPIClient
 from pydomo.Transport import HTTPMethod
 
@@ -55,7 +56,7 @@ class AccountClient(DomoAPIClient):
         url = '{base}/{account_id}'.format(base=URL_BASE, account_id=account_id)
         return self._get(url, ACCOUNT_DESC)
 
-    def list(self, per_account=50, offset=0, limit=0):
+    def list(self, per_account=50, offset=0, limit=0, prefetch=DEFAULT_PREFETCH_PAGES):
         """List accounts.
         Returns a generator that will call the API multiple times
         If limit is supplied and non-zero, returns up to limit accounts
@@ -68,6 +69,7 @@ class AccountClient(DomoAPIClient):
         - `per_page`:   results per page. Default 50 (int)
         - `offset`:     offset if you need to paginate results. Default 0 (int)
         - `limit`:      max ouput to return. If 0 then return all results on page. Default 0 (int)
+        - `prefetch`:   pages to fetch in the background while the current one is consumed. Default 2 (int)
             
 
         :returns:
@@ -76,29 +78,15 @@ class AccountClient(DomoAPIClient):
         # API uses pagination with a max of 50 per account
         if per_account not in range(1, 51):
             raise ValueError('per_account must be between 1 and 50 (inclusive)')
-        # Don't pull 50 values if user requests 10
-        if limit:
-            per_account = min(per_account, limit)
-
-        params = {
-            'limit': per_account,
-            'offset': offset,
-        }
-        account_count = 0
-
-        accounts = self._list(URL_BASE, params, ACCOUNT_DESC)
-        while accounts:
-            for account in accounts:
-                yield account
-                account_count += 1
-                if limit and account_count >= limit:
-                    return
-
-            params['offset'] += per_account
-            if limit and params['offset'] + per_account > limit:
-                # Don't need to pull more than the limit
-                params['limit'] = limit - params['offset']
-            accounts = self._list(URL_BASE, params, ACCOUNT_DESC)
+
+        def fetch_page(page_limit, page_offset):
+            params = {
+                'limit': page_limit,
+                'offset': page_offset,
+            }
+            return self._list(URL_BASE, params, ACCOUNT_DESC)
+
+        return iter(Paginator(fetch_page, per_account, offset, limit, prefetch))
 
     def update(self, account_id=None, **kwargs):
         """Update a account.
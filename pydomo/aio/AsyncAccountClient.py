@@ -0,0 +1,27 @@
+from pydomo.aio.AsyncDomoAPIClient import AsyncDomoAPIClient
+from pydomo.aio.AsyncPaginator import AsyncPaginator
+from pydomo.common import DEFAULT_PREFETCH_PAGES
+from pydomo.accounts import AccountClient
+from pydomo.accounts.AccountClient import ACCOUNT_DESC, URL_BASE
+
+
+class AsyncAccountClient(AsyncDomoAPIClient, AccountClient):
+    """
+        Accounts (asyncio)
+        - Same methods as AccountClient, as coroutines
+        - `list` is an async generator
+    """
+
+    def list(self, per_account=50, offset=0, limit=0, prefetch=DEFAULT_PREFETCH_PAGES):
+        # API uses pagination with a max of 50 per page
+        if per_account not in range(1, 51):
+            raise ValueError('per_account must be between 1 and 50 (inclusive)')
+
+        async def fetch_page(page_limit, page_offset):
+            params = {
+                'limit': page_limit,
+                'offset': page_offset,
+            }
+            return await self._list(URL_BASE, params, ACCOUNT_DESC)
+
+        return AsyncPaginator(fetch_page, per_account, offset, limit, prefetch).__aiter__()
@@ -0,0 +1,75 @@
+import os
+
+from pydomo.aio.AsyncDomoAPIClient import AsyncDomoAPIClient
+from pydomo.aio.AsyncPaginator import AsyncPaginator
+from pydomo.common import DEFAULT_PREFETCH_PAGES
+from pydomo.datasets import DataSetClient, Sorting, UpdateMethod
+from pydomo.datasets.DataSetClient import DATA_SET_DESC, URL_BASE
+
+DEFAULT_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+class AsyncDataSetClient(AsyncDomoAPIClient, DataSetClient):
+    """
+        DataSets (asyncio)
+        - Same methods as DataSetClient, as coroutines
+        - `list` is an async generator
+    """
+
+    def list(self, sort=Sorting.DEFAULT, per_page=50,
+             offset=0, limit=0, name_like="", prefetch=DEFAULT_PREFETCH_PAGES):
+        # API uses pagination with a max of 50 per page
+        if per_page not in range(1, 51):
+            raise ValueError('per_page must be between 1 and 50 (inclusive)')
+
+        params = {
+            'sort': sort,
+            'nameLike': name_like
+        }
+
+        async def fetch_page(page_limit, page_offset):
+            page_params = dict(params, limit=page_limit, offset=page_offset)
+            return await self._list(URL_BASE, page_params, DATA_SET_DESC)
+
+        return AsyncPaginator(fetch_page, per_page, offset, limit, prefetch).__aiter__()
+
+    async def data_import_from_file(self, dataset_id, filepath,
+                                    update_method=UpdateMethod.REPLACE):
+        with open(os.path.expanduser(filepath), 'rb') as csvfile:
+            # aiohttp streams file bodies, reading them in an executor
+            return await self._data_import(dataset_id, csvfile, update_method)
+
+    async def data_export(self, dataset_id, include_csv_header):
+        chunks = [chunk async for chunk in self.data_export_chunks(dataset_id, include_csv_header)]
+        return bytes.decode(b''.join(chunks))
+
+    async def data_export_chunks(self, dataset_id, include_csv_header,
+                                 chunk_size=DEFAULT_DOWNLOAD_CHUNK_SIZE):
+        """Export data as an async generator of CSV byte chunks."""
+        response = await self.data_export_stream(dataset_id, include_csv_header)
+        async with response:
+            async for chunk in response.content.iter_chunked(chunk_size):
+                yield chunk
+
+    async def data_export_to_file(self, dataset_id, file_path, include_csv_header):
+        file_path = str(file_path)
+        if not file_path.endswith('.csv'):
+            file_path += '.csv'
+        with open(file_path, 'wb') as csv_file:
+            async for chunk in self.data_export_chunks(dataset_id, include_csv_header):
+                csv_file.write(chunk)
+        return open(file_path, 'r+')  # return the file object as readable and writable
+
+    async def data_export_stream(self, dataset_id, include_csv_header):
+        """Start an export, returning the unread aiohttp.ClientResponse.
+
+        The CSV is read from the response's `content` StreamReader; use the
+        response as an async context manager to release the connection.
+        """
+        url = '{base}/{dataset_id}/data'.format(
+                base=URL_BASE, dataset_id=dataset_id)
+        response = await self._download_csv(url, include_csv_header)
+        if response.status != 200:
+            async with response:
+                raise await self._error("Error downloading data from DataSet", response)
+        return response
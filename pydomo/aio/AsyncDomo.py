@@ -0,0 +1,220 @@
+import asyncio
+import tempfile
+
+from pydomo import Domo, parent_logger, resolve_credentials
+from pydomo.aio.AsyncAccountClient import AsyncAccountClient
+from pydomo.aio.AsyncDataSetClient import AsyncDataSetClient
+from pydomo.aio.AsyncGroupClient import AsyncGroupClient
+from pydomo.aio.AsyncPaginator import fetch_all_pages
+from pydomo.aio.AsyncPageClient import AsyncPageClient
+from pydomo.aio.AsyncStreamClient import AsyncStreamClient
+from pydomo.aio.AsyncTransport import AsyncDomoAPITransport
+from pydomo.aio.AsyncUserClient import AsyncUserClient
+from pydomo.aio.AsyncUtilitiesClient import AsyncUtilitiesClient
+from pydomo.common import DEFAULT_LIST_WORKERS, pages_to_frame
+from pydomo.groups.GroupClient import DEFAULT_MEMBERSHIP_WORKERS
+from pydomo.streams.Compression import DEFAULT_PART_COMPRESS_LEVEL
+from pydomo.streams.PartUploader import DEFAULT_UPLOAD_WORKERS
+from pydomo.utilities.UtilitiesClient import DEFAULT_PART_KBYTES
+
+# Optional AsyncDomo() keyword arguments passed through to AsyncDomoAPITransport
+ASYNC_TRANSPORT_KWARGS = (
+    'limit',
+    'limit_per_host',
+    'token_refresh_margin',
+    'retry_policy',
+    'rate_limiter',
+)
+
+# Exports larger than this are spooled to a temporary file before parsing
+SPOOL_MAX_SIZE = 64 * 1024 * 1024
+
+
+class AsyncDomo:
+    """Asyncio counterpart of Domo.
+
+    >>> async with AsyncDomo(client_id, client_secret) as domo:
+    ...     frames = await asyncio.gather(*[domo.ds_get(ds_id) for ds_id in ids])
+
+    Takes the same credentials and keyword arguments as Domo, plus the
+    connector limits `limit` and `limit_per_host`. The async clients are
+    available as `datasets`, `groups`, `pages`, `streams`, `users`,
+    `accounts` and `utilities`; paginated `list` methods are async
+    generators.
+    """
+
+    def __init__(self, client_id=None, client_secret=None, connection_file=None, api_host='api.domo.com', **kwargs):
+        if 'logger_name' in kwargs:
+            self.logger = parent_logger.getChild(kwargs['logger_name'])
+        else:
+            self.logger = parent_logger
+        if kwargs.get('log_level'):
+            self.logger.setLevel(kwargs['log_level'])
+
+        client_id, client_secret, api_host, use_https = resolve_credentials(
+            client_id, client_secret, connection_file, api_host, kwargs.get('use_https', True))
+        transport_args = {k: kwargs[k] for k in ASYNC_TRANSPORT_KWARGS if k in kwargs}
+
+        self.transport = AsyncDomoAPITransport(client_id, client_secret, api_host, use_https, self.logger,
+                                               request_timeout=kwargs.get('request_timeout'),
+                                               scope=kwargs.get('scope'), **transport_args)
+        self.datasets = AsyncDataSetClient(self.transport, self.logger)
+        self.groups = AsyncGroupClient(self.transport, self.logger)
+        self.pages = AsyncPageClient(self.transport, self.logger)
+        self.streams = AsyncStreamClient(self.transport, self.logger)
+        self.users = AsyncUserClient(self.transport, self.logger)
+        self.accounts = AsyncAccountClient(self.transport, self.logger)
+        stream_index = kwargs.get('stream_index')
+        if stream_index is True or isinstance(stream_index, str):
+            from pydomo.streams import StreamIndex
+            namespace = StreamIndex.namespace_for(self.transport.apiHost, client_id)
+            stream_index = StreamIndex(namespace, None if stream_index is True else stream_index)
+        self.utilities = AsyncUtilitiesClient(self.transport, self.logger, stream_index=stream_index or None)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        """
+            Close the pooled HTTP connections shared by all clients
+        """
+        await self.transport.close()
+
+######### Datasets #########
+    async def ds_meta(self, dataset_id):
+        """
+            Get a DataSet metadata
+        """
+        return await self.datasets.get(dataset_id)
+
+    async def ds_delete(self, dataset_id):
+        """
+            Delete a DataSet (without prompting)
+        """
+        return await self.datasets.delete(dataset_id)
+
+    async def ds_list(self, df_output=True, per_page=50, offset=0, limit=0, name_like=""):
+        """
+            List DataSets as a list or pandas dataframe
+        """
+        datasources = [ds async for ds in self.datasets.list(per_page=per_page, offset=offset,
+                                                              limit=limit, name_like=name_like)]
+        if df_output == False:
+            return datasources
+        from pandas import DataFrame
+        return DataFrame(datasources)
+
+    async def ds_get(self, dataset_id, use_schema=True):
+        """
+            Export data to pandas Dataframe
+
+            The export is streamed into a spooled temporary file and parsed
+            on a worker thread, so the event loop is never blocked.
+
+            :Parameters:
+            - `dataset_id`: id of a dataset (str)
+            - `use_schema`: whether to use the dataset schema to determine column types (bool, default True)
+        """
+        from pandas import read_csv
+
+        read_args = {}
+        if use_schema:
+            schema_dict = await self.ds_meta(dataset_id)
+            if "schema" in schema_dict and "columns" in schema_dict["schema"]:
+                dtype_dict, date_columns = self.utilities.schema_to_pandas_types(
+                    schema_dict["schema"]["columns"])
+                read_args = {'dtype': dtype_dict, 'parse_dates': date_columns}
+
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as content:
+            async for chunk in self.datasets.data_export_chunks(dataset_id, include_csv_header=True):
+                # Past SPOOL_MAX_SIZE the spool rolls over to disk, so write off the loop
+                await asyncio.to_thread(content.write, chunk)
+            content.seek(0)
+            if read_args:
+                return await asyncio.to_thread(read_csv, content, **read_args)
+            return await asyncio.to_thread(self.utilities.read_content_to_dataframe, content, dataset_id)
+
+    async def ds_create(self, df_up, name, description='',
+                        update_method='REPLACE', key_column_names=[],
+                        max_workers=DEFAULT_UPLOAD_WORKERS, max_inflight_bytes=None,
+                        part_kbytes=DEFAULT_PART_KBYTES, compression=None,
+                        compresslevel=DEFAULT_PART_COMPRESS_LEVEL, encode_processes=None):
+        """
+            Create a new DataSet from a pandas DataFrame, returning its id
+        """
+        new_stream = await self.utilities.stream_create(df_up, name, description,
+                                                        update_method, key_column_names)
+        if "dataSet" in new_stream:
+            ds_id = new_stream['dataSet']['id']
+            await self.utilities.stream_upload(ds_id, df_up, warn_schema_change=False,
+                                               max_workers=max_workers,
+                                               max_inflight_bytes=max_inflight_bytes,
+                                               part_kbytes=part_kbytes,
+                                               compression=compression,
+                                               compresslevel=compresslevel,
+                                               encode_processes=encode_processes)
+            return ds_id
+        else:
+            raise Exception(("Stream creation didn't work as expected. "
+                             "Response: {}").format(new_stream))
+
+    async def ds_update(self, ds_id, df_up, max_workers=DEFAULT_UPLOAD_WORKERS, max_inflight_bytes=None,
+                        part_kbytes=DEFAULT_PART_KBYTES, compression=None,
+                        compresslevel=DEFAULT_PART_COMPRESS_LEVEL, encode_processes=None,
+                        resumable=False):
+        """
+            Upload a pandas DataFrame to an existing DataSet
+        """
+        return await self.utilities.stream_upload(ds_id, df_up, max_workers=max_workers,
+                                                  max_inflight_bytes=max_inflight_bytes,
+                                                  part_kbytes=part_kbytes,
+                                                  compression=compression,
+                                                  compresslevel=compresslevel,
+                                                  encode_processes=encode_processes,
+                                                  resumable=resumable)
+
+######### Groups #########
+    async def groups_add_users(self, group_id, user_id, max_workers=DEFAULT_MEMBERSHIP_WORKERS, report=False):
+        """
+            Add a User (or list of Users) to a Group
+        """
+        user_ids = user_id if isinstance(user_id, list) else [user_id]
+        result = await self.groups.add_users(group_id, user_ids, max_workers)
+        return Domo._membership_result(result, report, "adding Users to a Group")
+
+    async def groups_remove_users(self, group_id, user_id, max_workers=DEFAULT_MEMBERSHIP_WORKERS, report=False):
+        """
+            Remove a User (or list of Users) from a Group
+        """
+        user_ids = user_id if isinstance(user_id, list) else [user_id]
+        result = await self.groups.remove_users(group_id, user_ids, max_workers)
+        return Domo._membership_result(result, report, "removing Users from a Group")
+
+    async def groups_sync_members(self, group_id, user_ids, max_workers=DEFAULT_MEMBERSHIP_WORKERS):
+        """
+            Make a Group's members exactly `user_ids`
+        """
+        return await self.groups.sync_members(group_id, user_ids, max_workers)
+
+    async def groups_list(self, max_workers=DEFAULT_LIST_WORKERS, columnar=False):
+        """
+            List all groups in Domo instance in a pandas dataframe.
+        """
+        pages = await fetch_all_pages(self.groups.list, 500, max_workers)
+        return pages_to_frame(pages, columnar)
+
+    async def groups_list_users(self, group_id, max_workers=DEFAULT_LIST_WORKERS):
+        """
+            List Users in a Group
+        """
+        return await self.groups.list_all_users(group_id, max_workers=max_workers)
+
+######### Users #########
+    async def users_get(self, user_id):
+        return await self.users.get(user_id)
+
+    async def users_list(self, df_output=True, max_workers=DEFAULT_LIST_WORKERS, columnar=False):
+        return await self.users.list_all(df_output, max_workers=max_workers, columnar=columnar)
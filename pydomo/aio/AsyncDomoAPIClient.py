@@ -0,0 +1,85 @@
+from pydomo.DomoAPIClient import DomoAPIClient
+from pydomo.Transport import HTTPMethod
+
+
+class AsyncDomoAPIClient(DomoAPIClient):
+    """Asyncio counterpart of DomoAPIClient.
+
+    The request helpers (_create, _get, _list, ...) are coroutines. Each
+    async client also inherits from its sync client, listed after this
+    class, so every sync method that only prepares a request and returns
+    `self._create(...)`, `self._get(...)` etc. returns an awaitable here.
+    Methods that do more than that (pagination, file handling) are
+    overridden by the async client.
+    """
+
+    async def _create(self, url, request, params, obj_desc):
+        response = await self.transport.post(url=url, params=params, body=request)
+        async with response:
+            if response.status in (201, 200):
+                obj = await response.json(content_type=None)
+                self.print_json("Created", obj)
+                return obj
+            raise await self._error("Error creating " + obj_desc, response)
+
+    async def _get(self, url, obj_desc):
+        response = await self.transport.get(url=url, params={})
+        async with response:
+            if response.status == 200:
+                return await response.json(content_type=None)
+            raise await self._error("Error retrieving " + obj_desc, response)
+
+    async def _update(self, url, method, success_code, obj_update, obj_desc):
+        if method == HTTPMethod.PUT:
+            response = await self.transport.put(url, obj_update)
+        elif method == HTTPMethod.PATCH:
+            response = await self.transport.patch(url, obj_update)
+        async with response:
+            if response.status == success_code:
+                if await response.text() == '':
+                    return
+                obj = await response.json(content_type=None)
+                self.print_json("Updated", obj)
+                return obj
+            raise await self._error("Error updating " + obj_desc, response)
+
+    async def _list(self, url, params, obj_desc):
+        response = await self.transport.get(url=url, params=params)
+        async with response:
+            if response.status == 200:
+                return await response.json(content_type=None)
+            raise await self._error(obj_desc + " Error", response)
+
+    async def _delete(self, url, obj_desc):
+        response = await self.transport.delete(url=url)
+        async with response:
+            if response.status == 204:
+                return
+            raise await self._error("Error deleting " + obj_desc, response)
+
+    async def _upload_csv(self, url, success_code, csv, obj_desc):
+        response = await self.transport.put_csv(url=url, body=csv)
+        return await self._upload_result(response, success_code, obj_desc)
+
+    async def _upload_gzip(self, url, success_code, csv, obj_desc):
+        response = await self.transport.put_gzip(url=url, body=csv)
+        return await self._upload_result(response, success_code, obj_desc)
+
+    async def _upload_result(self, response, success_code, obj_desc):
+        async with response:
+            if response.status == success_code:
+                if await response.text() == '':
+                    return
+                return await response.json(content_type=None)
+            raise await self._error("Error uploading " + obj_desc, response)
+
+    async def _download_csv(self, url, include_csv_header):
+        params = {
+            'includeHeader': str(include_csv_header)
+        }
+        return await self.transport.get_csv(url=url, params=params)
+
+    async def _error(self, message, response):
+        text = await response.text()
+        self.logger.debug("{}: {} {}".format(message, response.status, text))
+        return Exception(message + ": " + text)
@@ -0,0 +1,53 @@
+import asyncio
+import itertools
+
+from pydomo.aio.AsyncDomoAPIClient import AsyncDomoAPIClient
+from pydomo.aio.AsyncPaginator import fetch_all_pages
+from pydomo.common import DEFAULT_LIST_WORKERS
+from pydomo.groups import GroupClient
+from pydomo.groups.GroupClient import DEFAULT_MEMBERSHIP_WORKERS
+
+
+class AsyncGroupClient(AsyncDomoAPIClient, GroupClient):
+    """
+        Group Client (asyncio)
+        - Same methods as GroupClient, as coroutines
+    """
+
+    async def sync_members(self, group_id, user_ids, max_workers=DEFAULT_MEMBERSHIP_WORKERS):
+        current = set(await self.list_all_users(group_id))
+        desired = list(dict.fromkeys(user_ids))
+        to_add = [x for x in desired if x not in current]
+        desired = set(desired)
+        to_remove = [x for x in current if x not in desired]
+        return {
+            'added': await self.add_users(group_id, to_add, max_workers),
+            'removed': await self.remove_users(group_id, to_remove, max_workers),
+        }
+
+    async def list_all_users(self, group_id, batch_size=500, max_workers=DEFAULT_LIST_WORKERS):
+        async def list_users(limit, offset):
+            return await self.list_users(group_id, limit, offset)
+        pages = await fetch_all_pages(list_users, batch_size, max_workers)
+        return list(itertools.chain.from_iterable(pages))
+
+    async def _bulk_membership(self, change, group_id, user_ids, max_workers):
+        user_ids = list(dict.fromkeys(user_ids))
+        semaphore = asyncio.Semaphore(max(1, max_workers))
+
+        async def run(user_id):
+            async with semaphore:
+                try:
+                    await change(group_id, user_id)
+                except Exception as err:
+                    return err
+                return None
+
+        report = {'succeeded': [], 'failed': {}}
+        errors = await asyncio.gather(*[run(user_id) for user_id in user_ids])
+        for user_id, err in zip(user_ids, errors):
+            if err is None:
+                report['succeeded'].append(user_id)
+            else:
+                report['failed'][user_id] = str(err)
+        return report
@@ -0,0 +1,27 @@
+from pydomo.aio.AsyncDomoAPIClient import AsyncDomoAPIClient
+from pydomo.aio.AsyncPaginator import AsyncPaginator
+from pydomo.common import DEFAULT_PREFETCH_PAGES
+from pydomo.pages import PageClient
+from pydomo.pages.PageClient import PAGE_DESC, URL_BASE
+
+
+class AsyncPageClient(AsyncDomoAPIClient, PageClient):
+    """
+        Pages (asyncio)
+        - Same methods as PageClient, as coroutines
+        - `list` is an async generator
+    """
+
+    def list(self, per_page=50, offset=0, limit=0, prefetch=DEFAULT_PREFETCH_PAGES):
+        # API uses pagination with a max of 50 per page
+        if per_page not in range(1, 51):
+            raise ValueError('per_page must be between 1 and 50 (inclusive)')
+
+        async def fetch_page(page_limit, page_offset):
+            params = {
+                'limit': page_limit,
+                'offset': page_offset,
+            }
+            return await self._list(URL_BASE, params, PAGE_DESC)
+
+        return AsyncPaginator(fetch_page, per_page, offset, limit, prefetch).__aiter__()
@@ -0,0 +1,57 @@
+import asyncio
+from collections import deque
+
+from pydomo.common import DEFAULT_LIST_WORKERS, Paginator
+
+
+class AsyncPaginator(Paginator):
+    """Asyncio counterpart of Paginator.
+
+    `fetch_page(limit, offset)` is a coroutine function. With `prefetch`
+    > 0 the next `prefetch` pages are requested as tasks while the caller
+    consumes the current one. Iterate with `async for`.
+    """
+
+    async def pages(self):
+        windows = self.windows()
+        pending = deque()
+
+        def submit():
+            for page_limit, offset in windows:
+                pending.append((page_limit, asyncio.ensure_future(self.fetch_page(page_limit, offset))))
+                return
+
+        try:
+            for _ in range(self.prefetch + 1):
+                submit()
+            while pending:
+                page_limit, task = pending.popleft()
+                page = await task
+                if self.is_last_page(page, page_limit):
+                    if page:
+                        yield page
+                    return
+                submit()
+                yield page
+        finally:
+            for _, task in pending:
+                task.cancel()
+
+    def __iter__(self):
+        raise TypeError('AsyncPaginator must be iterated with "async for"')
+
+    async def __aiter__(self):
+        count = 0
+        async for page in self.pages():
+            for item in page:
+                yield item
+                count += 1
+                if self.limit and count >= self.limit:
+                    return
+
+
+async def fetch_all_pages(fetch_page, per_page, max_workers=DEFAULT_LIST_WORKERS):
+    """Asyncio counterpart of pydomo.common.fetch_all_pages."""
+    prefetch = max_workers if max_workers > 1 else 0
+    paginator = AsyncPaginator(fetch_page, per_page, prefetch=prefetch, stop_on_short_page=True)
+    return [page async for page in paginator.pages()]
@@ -0,0 +1,92 @@
+import asyncio
+import gzip
+import io
+import os
+
+from pydomo.aio.AsyncDomoAPIClient import AsyncDomoAPIClient
+from pydomo.streams import StreamClient
+from pydomo.streams.Compression import (DEFAULT_CHUNK_SIZE, DEFAULT_COMPRESS_LEVEL, DEFAULT_PART_COMPRESS_LEVEL,
+                                        iter_gzip)
+from pydomo.streams.FileSplitter import DEFAULT_FILE_PART_BYTES, CsvFileSplitter
+from pydomo.streams.PartUploader import DEFAULT_UPLOAD_WORKERS
+
+
+class AsyncStreamClient(AsyncDomoAPIClient, StreamClient):
+    """
+        Streams (asyncio)
+        - Same methods as StreamClient, as coroutines
+        - Parts of one execution can be uploaded concurrently with
+          asyncio.gather
+    """
+
+    async def upload_csv_part_from_file(self, stream_id, execution_id, part_num, filepath, compression):
+        url = self._base(stream_id) + '/executions/' + str(execution_id) + '/part/' + str(part_num)
+        desc = "Data Part on Execution " + str(execution_id) + " on Stream " + str(stream_id)
+
+        if compression == 'gzip':
+            if not filepath.endswith('.gz'):
+                raise ValueError("Valid gzip extension is '.gz'")
+            with gzip.open(os.path.expanduser(filepath), 'rb') as gzipfile:
+                return await self._upload_csv(url, 200, gzipfile, desc)
+
+        with open(os.path.expanduser(filepath), 'rb') as csvfile:
+            return await self._upload_csv(url, 200, csvfile, desc)
+
+    async def upload_gzip_part_from_file(self, stream_id, execution_id, part_num, filepath, stream_file=True,
+                                         chunk_size=DEFAULT_CHUNK_SIZE, compresslevel=DEFAULT_COMPRESS_LEVEL):
+        url = self._base(stream_id) + '/executions/' + str(execution_id) + '/part/' + str(part_num)
+        desc = "Data Part on Execution " + str(execution_id) + " on Stream " + str(stream_id)
+
+        with open(os.path.expanduser(filepath), 'rb') as csvfile:
+            chunks = iter_gzip(csvfile, chunk_size, compresslevel)
+            if not stream_file:
+                compressed_body = await asyncio.to_thread(b''.join, chunks)
+                return await self._upload_gzip(url, 200, compressed_body, desc)
+            return await self._upload_gzip(url, 200, _to_thread_iter(chunks), desc)
+
+    async def upload_file(self, stream_id, path, part_size=DEFAULT_FILE_PART_BYTES, compression=None,
+                          compresslevel=DEFAULT_PART_COMPRESS_LEVEL, max_workers=DEFAULT_UPLOAD_WORKERS,
+                          quoted_newlines=False, skip_header=False, update_method=None):
+        if compression not in (None, 'gzip'):
+            raise ValueError("compression must be None or 'gzip'")
+        splitter = await asyncio.to_thread(CsvFileSplitter, path, part_size, quoted_newlines,
+                                           skip_header, compresslevel)
+        try:
+            boundaries = await asyncio.to_thread(list, splitter.boundaries())
+            execution_id = (await self.create_execution(stream_id, update_method))['id']
+            semaphore = asyncio.Semaphore(max_workers)
+
+            async def upload(part_num, start, end):
+                async with semaphore:
+                    # Worker threads are shared, so each gzipped part gets its own buffer;
+                    # either body can be rewound, so the transport retries it like bytes
+                    body = await asyncio.to_thread(splitter.encode, start, end, compression, io.BytesIO())
+                    await self.upload_part(stream_id, execution_id, part_num, body, compression=compression)
+
+            tasks = [asyncio.ensure_future(upload(part_num, start, end))
+                     for part_num, (start, end) in enumerate(boundaries)]
+            try:
+                await asyncio.gather(*tasks)
+            except BaseException:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                try:
+                    await self.abort_execution(stream_id, execution_id)
+                except Exception as err:
+                    self.logger.debug('Error aborting execution {} on stream {}: {}'
+                                      .format(execution_id, stream_id, err))
+                raise
+        finally:
+            splitter.close()
+        return await self.commit_execution(stream_id, execution_id)
+
+
+async def _to_thread_iter(iterator):
+    """Drive a blocking iterator from worker threads, one item at a time."""
+    sentinel = object()
+    while True:
+        item = await asyncio.to_thread(next, iterator, sentinel)
+        if item is sentinel:
+            return
+        yield item
@@ -0,0 +1,216 @@
+import asyncio
+import base64
+import time
+
+try:
+    import aiohttp
+except ImportError:
+    raise ImportError("pydomo.aio requires aiohttp; install it with 'pip install pydomo[async]'")
+
+from pydomo.common import Metrics
+from pydomo.RetryPolicy import RetryPolicy
+from pydomo.TokenProvider import DEFAULT_REFRESH_MARGIN
+from pydomo.Transport import DomoAPITransport, HTTPMethod
+
+DEFAULT_CONNECTION_LIMIT = 100
+
+
+class AsyncDomoAPITransport:
+    """Asyncio counterpart of DomoAPITransport, built on 'aiohttp'.
+
+    All requests share one aiohttp.ClientSession whose connector keeps up
+    to `limit` connections alive (`limit_per_host` per host, 0 meaning no
+    per-host limit), so a single event loop can drive hundreds of
+    concurrent calls over pooled connections.
+
+    Token handling, retries and rate limiting follow DomoAPITransport:
+    concurrent coroutines share one token renewal, a 401 is retried once
+    with a new token, `retry_policy` re-sends throttled or transiently
+    failing requests with replayable bodies (strings, bytes, or file
+    objects that can be rewound), and a shared `rate_limiter` is awaited
+    before every request.
+
+    Requests return unread aiohttp.ClientResponse objects; use them as
+    async context managers so their connection is released.
+    """
+
+    def __init__(self, client_id, client_secret, api_host, use_https, logger, request_timeout=None, scope=None,
+                 limit=DEFAULT_CONNECTION_LIMIT, limit_per_host=0, token_refresh_margin=DEFAULT_REFRESH_MARGIN,
+                 retry_policy=None, rate_limiter=None):
+        self.apiHost = self._build_apihost(api_host, use_https)
+        self.clientId = client_id
+        self.clientSecret = client_secret
+        self.logger = logger
+        self.request_timeout = request_timeout
+        self.scope = scope
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.token_refresh_margin = token_refresh_margin
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.metrics = Metrics()
+        self.access_token = None
+        self.token_expiration = 0
+        self._token_lock = None
+        self._session = None
+
+    _build_apihost = staticmethod(DomoAPITransport._build_apihost)
+    _obj_to_json = staticmethod(DomoAPITransport._obj_to_json)
+    _extract_expiration = DomoAPITransport._extract_expiration
+    _decode_payload = DomoAPITransport._decode_payload
+    _headers_default_receive_json = DomoAPITransport._headers_default_receive_json
+    _headers_send_json = DomoAPITransport._headers_send_json
+    _headers_send_csv = DomoAPITransport._headers_send_csv
+    _headers_send_gzip = DomoAPITransport._headers_send_gzip
+    _headers_receive_csv = DomoAPITransport._headers_receive_csv
+    _body_position = staticmethod(DomoAPITransport._body_position)
+    _rewind_body = staticmethod(DomoAPITransport._rewind_body)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _get_session(self):
+        # The session must be created from within the running event loop
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host)
+            timeout = aiohttp.ClientTimeout(total=None, sock_connect=self.request_timeout,
+                                            sock_read=self.request_timeout)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        return self._session
+
+    async def get(self, url, params):
+        headers = self._headers_default_receive_json()
+        return await self.request(url, HTTPMethod.GET, headers, params)
+
+    async def get_csv(self, url, params):
+        headers = self._headers_receive_csv()
+        return await self.request(url, HTTPMethod.GET, headers, params)
+
+    async def post(self, url, body, params):
+        headers = self._headers_send_json()
+        return await self.request(url, HTTPMethod.POST, headers, params,
+                                  self._obj_to_json(body))
+
+    async def put(self, url, body):
+        headers = self._headers_send_json()
+        return await self.request(url, HTTPMethod.PUT, headers, {},
+                                  self._obj_to_json(body))
+
+    async def put_csv(self, url, body):
+        headers = self._headers_send_csv()
+        return await self.request(url, HTTPMethod.PUT, headers, {}, body)
+
+    async def put_gzip(self, url, body):
+        headers = self._headers_send_gzip()
+        return await self.request(url, HTTPMethod.PUT, headers, {}, body)
+
+    async def patch(self, url, body):
+        headers = self._headers_send_json()
+        return await self.request(url, HTTPMethod.PATCH, headers, {},
+                                  self._obj_to_json(body))
+
+    async def delete(self, url):
+        headers = self._headers_default_receive_json()
+        return await self.request(url, HTTPMethod.DELETE, headers)
+
+    async def request(self, url, method, headers, params=None, body=None):
+        path = url
+        url = self.apiHost + url
+        self.logger.debug('{} {} {}'.format(method, url, body))
+        params = {key: str(value) for key, value in (params or {}).items() if value is not None}
+        body_position = self._body_position(body)
+        renewed_token = False
+        attempt = 0
+        while True:
+            token = await self.get_token()
+            headers['Authorization'] = 'bearer ' + token
+            await self._throttle(path)
+            self.metrics.increment('requests')
+            try:
+                response = await self._get_session().request(method, url, headers=headers,
+                                                             params=params, data=body)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as err:
+                if not (self.retry_policy.retry_error(method, attempt)
+                        and self._rewind_body(body, body_position)):
+                    raise
+                delay = self.retry_policy.backoff(attempt)
+                reason = type(err).__name__
+            else:
+                if (response.status == 401 and not renewed_token
+                        and self._rewind_body(body, body_position)):
+                    self.logger.debug("Access token was rejected, retrying with a new token")
+                    response.release()
+                    self._invalidate_token(token)
+                    renewed_token = True
+                    continue
+                if not (self.retry_policy.retry_response(method, response.status, attempt)
+                        and self._rewind_body(body, body_position)):
+                    if attempt and response.status in self.retry_policy.statuses:
+                        self.metrics.increment('retries_exhausted')
+                    return response
+                delay = self.retry_policy.backoff(attempt, response)
+                reason = response.status
+                response.release()
+
+            attempt += 1
+            self.metrics.increment('retries')
+            self.metrics.increment('retry_sleep_seconds', delay)
+            self.logger.debug('Retrying {} {} ({}) in {:.2f}s, attempt {}'
+                              .format(method, url, reason, delay, attempt))
+            await asyncio.sleep(delay)
+
+    async def _throttle(self, path):
+        if self.rate_limiter is not None:
+            waited = await self.rate_limiter.acquire_async(path)
+            if waited:
+                self.metrics.increment('rate_limit_wait_seconds', waited)
+
+    async def get_token(self):
+        if self._token_is_fresh():
+            return self.access_token
+        if self._token_lock is None:
+            self._token_lock = asyncio.Lock()
+        if self._token_lock.locked() and time.time() < self.token_expiration:
+            # Still valid; let the renewal in progress replace it
+            return self.access_token
+        async with self._token_lock:
+            if not self._token_is_fresh():
+                await self._renew_access_token()
+        return self.access_token
+
+    def _token_is_fresh(self):
+        return (self.access_token is not None
+                and time.time() < self.token_expiration - self.token_refresh_margin)
+
+    def _invalidate_token(self, token):
+        if self.access_token == token:
+            self.token_expiration = 0
+
+    async def _renew_access_token(self):
+        self.logger.debug("Renewing Access Token")
+        # scope == None means use all scopes from client
+        data = {'grant_type': 'client_credentials'}
+        if self.scope:
+            data['scope'] = ' '.join(self.scope)
+
+        await self._throttle('/oauth/token')
+        credentials = '{}:{}'.format(self.clientId, self.clientSecret).encode('utf-8')
+        headers = {'Authorization': 'Basic ' + base64.b64encode(credentials).decode('ascii')}
+        async with self._get_session().post(self.apiHost + '/oauth/token', data=data,
+                                            headers=headers) as response:
+            if response.status == 200:
+                payload = await response.json(content_type=None)
+                self.access_token = payload['access_token']
+                self.token_expiration = self._extract_expiration(self.access_token)
+            else:
+                text = await response.text()
+                self.logger.debug('Error retrieving access token: {} {}'.format(response.status, text))
+                raise Exception("Error retrieving a Domo API Access Token: " + text)
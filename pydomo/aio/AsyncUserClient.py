@@ -0,0 +1,21 @@
+import itertools
+
+from pydomo.aio.AsyncDomoAPIClient import AsyncDomoAPIClient
+from pydomo.aio.AsyncPaginator import fetch_all_pages
+from pydomo.common import DEFAULT_LIST_WORKERS, pages_to_frame
+from pydomo.users import UserClient
+
+
+class AsyncUserClient(AsyncDomoAPIClient, UserClient):
+    """
+        User Client (asyncio)
+        - Same methods as UserClient, as coroutines
+    """
+
+    async def list_all(self, df_output=True, batch_size=500, max_workers=DEFAULT_LIST_WORKERS,
+                       columnar=False):
+        pages = await fetch_all_pages(self.list, batch_size, max_workers)
+
+        if df_output:
+            return pages_to_frame(pages, columnar)
+        return list(itertools.chain.from_iterable(pages))
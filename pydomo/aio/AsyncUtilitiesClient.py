@@ -0,0 +1,278 @@
+import asyncio
+import io
+import json
+import time
+
+from pydomo.aio.AsyncDataSetClient import AsyncDataSetClient
+from pydomo.aio.AsyncDomoAPIClient import AsyncDomoAPIClient
+from pydomo.aio.AsyncPaginator import AsyncPaginator
+from pydomo.aio.AsyncStreamClient import AsyncStreamClient
+from pydomo.common import DEFAULT_LIST_WORKERS
+from pydomo.DomoAPIClient import DomoAPIClient
+from pydomo.streams import UploadManifest
+from pydomo.streams.Compression import DEFAULT_PART_COMPRESS_LEVEL
+from pydomo.streams.PartUploader import DEFAULT_UPLOAD_WORKERS
+from pydomo.utilities import UtilitiesClient
+from pydomo.utilities.UtilitiesClient import DEFAULT_PART_KBYTES, PART_COMPRESSIONS, STREAM_LIST_PAGE_SIZE
+
+
+class AsyncUtilitiesClient(AsyncDomoAPIClient, UtilitiesClient):
+    """
+        Utilities (asyncio)
+        - The schema and type helpers of UtilitiesClient, unchanged
+        - Methods that call the API are coroutines
+    """
+
+    def __init__(self, transport, logger, stream_index=None):
+        DomoAPIClient.__init__(self, transport, logger)
+        self.ds = AsyncDataSetClient(self.transport, self.logger)
+        self.stream = AsyncStreamClient(self.transport, self.logger)
+        self.stream_index = stream_index
+        self._stream_ids = {}
+        self._date_formats = {}
+        self.last_upload_stats = None
+        self.link_throughput = None
+
+    async def domo_schema(self, ds_id):
+        this_get = await self.ds.get(ds_id)
+        return this_get['schema']['columns']
+
+    async def get_stream_id(self, ds_id, refresh=False):
+        if not refresh:
+            stream_id = await self._known_stream_id(ds_id)
+            if stream_id is not None:
+                return stream_id
+        url = '/v1/streams/search?q=dataSource.id:{ds_id}'.format(ds_id=ds_id)
+        all_info = await self._get(url, 'Search to retrieve stream id')
+        stream_id = all_info[0]['id']
+        await self._remember_stream_ids({ds_id: stream_id})
+        return stream_id
+
+    async def resolve_stream_ids(self, ds_ids, max_workers=DEFAULT_LIST_WORKERS):
+        resolved = {}
+        missing = set()
+        for ds_id in ds_ids:
+            stream_id = self._stream_ids.get(ds_id)
+            if stream_id is None:
+                missing.add(ds_id)
+            else:
+                resolved[ds_id] = stream_id
+        if missing and self.stream_index is not None:
+            indexed = await asyncio.to_thread(self.stream_index.get_many, missing)
+            for ds_id in list(missing):
+                if str(ds_id) in indexed:
+                    resolved[ds_id] = self._stream_ids[ds_id] = indexed[str(ds_id)]
+                    missing.discard(ds_id)
+        if not missing:
+            return resolved
+
+        wanted = {str(ds_id): ds_id for ds_id in missing}
+
+        prefetch = max_workers if max_workers > 1 else 0
+        pages = AsyncPaginator(self.stream.list, STREAM_LIST_PAGE_SIZE, prefetch=prefetch,
+                               stop_on_short_page=True).pages()
+        try:
+            async for page in pages:
+                found = {stream['dataSet']['id']: stream['id'] for stream in page
+                         if stream.get('dataSet', {}).get('id')}
+                await self._remember_stream_ids(found)
+                for ds_id in wanted.keys() & found.keys():
+                    resolved[wanted.pop(ds_id)] = found[ds_id]
+                if not wanted:
+                    break
+        finally:
+            await pages.aclose()
+        return resolved
+
+    # The StreamIndex file can be locked by other processes, so its SQLite
+    # queries, which may wait out the lock, run in worker threads
+
+    async def _known_stream_id(self, ds_id):
+        stream_id = self._stream_ids.get(ds_id)
+        if stream_id is None and self.stream_index is not None:
+            stream_id = await asyncio.to_thread(self.stream_index.get, ds_id)
+            if stream_id is not None:
+                self._stream_ids[ds_id] = stream_id
+        return stream_id
+
+    async def _remember_stream_ids(self, stream_ids):
+        self._stream_ids.update(stream_ids)
+        if self.stream_index is not None:
+            await asyncio.to_thread(self.stream_index.put_many, list(stream_ids.items()))
+
+    async def _forget_stream_id(self, ds_id):
+        self._stream_ids.pop(ds_id, None)
+        if self.stream_index is not None:
+            await asyncio.to_thread(self.stream_index.discard, ds_id)
+
+    async def stream_upload(self, ds_id, df_up, warn_schema_change=True,
+                            max_workers=DEFAULT_UPLOAD_WORKERS, max_inflight_bytes=None,
+                            part_kbytes=DEFAULT_PART_KBYTES, compression=None,
+                            compresslevel=DEFAULT_PART_COMPRESS_LEVEL, encode_processes=None,
+                            resumable=False):
+        """Upload a DataFrame to the stream behind a DataSet.
+
+        Up to `max_workers` parts are in flight at once; each part is
+        serialized (and compressed) on a worker thread so the event loop
+        is not blocked. If any part fails the other uploads are
+        cancelled, the execution is aborted and the error is raised.
+        `compression`, `encode_processes` and `resumable` work as in
+        UtilitiesClient.stream_upload.
+        """
+        if compression not in PART_COMPRESSIONS:
+            raise ValueError("compression must be None, 'gzip' or 'auto'")
+
+        cached_stream_id = await self._known_stream_id(ds_id)
+        domoSchema, stream_id = await asyncio.gather(self.domo_schema(ds_id), self.get_stream_id(ds_id))
+        dataSchema = self.data_schema(df_up)
+
+        if self.identical(domoSchema, dataSchema) == False:
+            new_schema = {'schema': {'columns': dataSchema}}
+            url = '/v1/datasets/{ds}'.format(ds=ds_id)
+            response = await self.transport.put(url, new_schema)
+            response.release()
+            if warn_schema_change:
+                print('Schema Updated')
+
+        df_rows = len(df_up.index)
+        sized_compression = 'gzip' if compression == 'gzip' else None
+        row_bytes = await asyncio.to_thread(self.estimate_row_bytes, df_up, sized_compression, compresslevel)
+        chunksz = max(self.estimate_chunk_rows(df_up, part_kbytes, row_bytes=row_bytes), 1)
+
+        manifest = await self._resumable_manifest(stream_id, df_rows) if resumable else None
+        if manifest is not None:
+            exec_id = manifest.execution_id
+            chunksz = manifest.rows_per_part
+        else:
+            try:
+                exec_info = await self.stream.create_execution(stream_id)
+            except Exception:
+                if cached_stream_id is None:
+                    raise
+                # The cached Stream may have been deleted or replaced
+                await self._forget_stream_id(ds_id)
+                stream_id = await self.get_stream_id(ds_id, refresh=True)
+                exec_info = await self.stream.create_execution(stream_id)
+            exec_id = exec_info['id']
+            if resumable:
+                manifest = UploadManifest(UploadManifest.path_for(self.transport.apiHost, stream_id),
+                                          stream_id, exec_id, df_rows, chunksz)
+                await asyncio.to_thread(manifest.save)
+        part_bytes = int(row_bytes[0] * min(chunksz, df_rows))
+        encoder = self._part_encoder(df_up, chunksz, compresslevel, encode_processes)
+        if encode_processes:
+            max_workers = max(max_workers, encoder.processes)
+        max_parts = max_workers
+        if max_inflight_bytes is not None:
+            max_parts = max(1, min(max_workers, max_inflight_bytes // max(part_bytes, 1)))
+        semaphore = asyncio.Semaphore(max_parts)
+
+        def encode(part_num, start, part_compression):
+            # Worker threads are shared, so each part gets its own buffer
+            body = encoder.encode(start, io.BytesIO(), part_compression)
+            if manifest is not None:
+                # Skip parts already uploaded with the same content
+                return manifest.track(part_num, body, part_compression)
+            return body
+
+        part_sizes = {}
+        part_seconds = {}
+
+        async def upload(part_num, start, part_compression):
+            if manifest is not None:
+                part_compression = manifest.compression_of(part_num, part_compression)
+            async with semaphore:
+                body = await asyncio.to_thread(encode, part_num, start, part_compression)
+                if body is None:
+                    return
+                part_sizes[part_num] = body.getbuffer().nbytes
+                upload_started = time.monotonic()
+                await self.stream.upload_part(stream_id, exec_id, part_num, body,
+                                              compression=part_compression)
+                part_seconds[part_num] = time.monotonic() - upload_started
+                if manifest is not None:
+                    await asyncio.to_thread(manifest.record, part_num, part_sizes[part_num])
+
+        def measured_throughput():
+            seconds = sum(part_seconds.values())
+            if seconds <= 0:
+                return None
+            return sum(part_sizes[part] for part in part_seconds) / seconds
+
+        parts = enumerate(encoder.starts())
+        part_compression = compression
+        started = time.monotonic()
+        tasks = []
+        try:
+            if compression == 'auto':
+                link_throughput = self.link_throughput
+                probe = None
+                if link_throughput is None and len(encoder) > 1:
+                    # Time the first part sent as is
+                    probe = asyncio.ensure_future(upload(*next(parts), None))
+                    tasks.append(probe)
+                ratio, compress_speed = await asyncio.to_thread(self.measure_compression,
+                                                                df_up, compresslevel)
+                if probe is not None:
+                    await probe
+                    link_throughput = measured_throughput()
+                part_compression = self.choose_compression(ratio, compress_speed, link_throughput)
+            tasks.extend(asyncio.ensure_future(upload(i, start, part_compression))
+                         for i, start in parts)
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if manifest is None:
+                await self._abort_execution(stream_id, exec_id)
+            raise
+        finally:
+            await asyncio.to_thread(encoder.close)
+
+        self.link_throughput = measured_throughput() or self.link_throughput
+        self.last_upload_stats = self._upload_stats(df_rows, chunksz, part_kbytes, part_bytes,
+                                                    part_sizes, time.monotonic() - started)
+        self.last_upload_stats['compression'] = part_compression
+        self.last_upload_stats['link_throughput'] = self.link_throughput
+        result = await self.stream.commit_execution(stream_id, exec_id)
+        if manifest is not None:
+            manifest.delete()
+        return result
+
+    async def _resumable_manifest(self, stream_id, rows):
+        manifest = await asyncio.to_thread(UploadManifest.load,
+                                           UploadManifest.path_for(self.transport.apiHost, stream_id))
+        if manifest is None or manifest.stream_id != stream_id:
+            return None
+        try:
+            execution = await self.stream.get_execution(stream_id, manifest.execution_id)
+        except Exception as err:
+            self.logger.debug('Cannot resume execution {} on stream {}: {}'
+                              .format(manifest.execution_id, stream_id, err))
+            return None
+        if execution.get('currentState') != 'ACTIVE':
+            return None
+        if manifest.rows != rows:
+            await self._abort_execution(stream_id, manifest.execution_id)
+            return None
+        return manifest
+
+    async def _abort_execution(self, stream_id, exec_id):
+        try:
+            await self.stream.abort_execution(stream_id, exec_id)
+        except Exception as err:
+            self.logger.debug('Error aborting execution {} on stream {}: {}'
+                              .format(exec_id, stream_id, err))
+
+    async def stream_create(self, up_ds, name, description, updateMethod='REPLACE', keyColumnNames=[]):
+        df_schema = self.data_schema(up_ds)
+        req_body = {'dataSet': {'name': name, 'description': description, 'schema': {'columns': df_schema}}, 'updateMethod': updateMethod}
+        if( updateMethod == 'UPSERT' ):
+            req_body['keyColumnNames'] = keyColumnNames
+        response = await self.transport.post('/v1/streams/', req_body, {})
+        async with response:
+            new_stream = json.loads(await response.text())
+        if 'dataSet' in new_stream and 'id' in new_stream:
+            await self._remember_stream_ids({new_stream['dataSet']['id']: new_stream['id']})
+        return new_stream
@@ -0,0 +1,11 @@
+from .AsyncTransport import AsyncDomoAPITransport
+from .AsyncDomoAPIClient import AsyncDomoAPIClient
+from .AsyncPaginator import AsyncPaginator
+from .AsyncAccountClient import AsyncAccountClient
+from .AsyncDataSetClient import AsyncDataSetClient
+from .AsyncGroupClient import AsyncGroupClient
+from .AsyncPageClient import AsyncPageClient
+from .AsyncStreamClient import AsyncStreamClient
+from .AsyncUserClient import AsyncUserClient
+from .AsyncUtilitiesClient import AsyncUtilitiesClient
+from .AsyncDomo import AsyncDomo
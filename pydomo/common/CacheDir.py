@@ -0,0 +1,19 @@
+import os
+
+
+def default_cache_dir(*parts):
+    """Return (and create) a directory under the pydomo cache root.
+
+    The root is $PYDOMO_CACHE_DIR if set, otherwise 'pydomo' under the
+    platform's user cache directory.
+    """
+    root = os.environ.get('PYDOMO_CACHE_DIR')
+    if not root:
+        if os.name == 'nt':
+            base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+        else:
+            base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+        root = os.path.join(base, 'pydomo')
+    path = os.path.join(os.path.expanduser(root), *parts)
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    return path
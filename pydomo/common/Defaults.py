@@ -0,0 +1,23 @@
+"""Default settings shared by the clients and Domo.
+
+Kept free of imports so that `import pydomo` can use them without loading
+the client modules.
+"""
+
+# Target size of an uploaded stream part, in KB
+DEFAULT_PART_KBYTES = 30000
+# Stream parts uploaded in parallel
+DEFAULT_UPLOAD_WORKERS = 4
+# gzip level of parts compressed on the fly from a DataFrame
+DEFAULT_PART_COMPRESS_LEVEL = 6
+# Concurrent requests when adding or removing group members
+DEFAULT_MEMBERSHIP_WORKERS = 8
+
+# Buffered CSV bytes that trigger uploading a StreamWriter part
+DEFAULT_WRITER_PART_BYTES = 30 * 1000 * 1000
+# Seconds rows may wait in a StreamWriter buffer before they are uploaded
+DEFAULT_FLUSH_INTERVAL = 60
+# Seconds a StreamWriter execution stays open before its parts are committed
+DEFAULT_COMMIT_INTERVAL = 300
+# Buffered bytes kept in memory before spilling a StreamWriter buffer to disk
+DEFAULT_SPILL_BYTES = 64 * 1024 * 1024
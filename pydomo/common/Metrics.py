@@ -0,0 +1,25 @@
+import threading
+
+
+class Metrics(object):
+    """Thread-safe named counters, e.g. requests sent or seconds slept."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def increment(self, name, amount=1):
+        with self._lock:
+            self._values[name] = self._values.get(name, 0) + amount
+
+    def get(self, name):
+        with self._lock:
+            return self._values.get(name, 0)
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._values)
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
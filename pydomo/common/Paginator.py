@@ -0,0 +1,146 @@
+import itertools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_PREFETCH_PAGES = 2
+DEFAULT_LIST_WORKERS = 4
+
+
+class Paginator(object):
+    """Iterate over a limit/offset paged list endpoint.
+
+    `fetch_page(limit, offset)` returns one page as a list. Pages are
+    requested `per_page` rows at a time starting at `offset`; a non-zero
+    `limit` caps the total number of rows requested and returned.
+    Iteration ends at the first empty page, or at the first page shorter
+    than requested if `stop_on_short_page` is set.
+
+    With `prefetch` > 0 the next `prefetch` pages are fetched on
+    background threads while the caller consumes the current one, so at
+    most `prefetch` + 1 pages are held in memory at a time. Pending
+    fetches are cancelled when iteration stops early.
+    """
+
+    def __init__(self, fetch_page, per_page, offset=0, limit=0, prefetch=0,
+                 stop_on_short_page=False):
+        if per_page < 1:
+            raise ValueError('per_page must be at least 1')
+        if prefetch < 0:
+            raise ValueError('prefetch must not be negative')
+        self.fetch_page = fetch_page
+        self.per_page = per_page
+        self.offset = offset
+        self.limit = limit
+        self.prefetch = prefetch
+        self.stop_on_short_page = stop_on_short_page
+
+    def windows(self):
+        """Yield the (limit, offset) of each page to request, in order."""
+        offset = self.offset
+        remaining = self.limit
+        while not self.limit or remaining > 0:
+            page_limit = min(self.per_page, remaining) if self.limit else self.per_page
+            yield page_limit, offset
+            offset += page_limit
+            remaining -= page_limit
+
+    def is_last_page(self, page, page_limit):
+        return not page or (self.stop_on_short_page and len(page) < page_limit)
+
+    def pages(self):
+        """Yield each non-empty page as returned by `fetch_page`."""
+        if self.prefetch:
+            pages = self._prefetched_pages()
+        else:
+            pages = ((page_limit, self.fetch_page(page_limit, offset))
+                     for page_limit, offset in self.windows())
+        try:
+            for page_limit, page in pages:
+                if page:
+                    yield page
+                if self.is_last_page(page, page_limit):
+                    return
+        finally:
+            pages.close()
+
+    def __iter__(self):
+        count = 0
+        for page in self.pages():
+            for item in page:
+                yield item
+                count += 1
+                if self.limit and count >= self.limit:
+                    return
+
+    def _prefetched_pages(self):
+        windows = self.windows()
+        pending = deque()
+        executor = ThreadPoolExecutor(max_workers=self.prefetch,
+                                      thread_name_prefix='pydomo-paginator')
+
+        def submit():
+            for page_limit, offset in windows:
+                pending.append((page_limit, executor.submit(self.fetch_page, page_limit, offset)))
+                return
+
+        try:
+            for _ in range(self.prefetch + 1):
+                submit()
+            while pending:
+                page_limit, future = pending.popleft()
+                page = future.result()
+                submit()
+                yield page_limit, page
+        finally:
+            for _, future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+
+def fetch_all_pages(fetch_page, per_page, max_workers=DEFAULT_LIST_WORKERS):
+    """Return every page of a limit/offset endpoint as a list of pages.
+
+    Up to `max_workers` offset windows are requested concurrently, and
+    listing stops at the first page shorter than `per_page`. Callers
+    flatten the result with itertools.chain or `pages_to_frame` rather
+    than extending one list page by page.
+    """
+    prefetch = max_workers if max_workers > 1 else 0
+    paginator = Paginator(fetch_page, per_page, prefetch=prefetch, stop_on_short_page=True)
+    return list(paginator.pages())
+
+
+def records_to_columns(pages):
+    """Turn pages of dict records into a dict of equal-length column lists.
+
+    Columns appear in first-seen key order; records missing a key get NaN
+    there, as pandas.DataFrame does when built from a list of records.
+    """
+    columns = {}
+    row_count = 0
+    for page in pages:
+        for record in page:
+            for key, value in record.items():
+                column = columns.get(key)
+                if column is None:
+                    column = columns[key] = [float('nan')] * row_count
+                elif len(column) < row_count:
+                    # Pad only columns the previous records skipped
+                    column.extend([float('nan')] * (row_count - len(column)))
+                column.append(value)
+            row_count += 1
+    for column in columns.values():
+        column.extend([float('nan')] * (row_count - len(column)))
+    return columns
+
+
+def pages_to_frame(pages, columnar=False):
+    """Build a pandas DataFrame from pages of dict records.
+
+    By default pandas builds it from the flattened records; with
+    `columnar` the columns are assembled first by `records_to_columns`.
+    """
+    from pandas import DataFrame
+    if columnar:
+        return DataFrame(records_to_columns(pages))
+    return DataFrame(list(itertools.chain.from_iterable(pages)))
@@ -1 +1,9 @@
 from .DomoObject import DomoObject
+from .CacheDir import default_cache_dir
+from .Defaults import (DEFAULT_COMMIT_INTERVAL, DEFAULT_FLUSH_INTERVAL, DEFAULT_MEMBERSHIP_WORKERS,
+                       DEFAULT_PART_COMPRESS_LEVEL, DEFAULT_PART_KBYTES, DEFAULT_SPILL_BYTES,
+                       DEFAULT_UPLOAD_WORKERS, DEFAULT_WRITER_PART_BYTES)
+from .FileLock import FileLock
+from .Metrics import Metrics
+from .Paginator import (Paginator, DEFAULT_LIST_WORKERS, DEFAULT_PREFETCH_PAGES, fetch_all_pages, pages_to_frame,
+                        records_to_columns)
@@ -1,10 +1,8 @@
 import os
 import requests
-from pandas import read_csv
-from pandas import DataFrame
-from io import StringIO
 
 from pydomo.datasets import Sorting, UpdateMethod
+from pydomo.common import DEFAULT_PREFETCH_PAGES, Paginator
 from pydomo.DomoAPIClient import DomoAPIClient
 from pydomo.Transport import HTTPMethod
 
@@ -43,38 +41,25 @@ class DataSetClient(DomoAPIClient):
         List DataSets
         Returns a generator that will call the API multiple times
         If limit is supplied and non-zero, returns up to limit datasets
+        The next `prefetch` pages are fetched in the background while the
+        current one is consumed; 0 fetches one page at a time
     """
     def list(self, sort=Sorting.DEFAULT, per_page=50,
-             offset=0, limit=0, name_like=""):
+             offset=0, limit=0, name_like="", prefetch=DEFAULT_PREFETCH_PAGES):
         # API uses pagination with a max of 50 per page
         if per_page not in range(1, 51):
             raise ValueError('per_page must be between 1 and 50 (inclusive)')
 
-        # Don't pull 50 values if user requests 10
-        if limit:
-            per_page = min(per_page, limit)
-
         params = {
             'sort': sort,
-            'limit': per_page,
-            'offset': offset,
             'nameLike': name_like
         }
-        dataset_count = 0
 
-        datasets = self._list(URL_BASE, params, DATA_SET_DESC)
-        while datasets:
-            for dataset in datasets:
-                yield dataset
-                dataset_count += 1
-                if limit and dataset_count >= limit:
-                    return
+        def fetch_page(page_limit, page_offset):
+            page_params = dict(params, limit=page_limit, offset=page_offset)
+            return self._list(URL_BASE, page_params, DATA_SET_DESC)
 
-            params['offset'] += per_page
-            if limit and params['offset'] + per_page > limit:
-                # Don't need to pull more than the limit
-                params['limit'] = limit - params['offset']
-            datasets = self._list(URL_BASE, params, DATA_SET_DESC)
+        return iter(Paginator(fetch_page, per_page, offset, limit, prefetch))
 
     """
         Update a DataSet
@@ -120,6 +105,25 @@ class DataSetClient(DomoAPIClient):
             self.logger.debug("Error downloading data from DataSet: " + self.transport.dump_response(response))
             raise Exception("Error downloading data from DataSet: " + response.text)
 
+    """
+        Export data as a readable binary CSV stream (not held in memory)
+        - The returned file-like object reads straight from the HTTP response
+          and can be passed to pandas.read_csv or csv.reader
+        - Close the stream when done to release the connection
+    """
+    def data_export_stream(self, dataset_id, include_csv_header):
+        url = '{base}/{dataset_id}/data'.format(
+                base=URL_BASE, dataset_id=dataset_id)
+        response = self._download_csv(url, include_csv_header)
+        if response.status_code == requests.codes.ok:
+            response.raw.decode_content = True
+            # keep the stream readable at EOF for wrappers like TextIOWrapper
+            response.raw.auto_close = False
+            return response.raw
+        else:
+            self.logger.debug("Error downloading data from DataSet: " + self.transport.dump_response(response))
+            raise Exception("Error downloading data from DataSet: " + response.text)
+
     """
         Export data to a CSV file (streams to disk)
     """
@@ -1,5 +1,9 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from pydomo.common import DEFAULT_LIST_WORKERS, DEFAULT_MEMBERSHIP_WORKERS, fetch_all_pages
 from pydomo.DomoAPIClient import DomoAPIClient
 from pydomo.Transport import HTTPMethod
+import itertools
 import requests
 
 
@@ -77,3 +81,66 @@ class GroupClient(DomoAPIClient):
         url = self._base(group_id) + '/users/' + str(user_id)
         desc = "a User in a Group"
         return self._delete(url, desc)
+
+    """
+        Add Users to a Group
+        Runs up to `max_workers` requests at a time and returns a report:
+        {'succeeded': [user ids], 'failed': {user id: error message}}
+    """
+    def add_users(self, group_id, user_ids, max_workers=DEFAULT_MEMBERSHIP_WORKERS):
+        return self._bulk_membership(self.add_user, group_id, user_ids, max_workers)
+
+    """
+        Remove Users from a Group
+        Runs up to `max_workers` requests at a time and returns a report
+        like `add_users`
+    """
+    def remove_users(self, group_id, user_ids, max_workers=DEFAULT_MEMBERSHIP_WORKERS):
+        return self._bulk_membership(self.remove_user, group_id, user_ids, max_workers)
+
+    """
+        Make a Group's membership equal to `user_ids`
+        Only users missing from the Group are added and only users not in
+        `user_ids` are removed. Returns {'added': report, 'removed': report}
+    """
+    def sync_members(self, group_id, user_ids, max_workers=DEFAULT_MEMBERSHIP_WORKERS):
+        current = set(self.list_all_users(group_id))
+        desired = list(dict.fromkeys(user_ids))
+        to_add = [x for x in desired if x not in current]
+        desired = set(desired)
+        to_remove = [x for x in current if x not in desired]
+        return {
+            'added': self.add_users(group_id, to_add, max_workers),
+            'removed': self.remove_users(group_id, to_remove, max_workers),
+        }
+
+    """
+        List all Users in a Group
+    """
+    def list_all_users(self, group_id, batch_size=500, max_workers=DEFAULT_LIST_WORKERS):
+        def list_users(limit, offset):
+            return self.list_users(group_id, limit, offset)
+        pages = fetch_all_pages(list_users, batch_size, max_workers)
+        return list(itertools.chain.from_iterable(pages))
+
+    def _bulk_membership(self, change, group_id, user_ids, max_workers):
+        user_ids = list(dict.fromkeys(user_ids))
+        report = {'succeeded': [], 'failed': {}}
+        if not user_ids:
+            return report
+
+        def run(user_id):
+            try:
+                change(group_id, user_id)
+            except Exception as err:
+                return err
+            return None
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(user_ids))),
+                                thread_name_prefix='pydomo-groups') as executor:
+            for user_id, err in zip(user_ids, executor.map(run, user_ids)):
+                if err is None:
+                    report['succeeded'].append(user_id)
+                else:
+                    report['failed'][user_id] = str(err)
+        return report
@@ -1,5 +1,6 @@
 import requests
 
+from pydomo.common import DEFAULT_PREFETCH_PAGES, Paginator
 from pydomo.DomoAPIClient import DomoAPIClient
 from pydomo.Transport import HTTPMethod
 
@@ -91,10 +92,12 @@ class PageClient(DomoAPIClient):
         url = '{base}/{page_id}'.format(base=URL_BASE, page_id=page_id)
         return self._get(url, PAGE_DESC)
 
-    def list(self, per_page=50, offset=0, limit=0):
+    def list(self, per_page=50, offset=0, limit=0, prefetch=DEFAULT_PREFETCH_PAGES):
         """List pages.
         Returns a generator that will call the API multiple times
         If limit is supplied and non-zero, returns up to limit pages
+        The next `prefetch` pages are fetched in the background while the
+        current one is consumed; 0 fetches one page at a time
 
         >>> list(domo.pages.list())
         [{'id': 123456789, 'name': 'My Page', 'children': []}, ...]
@@ -105,29 +108,15 @@ class PageClient(DomoAPIClient):
         # API uses pagination with a max of 50 per page
         if per_page not in range(1, 51):
             raise ValueError('per_page must be between 1 and 50 (inclusive)')
-        # Don't pull 50 values if user requests 10
-        if limit:
-            per_page = min(per_page, limit)
-
-        params = {
-            'limit': per_page,
-            'offset': offset,
-        }
-        page_count = 0
-
-        pages = self._list(URL_BASE, params, PAGE_DESC)
-        while pages:
-            for page in pages:
-                yield page
-                page_count += 1
-                if limit and page_count >= limit:
-                    return
-
-            params['offset'] += per_page
-            if limit and params['offset'] + per_page > limit:
-                # Don't need to pull more than the limit
-                params['limit'] = limit - params['offset']
-            pages = self._list(URL_BASE, params, PAGE_DESC)
+
+        def fetch_page(page_limit, page_offset):
+            params = {
+                'limit': page_limit,
+                'offset': page_offset,
+            }
+            return self._list(URL_BASE, params, PAGE_DESC)
+
+        return iter(Paginator(fetch_page, per_page, offset, limit, prefetch))
 
     def update(self, page_id=None, **kwargs):
         """Update a page.
@@ -0,0 +1,46 @@
+import zlib
+
+from pydomo.common import DEFAULT_PART_COMPRESS_LEVEL
+
+# zlib window bits that produce a gzip header and trailer
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+DEFAULT_COMPRESS_LEVEL = 9
+
+
+def iter_gzip(fileobj, chunk_size=DEFAULT_CHUNK_SIZE, compresslevel=DEFAULT_COMPRESS_LEVEL):
+    """Gzip a binary file-like object as a stream of compressed chunks.
+
+    Reads `chunk_size` bytes at a time, so memory use is bounded by the
+    chunk size no matter how large the input is. Passing the generator
+    as a request body makes 'requests' send it with chunked transfer
+    encoding.
+    """
+    compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, GZIP_WBITS)
+    while True:
+        chunk = fileobj.read(chunk_size)
+        if not chunk:
+            break
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def gzip_into(data, buffer, compresslevel=DEFAULT_COMPRESS_LEVEL, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Gzip a bytes-like object into a binary buffer, returning the buffer rewound to 0.
+
+    The buffer is overwritten from the start and cut to the compressed
+    size, so a buffer reused for parts of similar size keeps its
+    allocation. `data` is fed to the compressor `chunk_size` bytes at a
+    time through a memoryview, without copying it.
+    """
+    compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, GZIP_WBITS)
+    buffer.seek(0)
+    with memoryview(data) as view:
+        for start in range(0, len(view), chunk_size):
+            buffer.write(compressor.compress(view[start:start + chunk_size]))
+    buffer.write(compressor.flush())
+    buffer.truncate()
+    buffer.seek(0)
+    return buffer
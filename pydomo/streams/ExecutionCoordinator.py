@@ -0,0 +1,228 @@
+import contextlib
+import hashlib
+import os
+import threading
+
+from pydomo.common import FileLock, Metrics, default_cache_dir
+
+
+class ExecutionCoordinator(object):
+    """Keep uploads to the same Stream from opening competing Executions.
+
+    Only one Execution per Stream is open at a time among the uploads
+    going through a coordinator. APPEND uploads that arrive while another
+    Execution is open on their Stream are queued and then merged: the
+    next Execution is opened once for all of them, each upload sends its
+    parts under its own range of part numbers, and a single commit
+    finishes the batch. Other uploads, which must not be merged, take the
+    Stream for their own Execution with `exclusive`.
+
+    A merged batch succeeds or fails as a whole: if any of its uploads
+    fails, the Execution is aborted and every upload in it raises.
+
+    Uploads are coordinated within the process. With `file_locks`,
+    Executions are also serialized across processes by a lock file per
+    Stream in `lock_dir` (default: the 'locks' directory under the pydomo
+    cache root); merging still only happens within a process.
+
+    'batches', 'merged_uploads' and 'exclusive' Executions are counted in
+    `metrics`.
+    """
+
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, file_locks=False, lock_dir=None):
+        self.file_locks = file_locks
+        if file_locks:
+            if lock_dir is None:
+                lock_dir = default_cache_dir('locks')
+            else:
+                lock_dir = os.path.expanduser(lock_dir)
+                os.makedirs(lock_dir, mode=0o700, exist_ok=True)
+        self.lock_dir = lock_dir
+        self.metrics = Metrics()
+        self._streams = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def default(cls):
+        """Return the coordinator shared by every Domo instance in this process."""
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+            return cls._default
+
+    def append(self, stream_client, stream_id, part_count, upload):
+        """Run an APPEND upload in a merged Execution, returning the committed Execution.
+
+        `upload(execution_id, first_part)` must upload the upload's
+        `part_count` parts numbered from `first_part`.
+        """
+        state = self._state(stream_client, stream_id)
+        with state.lock:
+            batch = state.open_batch
+            if batch is None:
+                batch = state.open_batch = _Batch()
+            request = batch.add(part_count)
+        if request == 0:
+            self._lead(state, batch, stream_client, stream_id)
+        batch.opened.wait()
+        if batch.error is not None:
+            raise batch.error
+
+        try:
+            upload(batch.execution_id, batch.first_parts[request])
+        except BaseException as err:
+            batch.done(err)
+            # Return only once the Execution is aborted
+            batch.finished.wait()
+            raise
+        batch.done()
+        batch.finished.wait()
+        if batch.error is not None:
+            raise batch.error
+        return batch.result
+
+    @contextlib.contextmanager
+    def exclusive(self, stream_client, stream_id):
+        """Context manager holding the Stream for one Execution that is not merged."""
+        release = self._acquire(self._state(stream_client, stream_id))
+        self.metrics.increment('exclusive')
+        try:
+            yield
+        finally:
+            release()
+
+    def _lead(self, state, batch, stream_client, stream_id):
+        """Open the batch's Execution, then commit it on a thread once its uploads finish."""
+        release = None
+        try:
+            release = self._acquire(state)
+            # Uploads that queued while the previous Execution was open join this one
+            with state.lock:
+                state.open_batch = None
+                batch.close()
+            batch.execution_id = stream_client.create_execution(stream_id, 'APPEND')['id']
+        except BaseException as err:
+            # Later uploads must start a new batch rather than wait on this one
+            with state.lock:
+                if state.open_batch is batch:
+                    state.open_batch = None
+            batch.fail(err)
+            if release is not None:
+                release()
+            return
+        self.metrics.increment('batches')
+        self.metrics.increment('merged_uploads', len(batch.part_counts))
+        batch.opened.set()
+        threading.Thread(target=self._finish, args=(release, batch, stream_client, stream_id),
+                         name='pydomo-execution-commit', daemon=True).start()
+
+    def _finish(self, release, batch, stream_client, stream_id):
+        try:
+            batch.all_done.wait()
+            if batch.failed:
+                try:
+                    stream_client.abort_execution(stream_id, batch.execution_id)
+                except Exception as err:
+                    stream_client.logger.debug('Error aborting execution {} on stream {}: {}'
+                                               .format(batch.execution_id, stream_id, err))
+                batch.error = batch.failed[0] if len(batch.part_counts) == 1 else Exception(
+                    'Execution {} on stream {} was aborted: {} of {} merged uploads failed: {}'.format(
+                        batch.execution_id, stream_id, len(batch.failed), len(batch.part_counts),
+                        batch.failed[0]))
+            else:
+                try:
+                    batch.result = stream_client.commit_execution(stream_id, batch.execution_id)
+                except Exception as err:
+                    batch.error = err
+        finally:
+            release()
+            batch.finished.set()
+
+    def _state(self, stream_client, stream_id):
+        api_host = getattr(stream_client.transport, 'apiHost', '')
+        key = (api_host, str(stream_id))
+        with self._lock:
+            state = self._streams.get(key)
+            if state is None:
+                state = self._streams[key] = _StreamState(key)
+            return state
+
+    def _acquire(self, state):
+        """Take the Stream for an Execution, returning the function that gives it back.
+
+        The release may happen on another thread than the acquire.
+        """
+        state.execution_lock.acquire()
+        if not self.file_locks:
+            return state.execution_lock.release
+        file_lock = FileLock(self._lock_path(state.key))
+        try:
+            file_lock.acquire()
+        except BaseException:
+            state.execution_lock.release()
+            raise
+
+        def release():
+            try:
+                file_lock.release()
+            finally:
+                state.execution_lock.release()
+        return release
+
+    def _lock_path(self, key):
+        name = hashlib.sha256('\n'.join(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.lock_dir, name + '.lock')
+
+
+class _StreamState(object):
+
+    def __init__(self, key):
+        self.key = key
+        self.lock = threading.Lock()
+        # Held while an Execution is open on the Stream; not reentrant on purpose
+        self.execution_lock = threading.Lock()
+        self.open_batch = None
+
+
+class _Batch(object):
+    """Uploads sharing one Execution."""
+
+    def __init__(self):
+        self.part_counts = []
+        self.first_parts = []
+        self.execution_id = None
+        self.result = None
+        self.error = None
+        self.failed = []
+        self.opened = threading.Event()
+        self.all_done = threading.Event()
+        self.finished = threading.Event()
+        self._remaining = None
+        self._lock = threading.Lock()
+
+    def add(self, part_count):
+        self.part_counts.append(part_count)
+        return len(self.part_counts) - 1
+
+    def close(self):
+        first_part = 0
+        for part_count in self.part_counts:
+            self.first_parts.append(first_part)
+            first_part += part_count
+        self._remaining = len(self.part_counts)
+
+    def fail(self, err):
+        self.error = err
+        self.opened.set()
+        self.finished.set()
+
+    def done(self, err=None):
+        with self._lock:
+            if err is not None:
+                self.failed.append(err)
+            self._remaining -= 1
+            if self._remaining == 0:
+                self.all_done.set()
@@ -0,0 +1,157 @@
+import io
+import mmap
+import os
+import threading
+
+from pydomo.streams.Compression import DEFAULT_CHUNK_SIZE, DEFAULT_PART_COMPRESS_LEVEL, gzip_into
+
+# Uncompressed size of a part cut from a file, in bytes
+DEFAULT_FILE_PART_BYTES = 50 * 1024 * 1024
+
+
+class CsvFileSplitter(object):
+    """Cut a CSV file into line-aligned byte ranges to upload as stream parts.
+
+    The file is memory-mapped, so only the pages being scanned or sent
+    are resident, whatever the file size. Each part ends at the first
+    newline at or after `part_size` bytes from its start. With
+    `quoted_newlines`, newlines inside double-quoted fields are not
+    taken as boundaries; finding them means counting quotes through the
+    whole file, which is slower than the default scan. `skip_header`
+    leaves out the first line.
+
+    `open_part` returns a seekable reader over a range, which is sent
+    without being copied into memory; `encode` with compression='gzip'
+    compresses a range into a per-thread reusable buffer at
+    `compresslevel`.
+
+    >>> with CsvFileSplitter('extract.csv', skip_header=True) as splitter:
+    ...     for start, end in splitter.boundaries():
+    ...         body = splitter.encode(start, end, 'gzip')
+    """
+
+    def __init__(self, path, part_size=DEFAULT_FILE_PART_BYTES, quoted_newlines=False,
+                 skip_header=False, compresslevel=DEFAULT_PART_COMPRESS_LEVEL):
+        if part_size < 1:
+            raise ValueError('part_size must be at least 1')
+        self.path = os.path.expanduser(path)
+        self.part_size = part_size
+        self.quoted_newlines = quoted_newlines
+        self.skip_header = skip_header
+        self.compresslevel = compresslevel
+        self._file = open(self.path, 'rb')
+        self.size = os.fstat(self._file.fileno()).st_size
+        # Empty files cannot be mapped
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else None
+        self._local = threading.local()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def boundaries(self):
+        """Yield the (start, end) byte offsets of each part, in order."""
+        start, quotes = self._line_end(0, 0) if self.skip_header else (0, 0)
+        while start < self.size:
+            end, quotes = self._line_end(min(start + self.part_size, self.size) - 1, quotes, start)
+            yield start, end
+            start = end
+
+    def open_part(self, start, end):
+        """Return a seekable binary reader over bytes [start, end) of the file."""
+        return _MappedRange(self._map, start, end)
+
+    def encode(self, start, end, compression=None, buffer=None):
+        """Return the body of a part: a reader, or a gzipped buffer rewound to 0.
+
+        Gzipped parts go to `buffer` if given, else to the thread's own.
+        """
+        if compression is None:
+            return self.open_part(start, end)
+        if compression != 'gzip':
+            raise ValueError("compression must be None or 'gzip'")
+        if buffer is None:
+            buffer = getattr(self._local, 'buffer', None)
+            if buffer is None:
+                buffer = self._local.buffer = io.BytesIO()
+        with memoryview(self._map) as view:
+            part = view[start:end]
+            try:
+                return gzip_into(part, buffer, self.compresslevel)
+            finally:
+                part.release()
+
+    def _line_end(self, position, quotes, counted_from=None):
+        """Return the offset just past the first boundary newline at or after `position`.
+
+        `quotes` is the quote count of the file up to `counted_from`
+        (default: `position`), and the count up to the returned offset is
+        returned with it; it is only tracked with `quoted_newlines`.
+        """
+        if self.quoted_newlines and counted_from is not None:
+            quotes += self._count_quotes(counted_from, position)
+        while position < self.size:
+            newline = self._map.find(b'\n', position)
+            end = self.size if newline < 0 else newline + 1
+            if not self.quoted_newlines:
+                return end, quotes
+            quotes += self._count_quotes(position, end)
+            if quotes % 2 == 0:
+                return end, quotes
+            position = end
+        return self.size, quotes
+
+    def _count_quotes(self, start, end):
+        count = 0
+        # Slices of the map are copies, so count a chunk at a time
+        for chunk_start in range(start, end, DEFAULT_CHUNK_SIZE):
+            count += self._map[chunk_start:min(end, chunk_start + DEFAULT_CHUNK_SIZE)].count(b'"')
+        return count
+
+
+class _MappedRange(io.RawIOBase):
+    """Read-only file object over a byte range of a memory map."""
+
+    def __init__(self, mapped, start, end):
+        super(_MappedRange, self).__init__()
+        self._map = mapped
+        self._start = start
+        self._end = end
+        self._position = start
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        count = min(len(buffer), self._end - self._position)
+        if count <= 0:
+            return 0
+        buffer[:count] = self._map[self._position:self._position + count]
+        self._position += count
+        return count
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            position = self._start + offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self._end + offset
+        else:
+            raise ValueError('invalid whence ({})'.format(whence))
+        self._position = min(max(position, self._start), self._end)
+        return self._position - self._start
+
+    def tell(self):
+        return self._position - self._start
@@ -0,0 +1,79 @@
+import io
+import threading
+
+from pydomo.streams.Compression import DEFAULT_PART_COMPRESS_LEVEL, gzip_into
+
+
+class CsvPartEncoder(object):
+    """Serialize row ranges of a DataFrame as CSV stream parts.
+
+    Parts are written by pandas straight into a binary buffer, skipping
+    the intermediate str and its encoded copy. Each thread reuses one
+    buffer, so serializing a part allocates no more than the part itself
+    and memory stays bounded by the number of threads encoding. A buffer
+    returned by `encode` is only valid until the same thread encodes its
+    next part, which is how PartUploader workers use it: encode, upload,
+    repeat. Pass `buffer` to encode into a buffer of your own instead.
+
+    Parts encoded with compression='gzip' are compressed at
+    `compresslevel` from the CSV buffer into a second per-thread buffer.
+    Encoders are context managers; `close` releases nothing here, but
+    ProcessPartEncoder stops its process pool.
+    """
+
+    def __init__(self, df, rows_per_part, compresslevel=DEFAULT_PART_COMPRESS_LEVEL):
+        if rows_per_part < 1:
+            raise ValueError('rows_per_part must be at least 1')
+        self.df = df
+        self.rows_per_part = rows_per_part
+        self.compresslevel = compresslevel
+        self._local = threading.local()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        pass
+
+    def __len__(self):
+        return -(-len(self.df.index) // self.rows_per_part)
+
+    def starts(self):
+        """Yield the first row of each part, in part order."""
+        return range(0, len(self.df.index), self.rows_per_part)
+
+    def encode(self, start, buffer=None, compression=None):
+        """Write the part beginning at row `start`, returning the buffer rewound to 0.
+
+        With compression='gzip' the returned buffer holds the gzipped
+        part; a `buffer` given is then used for the compressed output.
+        """
+        if compression not in (None, 'gzip'):
+            raise ValueError("compression must be None or 'gzip'")
+        if compression is None:
+            return self._write_csv(start, buffer if buffer is not None else self._buffer('buffer'))
+        csv = self._write_csv(start, self._buffer('buffer'))
+        if buffer is None:
+            buffer = self._buffer('gzip_buffer')
+        with csv.getbuffer() as data:
+            return gzip_into(data, buffer, self.compresslevel)
+
+    def _buffer(self, name):
+        buffer = getattr(self._local, name, None)
+        if buffer is None:
+            buffer = io.BytesIO()
+            setattr(self._local, name, buffer)
+        return buffer
+
+    def _write_csv(self, start, buffer):
+        # Overwrite and then cut off the previous part, keeping the
+        # buffer's allocation when parts are of similar size
+        buffer.seek(0)
+        self.df.iloc[start:start + self.rows_per_part].to_csv(buffer, header=False, index=False,
+                                                                encoding='utf-8')
+        buffer.truncate()
+        buffer.seek(0)
+        return buffer
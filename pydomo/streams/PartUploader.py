@@ -0,0 +1,163 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pydomo.common import DEFAULT_UPLOAD_WORKERS
+
+
+class PartUploader(object):
+    """Upload the data parts of a single Stream Execution in parallel.
+
+    Parts are submitted as callables that produce the part body, so the
+    serialization of a part happens on the worker thread alongside its
+    upload. Submission blocks while the in-flight limits are reached:
+      - `max_workers`: max parts being serialized/uploaded at once
+      - `max_inflight_bytes`: max sum of the size hints of in-flight
+        parts (a single part larger than the limit is still allowed
+        through once nothing else is in flight)
+
+    The size of each uploaded body is recorded in `part_sizes`, keyed by
+    part number (str bodies are counted in characters, seekable files
+    from their current position), and the time its upload took in
+    `part_seconds`.
+
+    An `encode` callable may return None for a part that needs no
+    upload. `on_uploaded(part_num, size)` is called on the worker thread
+    after each part upload succeeds.
+
+    The first failing part stops the upload: parts not yet started are
+    skipped, no further parts are accepted and the error is re-raised
+    from `submit()` or `wait()`.
+
+    >>> with PartUploader(domo.streams, stream_id, execution_id) as up:
+    ...     up.submit(0, lambda: csv_part_0, len(csv_part_0))
+    ...     up.submit(1, lambda: csv_part_1, len(csv_part_1))
+    """
+
+    def __init__(self, stream_client, stream_id, execution_id,
+                 max_workers=DEFAULT_UPLOAD_WORKERS, max_inflight_bytes=None, on_uploaded=None):
+        if max_workers < 1:
+            raise ValueError('max_workers must be at least 1')
+        self.stream = stream_client
+        self.stream_id = stream_id
+        self.execution_id = execution_id
+        self.max_workers = max_workers
+        self.max_inflight_bytes = max_inflight_bytes
+        self.on_uploaded = on_uploaded
+        self.error = None
+        self.part_sizes = {}
+        self.part_seconds = {}
+        self._inflight_parts = 0
+        self._inflight_bytes = 0
+        self._cond = threading.Condition()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix='pydomo-part')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self._fail(exc_value)
+        self.close()
+
+    def submit(self, part_num, encode, size_hint=0, compression=None):
+        """Schedule a part upload, blocking until the in-flight limits allow it.
+
+        :Parameters:
+          - `part_num`: the part number within the execution
+          - `encode`: callable returning the part body (str, bytes or file-like)
+          - `size_hint`: expected size of the part body in bytes
+          - `compression`: 'gzip' if the body is gzipped
+        """
+        with self._cond:
+            while self.error is None and not self._has_capacity(size_hint):
+                self._cond.wait()
+            self._raise_if_failed()
+            self._inflight_parts += 1
+            self._inflight_bytes += size_hint
+        self._executor.submit(self._run, part_num, encode, size_hint, compression)
+
+    def wait(self):
+        """Wait for every submitted part, raising the first error."""
+        with self._cond:
+            while self._inflight_parts:
+                self._cond.wait()
+            self._raise_if_failed()
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def upload_throughput(self):
+        """Return the bytes per second sent by one upload, or None before any.
+
+        Only the time spent uploading counts, not encoding, so this is
+        the speed of the link as seen by a single connection.
+        """
+        with self._cond:
+            timed = [part for part in self.part_seconds if part in self.part_sizes]
+            seconds = sum(self.part_seconds[part] for part in timed)
+            if not timed or seconds <= 0:
+                return None
+            return sum(self.part_sizes[part] for part in timed) / seconds
+
+    def _has_capacity(self, size_hint):
+        if self._inflight_parts >= self.max_workers:
+            return False
+        if self.max_inflight_bytes is None or self._inflight_parts == 0:
+            return True
+        return self._inflight_bytes + size_hint <= self.max_inflight_bytes
+
+    def _run(self, part_num, encode, size_hint, compression):
+        try:
+            if self.error is None:
+                body = encode()
+                if body is not None:
+                    self._upload_timed(part_num, body, compression)
+        except BaseException as err:
+            self._fail(err)
+        finally:
+            with self._cond:
+                self._inflight_parts -= 1
+                self._inflight_bytes -= size_hint
+                self._cond.notify_all()
+
+    def _upload_timed(self, part_num, body, compression):
+        size = self._body_size(body)
+        started = time.monotonic()
+        self._upload(part_num, body, compression)
+        seconds = time.monotonic() - started
+        with self._cond:
+            self.part_seconds[part_num] = seconds
+            if size is not None:
+                self.part_sizes[part_num] = size
+        if self.on_uploaded is not None:
+            self.on_uploaded(part_num, size)
+
+    @staticmethod
+    def _body_size(body):
+        if isinstance(body, (str, bytes, bytearray)):
+            return len(body)
+        if hasattr(body, 'seek') and hasattr(body, 'tell'):
+            position = body.tell()
+            size = body.seek(0, 2) - position
+            body.seek(position)
+            return size
+        return None
+
+    def _upload(self, part_num, body, compression=None):
+        if compression is None:
+            self.stream.upload_part(self.stream_id, self.execution_id, part_num, body)
+        else:
+            self.stream.upload_part(self.stream_id, self.execution_id, part_num, body,
+                                    compression=compression)
+
+    def _fail(self, err):
+        with self._cond:
+            if self.error is None:
+                self.error = err
+            self._cond.notify_all()
+
+    def _raise_if_failed(self):
+        if self.error is not None:
+            raise self.error
@@ -0,0 +1,67 @@
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from pydomo.streams.Compression import DEFAULT_PART_COMPRESS_LEVEL
+from pydomo.streams.PartEncoder import CsvPartEncoder
+
+
+def encode_part(frame, compression=None, compresslevel=DEFAULT_PART_COMPRESS_LEVEL):
+    """Serialize a whole DataFrame as one part, returning its bytes.
+
+    Module-level so that process pools can pickle a reference to it.
+    """
+    encoder = CsvPartEncoder(frame, max(len(frame.index), 1), compresslevel)
+    return encoder.encode(0, io.BytesIO(), compression).getvalue()
+
+
+class ProcessPartEncoder(CsvPartEncoder):
+    """CsvPartEncoder that serializes parts in a pool of `processes` processes.
+
+    DataFrame.to_csv holds the GIL, so threads alone serialize one part
+    at a time; this spreads the work over cores instead. Each part's row
+    slice is pickled to a worker as its column blocks, so rows are not
+    copied one by one, and the CSV (gzipped with compression='gzip') comes
+    back as bytes. `encode` blocks the calling thread until its part is
+    ready, so it drops into PartUploader workers unchanged. `processes`
+    defaults to the number of CPUs.
+
+    Workers start on the first `encode`, usually from an upload thread, so
+    they are not forked from the calling process: `mp_context` defaults to
+    'forkserver' where available, else 'spawn'. Both import the main
+    module in each worker, so scripts need an `if __name__ == '__main__'`
+    guard.
+
+    Close the encoder, or use it as a context manager, to stop the pool.
+    """
+
+    def __init__(self, df, rows_per_part, compresslevel=DEFAULT_PART_COMPRESS_LEVEL,
+                 processes=None, mp_context=None):
+        super(ProcessPartEncoder, self).__init__(df, rows_per_part, compresslevel)
+        self.processes = processes or os.cpu_count() or 1
+        if mp_context is None:
+            mp_context = multiprocessing.get_context(
+                'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn')
+        self.mp_context = mp_context
+        self._executor = ProcessPoolExecutor(max_workers=self.processes, mp_context=mp_context)
+
+    def close(self):
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def encode(self, start, buffer=None, compression=None):
+        """Encode the part beginning at row `start` in a worker process.
+
+        Returns `buffer`, or a new buffer, holding the part rewound to 0.
+        """
+        if compression not in (None, 'gzip'):
+            raise ValueError("compression must be None or 'gzip'")
+        frame = self.df.iloc[start:start + self.rows_per_part]
+        data = self._executor.submit(encode_part, frame, compression, self.compresslevel).result()
+        if buffer is None:
+            return io.BytesIO(data)
+        buffer.seek(0)
+        buffer.write(data)
+        buffer.truncate()
+        buffer.seek(0)
+        return buffer
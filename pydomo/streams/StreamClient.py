@@ -1,9 +1,12 @@
-import io
 import os
 import requests
 
 from pydomo.DomoAPIClient import DomoAPIClient
 from pydomo.Transport import HTTPMethod
+from pydomo.streams.Compression import (DEFAULT_CHUNK_SIZE, DEFAULT_COMPRESS_LEVEL, DEFAULT_PART_COMPRESS_LEVEL,
+                                        iter_gzip)
+from pydomo.streams.FileSplitter import DEFAULT_FILE_PART_BYTES, CsvFileSplitter
+from pydomo.streams.PartUploader import DEFAULT_UPLOAD_WORKERS, PartUploader
 
 """
     Streams
@@ -103,14 +106,17 @@ class StreamClient(DomoAPIClient):
         Upload a data part (String or CSV)
         - Data sources should be broken into parts and uploaded in parallel
         - Parts should be around 50MB
-        - Parts can file-like objects
-        - Parts can be compressed
+        - Parts can be str, bytes or binary file-like objects
+        - Parts can be compressed: pass compression='gzip' for a part
+          that is already gzipped
     """
-    def upload_part(self, stream_id, execution_id, part_num, csv):
+    def upload_part(self, stream_id, execution_id, part_num, csv, compression=None):
         url = self._base(stream_id) + '/executions/' + str(execution_id) + '/part/' + str(part_num)
         desc = "Data Part on Execution " + str(execution_id) + " on Stream " + str(stream_id)
-        if not isinstance(csv, io.IOBase):
-            csv = str.encode(csv)
+        if isinstance(csv, str):
+            csv = csv.encode('utf-8')
+        if compression == 'gzip':
+            return self._upload_gzip(url, requests.codes.ok, csv, desc)
         return self._upload_csv(url, requests.codes.ok, csv, desc)
 
     """
@@ -146,40 +152,57 @@ class StreamClient(DomoAPIClient):
         - Parts should be around 50MB
         - Parts can file-like objects
         - Parts can be compressed
+        - With stream_file, the file is read, compressed and sent chunk_size
+          bytes at a time using chunked transfer encoding, so memory use does
+          not grow with the size of the part
+        - Without stream_file, only the compressed part is held in memory
     """
-    def upload_gzip_part_from_file(self, stream_id, execution_id, part_num, filepath, stream_file, chunk_size):
-        
-        import gzip
+    def upload_gzip_part_from_file(self, stream_id, execution_id, part_num, filepath, stream_file=True,
+                                   chunk_size=DEFAULT_CHUNK_SIZE, compresslevel=DEFAULT_COMPRESS_LEVEL):
 
         url = self._base(stream_id) + '/executions/' + str(execution_id) + '/part/' + str(part_num)
         desc = "Data Part on Execution " + str(execution_id) + " on Stream " + str(stream_id)
 
-        if stream_file:
-            
-            import io
-
-            compressed_body = io.BytesIO()
-            compressed_body.name = url
-            compressor = gzip.open(compressed_body, mode='wb')
-
-            with open(filepath, 'rb') as csvfile:
-                while True:
-                    chunk = csvfile.read(chunk_size)
-                    if not chunk:
-                        break
-                    compressor.write(chunk)
-
-            compressor.flush()
-            compressor.close()
-            compressed_body.seek(0, 0)
+        with open(os.path.expanduser(filepath), 'rb') as csvfile:
+            compressed_body = iter_gzip(csvfile, chunk_size, compresslevel)
+            if not stream_file:
+                compressed_body = b''.join(compressed_body)
             return self._upload_gzip(url, requests.codes.ok, compressed_body, desc)
 
-        else:
-
-            with open(os.path.expanduser(filepath), 'rb') as csvfile:
-                compressed_body = gzip.compress(csvfile.read())
-                return self._upload_gzip(url, requests.codes.ok, compressed_body, desc)
-
+    """
+        Upload a CSV file of any size as the parts of a new Execution
+        - The file is memory-mapped and cut into parts of about part_size
+          bytes that end on a newline; with quoted_newlines, newlines
+          inside double-quoted fields are not used as part boundaries
+        - skip_header leaves out the file's header line
+        - Up to max_workers parts are compressed (with compression='gzip')
+          and uploaded concurrently; memory use depends on the part size
+          and worker count, not on the size of the file
+        - The Execution is committed once every part is uploaded, or
+          aborted if a part fails
+        - Returns the committed Execution
+    """
+    def upload_file(self, stream_id, path, part_size=DEFAULT_FILE_PART_BYTES, compression=None,
+                    compresslevel=DEFAULT_PART_COMPRESS_LEVEL, max_workers=DEFAULT_UPLOAD_WORKERS,
+                    quoted_newlines=False, skip_header=False, update_method=None):
+        if compression not in (None, 'gzip'):
+            raise ValueError("compression must be None or 'gzip'")
+        with CsvFileSplitter(path, part_size, quoted_newlines, skip_header, compresslevel) as splitter:
+            execution_id = self.create_execution(stream_id, update_method)['id']
+            try:
+                with PartUploader(self, stream_id, execution_id, max_workers) as uploader:
+                    for part_num, (start, end) in enumerate(splitter.boundaries()):
+                        encode = lambda start=start, end=end: splitter.encode(start, end, compression)
+                        uploader.submit(part_num, encode, end - start, compression)
+                    uploader.wait()
+            except Exception:
+                try:
+                    self.abort_execution(stream_id, execution_id)
+                except Exception as err:
+                    self.logger.debug('Error aborting execution {} on stream {}: {}'
+                                      .format(execution_id, stream_id, err))
+                raise
+        return self.commit_execution(stream_id, execution_id)
 
     """
         Commit an Execution (finalize a multi-part upload process)
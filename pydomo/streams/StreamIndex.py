@@ -0,0 +1,101 @@
+import os
+import sqlite3
+import time
+
+from pydomo.common import default_cache_dir
+
+DEFAULT_INDEX_FILE = 'stream_index.sqlite3'
+
+
+class StreamIndex(object):
+    """Persistent DataSet id -> Stream id map, stored in SQLite.
+
+    A DataSet's Stream practically never changes, so the lookup made
+    before each upload can be answered locally once the pair is known.
+    Entries are kept per `namespace`, since Stream ids are only unique
+    within a Domo instance; `namespace_for()` builds one from the API
+    host and client id. The file lives under the pydomo cache root unless
+    `path` is given, and can be shared by processes.
+    """
+
+    def __init__(self, namespace, path=None):
+        if path is None:
+            path = os.path.join(default_cache_dir('streams'), DEFAULT_INDEX_FILE)
+        else:
+            path = os.path.expanduser(path)
+        self.namespace = namespace
+        self.path = path
+        with self._connect() as connection:
+            connection.execute('CREATE TABLE IF NOT EXISTS stream_index ('
+                               ' namespace TEXT NOT NULL,'
+                               ' dataset_id TEXT NOT NULL,'
+                               ' stream_id INTEGER NOT NULL,'
+                               ' updated REAL NOT NULL,'
+                               ' PRIMARY KEY (namespace, dataset_id))')
+
+    @staticmethod
+    def namespace_for(api_host, client_id):
+        return '{} {}'.format(api_host, client_id)
+
+    def get(self, dataset_id):
+        """Return the Stream id of `dataset_id`, or None if unknown."""
+        with self._connect() as connection:
+            row = connection.execute('SELECT stream_id FROM stream_index'
+                                     ' WHERE namespace = ? AND dataset_id = ?',
+                                     (self.namespace, str(dataset_id))).fetchone()
+        return row[0] if row else None
+
+    def get_many(self, dataset_ids):
+        """Return a dict of the known Stream ids among `dataset_ids`."""
+        found = {}
+        dataset_ids = [str(x) for x in dataset_ids]
+        # Stay under SQLite's limit on bound parameters
+        for start in range(0, len(dataset_ids), 500):
+            batch = dataset_ids[start:start + 500]
+            query = ('SELECT dataset_id, stream_id FROM stream_index WHERE namespace = ?'
+                     ' AND dataset_id IN ({})'.format(','.join('?' * len(batch))))
+            with self._connect() as connection:
+                found.update(connection.execute(query, [self.namespace] + batch).fetchall())
+        return found
+
+    def put(self, dataset_id, stream_id):
+        self.put_many([(dataset_id, stream_id)])
+
+    def put_many(self, pairs):
+        """Record (dataset_id, stream_id) pairs."""
+        now = time.time()
+        rows = [(self.namespace, str(dataset_id), stream_id, now) for dataset_id, stream_id in pairs]
+        with self._connect() as connection:
+            connection.executemany('INSERT OR REPLACE INTO stream_index'
+                                   ' (namespace, dataset_id, stream_id, updated) VALUES (?, ?, ?, ?)', rows)
+
+    def discard(self, dataset_id):
+        with self._connect() as connection:
+            connection.execute('DELETE FROM stream_index WHERE namespace = ? AND dataset_id = ?',
+                               (self.namespace, str(dataset_id)))
+
+    def clear(self):
+        with self._connect() as connection:
+            connection.execute('DELETE FROM stream_index WHERE namespace = ?', (self.namespace,))
+
+    def _connect(self):
+        return _Connection(self.path)
+
+
+class _Connection(object):
+    """sqlite3 connection that commits and closes when the block exits."""
+
+    def __init__(self, path):
+        self.connection = sqlite3.connect(path, timeout=30)
+
+    def __enter__(self):
+        return self.connection
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is None:
+                self.connection.commit()
+            else:
+                self.connection.rollback()
+        finally:
+            self.connection.close()
@@ -0,0 +1,204 @@
+import io
+import tempfile
+import threading
+import time
+
+from pydomo.common import (DEFAULT_COMMIT_INTERVAL, DEFAULT_FLUSH_INTERVAL, DEFAULT_SPILL_BYTES,
+                           DEFAULT_WRITER_PART_BYTES, Metrics)
+from pydomo.streams.Compression import DEFAULT_PART_COMPRESS_LEVEL, iter_gzip
+
+
+class StreamWriter(object):
+    """Long-lived appender that turns many small writes into few large parts.
+
+    Rows passed to `write` (a DataFrame, or CSV text or bytes without a
+    header, columns in the DataSet's schema order) are serialized into a
+    buffer that stays in memory up to `spill_bytes` and then spills to a
+    temporary file in `spill_dir`. The buffer is uploaded as one part of
+    an open APPEND execution once it holds `part_bytes`, or once its
+    oldest rows are `flush_interval` seconds old. The execution is
+    committed `commit_interval` seconds after it was opened, on `commit`
+    and on `close`; the next write opens a new one.
+
+    Time-based flushes and commits run on a background thread, whose
+    errors are logged and retried on the next flush; errors from
+    `write`, `flush`, `commit` and `close` are raised. A part that fails
+    to upload is kept and sent again first. Parts are gzipped at
+    `compresslevel` with compression='gzip'.
+
+    Writes, parts and commits are counted in `metrics`.
+
+    >>> with domo.ds_writer(ds_id) as writer:
+    ...     for batch in batches:
+    ...         writer.write(batch)
+    """
+
+    def __init__(self, stream_client, stream_id, part_bytes=DEFAULT_WRITER_PART_BYTES,
+                 flush_interval=DEFAULT_FLUSH_INTERVAL, commit_interval=DEFAULT_COMMIT_INTERVAL,
+                 spill_bytes=DEFAULT_SPILL_BYTES, spill_dir=None, compression=None,
+                 compresslevel=DEFAULT_PART_COMPRESS_LEVEL, logger=None):
+        if compression not in (None, 'gzip'):
+            raise ValueError("compression must be None or 'gzip'")
+        self.stream = stream_client
+        self.stream_id = stream_id
+        self.part_bytes = part_bytes
+        self.flush_interval = flush_interval
+        self.commit_interval = commit_interval
+        self.spill_bytes = spill_bytes
+        self.spill_dir = spill_dir
+        self.compression = compression
+        self.compresslevel = compresslevel
+        self.logger = logger if logger is not None else stream_client.logger
+        self.metrics = Metrics()
+        self.execution_id = None
+        self.closed = False
+        self._part_num = 0
+        self._opened_at = None
+        self._buffer = None
+        self._buffer_bytes = 0
+        self._buffered_at = None
+        self._unsent = []
+        # _lock guards the buffer; _upload_lock keeps parts and commits in order
+        self._lock = threading.Lock()
+        self._upload_lock = threading.RLock()
+        self._stopping = threading.Event()
+        self._thread = None
+        if flush_interval or commit_interval:
+            self._thread = threading.Thread(target=self._run_schedule, name='pydomo-stream-writer',
+                                            daemon=True)
+            self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, rows):
+        """Buffer rows, uploading a part if the buffer reached `part_bytes`."""
+        with self._lock:
+            if self.closed:
+                raise ValueError('write to a closed StreamWriter')
+            if self._buffer is None:
+                self._buffer = tempfile.SpooledTemporaryFile(max_size=self.spill_bytes, dir=self.spill_dir)
+                self._buffered_at = time.monotonic()
+            start = self._buffer.tell()
+            if isinstance(rows, (str, bytes, bytearray)):
+                if isinstance(rows, str):
+                    rows = rows.encode('utf-8')
+                self._buffer.write(rows)
+                if rows and not rows.endswith(b'\n'):
+                    self._buffer.write(b'\n')
+            else:
+                rows.to_csv(self._buffer, header=False, index=False, encoding='utf-8')
+            self._buffer_bytes += self._buffer.tell() - start
+            full = self._buffer_bytes >= self.part_bytes
+        self.metrics.increment('writes')
+        if full:
+            self.flush()
+
+    def flush(self):
+        """Upload the buffered rows, and any part that failed before, to the open execution."""
+        with self._upload_lock:
+            with self._lock:
+                if self._buffer is not None:
+                    self._unsent.append(self._buffer)
+                    self._buffer = None
+                    self._buffer_bytes = 0
+                    self._buffered_at = None
+            while self._unsent:
+                self._upload(self._unsent[0])
+                self._unsent.pop(0).close()
+
+    def commit(self):
+        """Flush, then commit the open execution; returns it, or None if none was open."""
+        with self._upload_lock:
+            self.flush()
+            if self.execution_id is None:
+                return None
+            result = self.stream.commit_execution(self.stream_id, self.execution_id)
+            self.metrics.increment('commits')
+            self.execution_id = None
+            self._opened_at = None
+            return result
+
+    def close(self):
+        """Stop the schedule and commit what was written."""
+        if self._thread is not None:
+            self._stopping.set()
+            self._thread.join()
+            self._thread = None
+        with self._lock:
+            self.closed = True
+        return self.commit()
+
+    def _upload(self, spool):
+        if self.execution_id is None:
+            self.execution_id = self.stream.create_execution(self.stream_id, 'APPEND')['id']
+            self._opened_at = time.monotonic()
+            self._part_num = 0
+        spool.seek(0)
+        body = _SpoolReader(spool)
+        if self.compression == 'gzip':
+            body = io.BytesIO()
+            for chunk in iter_gzip(spool, compresslevel=self.compresslevel):
+                body.write(chunk)
+            body.seek(0)
+        self.stream.upload_part(self.stream_id, self.execution_id, self._part_num, body,
+                                compression=self.compression)
+        self._part_num += 1
+        self.metrics.increment('parts')
+        self.metrics.increment('part_bytes', body.seek(0, 2))
+
+    def _due(self):
+        now = time.monotonic()
+        with self._lock:
+            flush = (self.flush_interval and self._buffered_at is not None
+                     and now - self._buffered_at >= self.flush_interval)
+            # Rows waiting for their first part count from when they were buffered
+            opened_at = self._opened_at if self._opened_at is not None else self._buffered_at
+        commit = (self.commit_interval and opened_at is not None
+                  and now - opened_at >= self.commit_interval)
+        return flush, commit
+
+    def _run_schedule(self):
+        tick = min(interval for interval in (self.flush_interval, self.commit_interval, 1) if interval)
+        while not self._stopping.wait(tick):
+            flush, commit = self._due()
+            try:
+                if commit:
+                    self.commit()
+                elif flush:
+                    self.flush()
+            except Exception as err:
+                self.metrics.increment('errors')
+                self.logger.debug('Error in scheduled upload to stream {}: {}'.format(self.stream_id, err))
+
+
+class _SpoolReader(io.RawIOBase):
+    """Read-only view of a spooled buffer.
+
+    'requests' sizes bodies through fileno() when they have one, which
+    would make a SpooledTemporaryFile roll over to disk.
+    """
+
+    def __init__(self, spool):
+        super(_SpoolReader, self).__init__()
+        self._spool = spool
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self._spool.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        return self._spool.seek(offset, whence)
+
+    def tell(self):
+        return self._spool.tell()
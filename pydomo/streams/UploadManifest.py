@@ -0,0 +1,116 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import zlib
+
+from pydomo.common import default_cache_dir
+
+
+class UploadManifest(object):
+    """Local record of the parts uploaded to a Stream Execution.
+
+    A resumable upload writes the Stream and Execution ids, the row
+    layout of its parts and, as each part finishes, the part's CRC-32
+    checksum, size and compression to a JSON file. If the upload dies,
+    the next run can reuse the still open Execution and send only the
+    parts that are missing or whose content changed.
+
+    Manifests live in the 'uploads' directory under the pydomo cache root,
+    one file per API host and Stream (see `path_for`). Writes replace the
+    file atomically, so a crash leaves the last complete version.
+    """
+
+    def __init__(self, path, stream_id, execution_id, rows, rows_per_part, parts=None):
+        self.path = path
+        self.stream_id = stream_id
+        self.execution_id = execution_id
+        self.rows = rows
+        self.rows_per_part = rows_per_part
+        self.parts = parts if parts is not None else {}
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def path_for(api_host, stream_id, cache_dir=None):
+        if cache_dir is None:
+            cache_dir = default_cache_dir('uploads')
+        key = hashlib.sha256('{}\n{}'.format(api_host, stream_id).encode('utf-8')).hexdigest()
+        return os.path.join(cache_dir, key + '.json')
+
+    @classmethod
+    def load(cls, path):
+        """Return the manifest stored at `path`, or None if there is no readable one."""
+        try:
+            with open(path, 'r') as manifest_file:
+                stored = json.load(manifest_file)
+            parts = {int(part_num): part for part_num, part in stored['parts'].items()}
+            return cls(path, stored['stream_id'], stored['execution_id'], stored['rows'],
+                       stored['rows_per_part'], parts)
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+
+    @staticmethod
+    def checksum(body):
+        """Return the CRC-32 of a part body (bytes or a BytesIO)."""
+        if hasattr(body, 'getbuffer'):
+            with body.getbuffer() as data:
+                return zlib.crc32(data)
+        return zlib.crc32(body)
+
+    def is_uploaded(self, part_num, checksum):
+        part = self.parts.get(part_num)
+        return part is not None and part['crc32'] == checksum
+
+    def compression_of(self, part_num, default=None):
+        """Return the compression a recorded part was sent with, else `default`."""
+        part = self.parts.get(part_num)
+        return part['compression'] if part is not None else default
+
+    def track(self, part_num, body, compression=None):
+        """Return `body` if the part still has to be uploaded, else None.
+
+        The part's checksum is kept until `record` is called for it.
+        """
+        checksum = self.checksum(body)
+        if self.is_uploaded(part_num, checksum):
+            return None
+        with self._lock:
+            self._pending[part_num] = (checksum, compression)
+        return body
+
+    def record(self, part_num, size):
+        """Record a tracked part as uploaded and save the manifest."""
+        with self._lock:
+            checksum, compression = self._pending.pop(part_num)
+            self.parts[part_num] = {'crc32': checksum, 'bytes': size, 'compression': compression}
+            self._save()
+
+    def save(self):
+        with self._lock:
+            self._save()
+
+    def delete(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def _save(self):
+        stored = {
+            'stream_id': self.stream_id,
+            'execution_id': self.execution_id,
+            'rows': self.rows,
+            'rows_per_part': self.rows_per_part,
+            'parts': {str(part_num): part for part_num, part in sorted(self.parts.items())},
+        }
+        handle, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path), suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'w') as manifest_file:
+                json.dump(stored, manifest_file)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
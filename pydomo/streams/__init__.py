@@ -1,2 +1,10 @@
 from .StreamsModel import CreateStreamRequest, UpdateMethod
 from .StreamClient import StreamClient
+from .PartUploader import PartUploader
+from .StreamIndex import StreamIndex
+from .PartEncoder import CsvPartEncoder
+from .ProcessPartEncoder import ProcessPartEncoder
+from .UploadManifest import UploadManifest
+from .FileSplitter import CsvFileSplitter
+from .StreamWriter import StreamWriter
+from .ExecutionCoordinator import ExecutionCoordinator
@@ -1,6 +1,8 @@
+import itertools
+
+from pydomo.common import DEFAULT_LIST_WORKERS, fetch_all_pages, pages_to_frame
 from pydomo.DomoAPIClient import DomoAPIClient
 from pydomo.Transport import HTTPMethod
-import pandas as pd
 import requests
 
 """
@@ -53,22 +55,14 @@ class UserClient(DomoAPIClient):
 
     """
         List all users
+        Pages of `batch_size` users are requested `max_workers` at a time
+        until a short page comes back; `columnar` builds the DataFrame
+        column by column
     """
-    def list_all(self, df_output=True,batch_size=500):
-        i = 0
-        n_ret = 1
-        while n_ret > 0:
-            ll = self.list(batch_size,batch_size*i)
-            if( i == 0 ):
-                all = ll
-            else:
-                all.extend(ll)
-            i = i + 1
-            n_ret = ll.__len__()
-
-        out = all
+    def list_all(self, df_output=True, batch_size=500, max_workers=DEFAULT_LIST_WORKERS, columnar=False):
+        pages = fetch_all_pages(self.list, batch_size, max_workers)
 
         if( df_output ):
-            out = pd.DataFrame(all)
+            return pages_to_frame(pages, columnar)
 
-        return(out)
+        return list(itertools.chain.from_iterable(pages))
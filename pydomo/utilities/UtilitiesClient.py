@@ -1,21 +1,58 @@
 
+import contextlib
 import json
 import math
-import sys
-import json
-from pandas import read_csv
-from pandas import to_datetime
+import time
+import zlib
 
+from pydomo.common import DEFAULT_LIST_WORKERS, DEFAULT_PART_KBYTES, Paginator
 from pydomo.DomoAPIClient import DomoAPIClient
 from pydomo.datasets import DataSetClient
 from pydomo.streams import StreamClient
+from pydomo.streams import CsvPartEncoder, PartUploader, ProcessPartEncoder, UploadManifest
+from pydomo.streams.Compression import DEFAULT_PART_COMPRESS_LEVEL, GZIP_WBITS
+from pydomo.streams.PartUploader import DEFAULT_UPLOAD_WORKERS
+
+STREAM_LIST_PAGE_SIZE = 500
+
+# Date and datetime layouts found in Domo CSV exports, most common first
+DOMO_DATE_FORMATS = (
+    '%Y-%m-%d',
+    '%Y-%m-%dT%H:%M:%S',
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%dT%H:%M:%S.%f',
+    '%Y-%m-%d %H:%M:%S.%f',
+    '%Y-%m-%dT%H:%M:%S%z',
+    '%Y-%m-%dT%H:%M:%S.%f%z',
+    '%m/%d/%Y',
+    '%m/%d/%Y %H:%M:%S',
+)
+DATE_SAMPLE_SIZE = 50
+
+# Rows per sample and number of samples used to measure bytes per row
+SIZE_SAMPLE_ROWS = 200
+SIZE_SAMPLES = 5
+# Part compression modes accepted by stream_upload
+PART_COMPRESSIONS = (None, 'gzip', 'auto')
+
 
 class UtilitiesClient(DomoAPIClient):
-    def __init__(self, transport, logger):
+    def __init__(self, transport, logger, stream_index=None, coordinator=None):
         super(UtilitiesClient, self).__init__(transport, logger)
         self.ds = DataSetClient(self.transport, self.logger)
         self.stream = StreamClient(self.transport, self.logger)
         self.transport = transport
+        # DataSet id -> Stream id, backed by an optional persistent StreamIndex
+        self.stream_index = stream_index
+        # Optional ExecutionCoordinator shared by uploads to the same Streams
+        self.coordinator = coordinator
+        self._stream_ids = {}
+        # DataSet id -> {column: date format, or None for non-date columns}
+        self._date_formats = {}
+        # Part sizing and throughput of the last stream_upload
+        self.last_upload_stats = None
+        # Bytes per second of one part upload, measured by stream_upload
+        self.link_throughput = None
 
     def domo_schema(self, ds_id):
         this_get = self.ds.get(ds_id)
@@ -63,45 +100,291 @@ class UtilitiesClient(DomoAPIClient):
     def is_date_type(self, column_type):
         return column_type in ("DATE", "DATETIME")
 
-    def read_content_to_dataframe(self, content):
+    def schema_to_pandas_types(self, columns):
+        """Map Domo schema columns to read_csv `dtype` and `parse_dates` arguments."""
+        dtype_dict = {}
+        date_columns = []
+
+        for column in columns:
+            col_name = column["name"]
+            col_type = column["type"]
+
+            if self.is_date_type(col_type):
+                date_columns.append(col_name)
+            else:
+                dtype_dict[col_name] = self.convert_domo_type_to_pandas_type(col_type)
+
+        return dtype_dict, date_columns
+
+    def read_content_to_dataframe(self, content, dataset_id=None, date_formats=None):
+        """Read CSV content, converting date-like text columns to datetimes.
+
+        A small sample of each text column is matched against the known
+        Domo date formats, and only columns whose sample matches are
+        converted, with that explicit format. `date_formats` maps columns
+        to formats to use without detection. The formats found for a
+        `dataset_id` are reused by later calls for the same DataSet.
+        """
+        from pandas import read_csv
+
         df = read_csv(content)
 
-        # Convert to dates or datetimes if possible
+        known = dict(self._date_formats.get(dataset_id, {})) if dataset_id is not None else {}
+        known.update(date_formats or {})
+        learned = {}
         for col in df.columns:
-            if df[col].dtype == "object":
-                try:
-                    df[col] = to_datetime(df[col])
-                except ValueError:
-                    pass
-                except TypeError:
-                    pass
+            if not self._is_text_column(df[col]):
+                continue
+            fmt = known[col] if col in known else self.detect_date_format(df[col])
+            converted = self._to_datetime(df[col], fmt) if fmt else None
+            if converted is None and col in known and known[col]:
+                # The remembered format no longer fits this column
+                fmt = self.detect_date_format(df[col])
+                converted = self._to_datetime(df[col], fmt) if fmt else None
+            if converted is not None:
+                df[col] = converted
+            learned[col] = fmt if converted is not None else None
 
+        if dataset_id is not None:
+            self._date_formats[dataset_id] = learned
         return df
 
+    def detect_date_format(self, series, formats=DOMO_DATE_FORMATS, sample_size=DATE_SAMPLE_SIZE):
+        """Return the first of `formats` that parses a sample of `series`, or None."""
+        from pandas import to_datetime
+
+        values = series.dropna()
+        if values.empty:
+            return None
+        step = max(len(values) // sample_size, 1)
+        sample = values.iloc[::step].iloc[:sample_size]
+        for fmt in formats:
+            try:
+                to_datetime(sample, format=fmt)
+            except (ValueError, TypeError):
+                continue
+            return fmt
+        return None
+
+    @staticmethod
+    def _is_text_column(series):
+        from pandas.api.types import is_object_dtype, is_string_dtype
+        return is_object_dtype(series.dtype) or is_string_dtype(series.dtype)
+
+    @staticmethod
+    def _to_datetime(series, fmt):
+        from pandas import to_datetime
+        try:
+            return to_datetime(series, format=fmt)
+        except (ValueError, TypeError):
+            return None
+
     def identical(self, c1, c2):
         cc1 = json.dumps(c1)
         cc2 = json.dumps(c2)
         return cc1 == cc2
 
-    def get_stream_id(self, ds_id):
+    def get_stream_id(self, ds_id, refresh=False):
+        """Return the id of the Stream behind a DataSet.
+
+        Known ids are answered from memory or the stream index; pass
+        refresh=True to search the API again.
+        """
+        if not refresh:
+            stream_id = self._known_stream_id(ds_id)
+            if stream_id is not None:
+                return stream_id
         url = '/v1/streams/search?q=dataSource.id:{ds_id}'.format(ds_id=ds_id)
         all_info = self._get(url,'Search to retrieve stream id')
-        return all_info[0]['id']
+        stream_id = all_info[0]['id']
+        self._remember_stream_ids({ds_id: stream_id})
+        return stream_id
+
+    def resolve_stream_ids(self, ds_ids, max_workers=DEFAULT_LIST_WORKERS):
+        """Map many DataSet ids to their Stream ids.
+
+        Ids not already known are found by paging through all Streams,
+        `max_workers` pages at a time, until every id is resolved. Every
+        Stream seen on the way is recorded. DataSets without a Stream are
+        left out of the returned dict.
+        """
+        resolved = {}
+        missing = set()
+        for ds_id in ds_ids:
+            stream_id = self._stream_ids.get(ds_id)
+            if stream_id is None:
+                missing.add(ds_id)
+            else:
+                resolved[ds_id] = stream_id
+        if missing and self.stream_index is not None:
+            indexed = self.stream_index.get_many(missing)
+            for ds_id in list(missing):
+                if str(ds_id) in indexed:
+                    resolved[ds_id] = self._stream_ids[ds_id] = indexed[str(ds_id)]
+                    missing.discard(ds_id)
+        if not missing:
+            return resolved
+
+        wanted = {str(ds_id): ds_id for ds_id in missing}
+        prefetch = max_workers if max_workers > 1 else 0
+        pages = Paginator(self.stream.list, STREAM_LIST_PAGE_SIZE, prefetch=prefetch,
+                          stop_on_short_page=True).pages()
+        try:
+            for page in pages:
+                found = {stream['dataSet']['id']: stream['id'] for stream in page
+                         if stream.get('dataSet', {}).get('id')}
+                self._remember_stream_ids(found)
+                for ds_id in wanted.keys() & found.keys():
+                    resolved[wanted.pop(ds_id)] = found[ds_id]
+                if not wanted:
+                    break
+        finally:
+            pages.close()
+        return resolved
+
+    def _known_stream_id(self, ds_id):
+        stream_id = self._stream_ids.get(ds_id)
+        if stream_id is None and self.stream_index is not None:
+            stream_id = self.stream_index.get(ds_id)
+            if stream_id is not None:
+                self._stream_ids[ds_id] = stream_id
+        return stream_id
+
+    def _remember_stream_ids(self, stream_ids):
+        self._stream_ids.update(stream_ids)
+        if self.stream_index is not None:
+            self.stream_index.put_many(stream_ids.items())
+
+    def _forget_stream_id(self, ds_id):
+        self._stream_ids.pop(ds_id, None)
+        if self.stream_index is not None:
+            self.stream_index.discard(ds_id)
 
-    def estimate_chunk_rows(self, data, kbytes=10000):
-        sz = sys.getsizeof(data)
-        targetSize = kbytes * 3 # compression factor
+    def estimate_row_bytes(self, data, compression=None, compresslevel=DEFAULT_PART_COMPRESS_LEVEL,
+                           sample_rows=SIZE_SAMPLE_ROWS, samples=SIZE_SAMPLES):
+        """Measure the CSV size of a DataFrame's rows from a few samples.
+
+        Serializes up to `samples` slices of `sample_rows` rows spread over
+        the frame, and returns (csv bytes per row, bytes sent per row): the
+        latter is the gzip-compressed size when `compression` is 'gzip'.
+        """
+        chunks, sampled_rows = self._sample_csv(data, sample_rows, samples)
+        if not sampled_rows:
+            return 0.0, 0.0
+        csv_bytes = sum(len(chunk) for chunk in chunks)
+        sent_bytes = csv_bytes
+        if compression == 'gzip':
+            sent_bytes = self._gzip_size(chunks, compresslevel)
+        return csv_bytes / sampled_rows, sent_bytes / sampled_rows
+
+    def measure_compression(self, data, compresslevel=DEFAULT_PART_COMPRESS_LEVEL,
+                            sample_rows=SIZE_SAMPLE_ROWS, samples=SIZE_SAMPLES):
+        """Gzip sample rows of a DataFrame, returning (ratio, CSV bytes compressed per second).
+
+        The ratio is compressed size over CSV size; None, None is returned
+        for an empty frame.
+        """
+        chunks, sampled_rows = self._sample_csv(data, sample_rows, samples)
+        csv_bytes = sum(len(chunk) for chunk in chunks)
+        if not csv_bytes:
+            return None, None
+        started = time.perf_counter()
+        gzip_bytes = self._gzip_size(chunks, compresslevel)
+        seconds = time.perf_counter() - started
+        return gzip_bytes / csv_bytes, csv_bytes / seconds if seconds > 0 else float('inf')
+
+    @staticmethod
+    def choose_compression(ratio, compress_speed, link_throughput):
+        """Return 'gzip' if compressing a part is faster than sending it as is.
+
+        Per part of S bytes, gzip costs S / `compress_speed` seconds and
+        saves S * (1 - `ratio`) / `link_throughput` seconds of upload, so
+        it pays off while the link is slower than
+        compress_speed * (1 - ratio). Unknown speeds favor gzip.
+        """
+        if ratio is None or ratio >= 1:
+            return None
+        if link_throughput is None or compress_speed is None:
+            return 'gzip'
+        return 'gzip' if compress_speed * (1 - ratio) > link_throughput else None
+
+    @staticmethod
+    def _sample_csv(data, sample_rows, samples):
         data_rows = len(data.index)
-        ch_size = data_rows
-        if sz / 1000 > targetSize:
-            ch_size = math.floor(data_rows*(targetSize) / (sz/1000))
-        return(ch_size)
+        if data_rows == 0:
+            return [], 0
+        sample_count = min(samples, math.ceil(data_rows / sample_rows))
+        starts = [data_rows * i // sample_count for i in range(sample_count)]
+        chunks = [data.iloc[start:start + sample_rows].to_csv(header=False, index=False).encode('utf-8')
+                  for start in starts]
+        return chunks, sum(min(sample_rows, data_rows - start) for start in starts)
+
+    @staticmethod
+    def _gzip_size(chunks, compresslevel):
+        compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, GZIP_WBITS)
+        return sum(len(compressor.compress(chunk)) for chunk in chunks) + len(compressor.flush())
+
+    def estimate_chunk_rows(self, data, kbytes=DEFAULT_PART_KBYTES, compression=None, row_bytes=None):
+        """Return the rows per part that make parts of about `kbytes` KB.
+
+        The size is what is sent: compressed bytes when `compression` is
+        'gzip'. `row_bytes` reuses a result of estimate_row_bytes.
+        """
+        data_rows = len(data.index)
+        if row_bytes is None:
+            row_bytes = self.estimate_row_bytes(data, compression)
+        sent_per_row = row_bytes[1]
+        if not sent_per_row:
+            return data_rows
+        return max(1, min(data_rows, math.floor(kbytes * 1000 / sent_per_row)))
+
+    def stream_upload(self, ds_id, df_up, warn_schema_change=True,
+                      max_workers=DEFAULT_UPLOAD_WORKERS, max_inflight_bytes=None,
+                      part_kbytes=DEFAULT_PART_KBYTES, compression=None,
+                      compresslevel=DEFAULT_PART_COMPRESS_LEVEL, encode_processes=None,
+                      resumable=False, update_method=None):
+        """Upload a DataFrame to the stream behind a DataSet.
+
+        Parts are serialized and uploaded concurrently by up to
+        `max_workers` threads; `max_inflight_bytes` caps the estimated
+        size of the parts held in memory at once. If any part fails the
+        remaining parts are skipped, the execution is aborted and the
+        error is raised.
+
+        Parts are sized to about `part_kbytes` KB from the measured size
+        of sample rows. The chosen and actual part sizes are then
+        available in `last_upload_stats`.
+
+        With compression='gzip' parts are gzipped at `compresslevel` and
+        sized by their compressed size. With 'auto' each upload decides:
+        gzip is used when the link, as timed on previous uploads or on the
+        first part sent as is, is slower than what compressing sample
+        rows saves.
+
+        With `encode_processes` set, parts are serialized and compressed
+        by a ProcessPartEncoder pool of that many processes, and at least
+        as many upload threads are used so every process is kept busy.
+
+        With `resumable`, finished parts are recorded in a local
+        UploadManifest and a failed upload leaves its execution open. The
+        next resumable upload of the same number of rows to the Stream
+        continues that execution, if still active, and only uploads the
+        parts that were not recorded with the same checksum.
+
+        The execution uses `update_method` ('APPEND' or 'REPLACE'), else
+        the Stream's own. With a `coordinator`, uploads to the same Stream
+        never have executions open at the same time; APPEND uploads that
+        are not resumable are merged with others queued for the Stream
+        into one execution, and fail together if any of them fails.
+        """
+        if compression not in PART_COMPRESSIONS:
+            raise ValueError("compression must be None, 'gzip' or 'auto'")
 
-    def stream_upload(self, ds_id, df_up, warn_schema_change=True):
         domoSchema = self.domo_schema(ds_id)
         dataSchema = self.data_schema(df_up)
 
-        stream_id = self.get_stream_id(ds_id)
+        cached_stream_id = self._known_stream_id(ds_id)
+        stream_id = cached_stream_id or self.get_stream_id(ds_id)
 
         if self.identical(domoSchema,dataSchema) == False:
             new_schema = {'schema': {'columns': dataSchema}}
@@ -110,29 +393,190 @@ class UtilitiesClient(DomoAPIClient):
             if warn_schema_change:
                 print('Schema Updated')
 
-        exec_info = self.stream.create_execution(stream_id)
-        exec_id = exec_info['id']
-
-        chunksz = self.estimate_chunk_rows(df_up)
-        start = 0
         df_rows = len(df_up.index)
-        end = df_rows
-        if df_rows > chunksz:
-            end = chunksz
+        # 'auto' sizes parts as uncompressed, since the first may be sent as is
+        sized_compression = 'gzip' if compression == 'gzip' else None
+        row_bytes = self.estimate_row_bytes(df_up, sized_compression, compresslevel)
+        chunksz = max(self.estimate_chunk_rows(df_up, part_kbytes, row_bytes=row_bytes), 1)
+
+        part_count = -(-df_rows // chunksz)
+        manifest = None
+        sent = {}
 
-        for i in range(math.ceil(df_rows/chunksz)):
-            df_sub = df_up.iloc[start:end]
-            csv = df_sub.to_csv(header=False,index=False)
-            self.stream.upload_part(stream_id, exec_id, i, csv)
-            start = end
-            end = end + chunksz
-            if end > df_rows:
-                end = df_rows
+        def upload_parts(exec_id, first_part=0):
+            sent['execution_id'] = exec_id
+            started = time.monotonic()
+            part_bytes = int(row_bytes[0] * min(chunksz, df_rows))
+            encoder = self._part_encoder(df_up, chunksz, compresslevel, encode_processes)
+            workers = max(max_workers, encoder.processes) if encode_processes else max_workers
+            parts = enumerate(encoder.starts())
+            part_compression = compression
 
-        result = self.stream.commit_execution(stream_id, exec_id)
+            def encode(part_num, start, part_compression):
+                body = encoder.encode(start, compression=part_compression)
+                if manifest is not None:
+                    # Skip parts already uploaded with the same content
+                    return manifest.track(part_num, body, part_compression)
+                return body
+
+            def submit(part_num, start, part_compression):
+                if manifest is not None:
+                    part_compression = manifest.compression_of(part_num, part_compression)
+                uploader.submit(first_part + part_num, lambda: encode(part_num, start, part_compression),
+                                part_bytes, part_compression)
+
+            with encoder, PartUploader(self.stream, stream_id, exec_id, workers, max_inflight_bytes,
+                                       manifest.record if manifest is not None else None) as uploader:
+                if compression == 'auto':
+                    part_compression = self._auto_compression(df_up, compresslevel, len(encoder),
+                                                              parts, submit, uploader)
+                for i, start in parts:
+                    submit(i, start, part_compression)
+                uploader.wait()
+            sent.update(uploader=uploader, compression=part_compression, part_bytes=part_bytes,
+                        seconds=time.monotonic() - started)
+
+        if self.coordinator is not None and update_method == 'APPEND' and not resumable:
+            # Merged with other appends to the Stream, which commit or abort together
+            try:
+                result = self.coordinator.append(self.stream, stream_id, part_count, upload_parts)
+            except Exception:
+                # Only a batch that never opened an execution points at a stale Stream
+                if cached_stream_id is None or 'execution_id' in sent:
+                    raise
+                self._forget_stream_id(ds_id)
+                stream_id = self.get_stream_id(ds_id, refresh=True)
+                result = self.coordinator.append(self.stream, stream_id, part_count, upload_parts)
+        else:
+            with self._exclusive(stream_id):
+                manifest = self._resumable_manifest(stream_id, df_rows) if resumable else None
+                if manifest is not None:
+                    exec_id = manifest.execution_id
+                    chunksz = manifest.rows_per_part
+                    self.logger.debug('Resuming execution {} on stream {}, {} parts recorded'
+                                      .format(exec_id, stream_id, len(manifest.parts)))
+                else:
+                    try:
+                        exec_info = self._create_execution(stream_id, update_method)
+                    except Exception:
+                        if cached_stream_id is None:
+                            raise
+                        # The cached Stream may have been deleted or replaced
+                        self._forget_stream_id(ds_id)
+                        stream_id = self.get_stream_id(ds_id, refresh=True)
+                        exec_info = self._create_execution(stream_id, update_method)
+                    exec_id = exec_info['id']
+                    if resumable:
+                        manifest = UploadManifest(UploadManifest.path_for(self.transport.apiHost, stream_id),
+                                                  stream_id, exec_id, df_rows, chunksz)
+                        manifest.save()
+
+                try:
+                    upload_parts(exec_id)
+                except Exception:
+                    if manifest is None:
+                        self._abort_execution(stream_id, exec_id)
+                    else:
+                        self.logger.debug('Execution {} on stream {} left open to resume'
+                                          .format(exec_id, stream_id))
+                    raise
+                result = self.stream.commit_execution(stream_id, exec_id)
+            if manifest is not None:
+                manifest.delete()
+
+        uploader = sent['uploader']
+        self.link_throughput = uploader.upload_throughput() or self.link_throughput
+        self.last_upload_stats = self._upload_stats(df_rows, chunksz, part_kbytes, sent['part_bytes'],
+                                                    uploader.part_sizes, sent['seconds'])
+        self.last_upload_stats['compression'] = sent['compression']
+        self.last_upload_stats['link_throughput'] = self.link_throughput
+        self.logger.debug('Uploaded {parts} parts of {rows_per_part} rows, {bytes_sent} bytes '
+                          'in {seconds:.2f}s'.format(**self.last_upload_stats))
 
         return result
 
+    def _resumable_manifest(self, stream_id, rows):
+        """Return the manifest of an open execution this upload can resume, or None.
+
+        An execution is resumed if it is still ACTIVE and was started for
+        the same number of rows; an ACTIVE one that does not match is
+        aborted, since it can no longer be completed.
+        """
+        manifest = UploadManifest.load(UploadManifest.path_for(self.transport.apiHost, stream_id))
+        if manifest is None or manifest.stream_id != stream_id:
+            return None
+        try:
+            execution = self.stream.get_execution(stream_id, manifest.execution_id)
+        except Exception as err:
+            self.logger.debug('Cannot resume execution {} on stream {}: {}'
+                              .format(manifest.execution_id, stream_id, err))
+            return None
+        if execution.get('currentState') != 'ACTIVE':
+            return None
+        if manifest.rows != rows:
+            self._abort_execution(stream_id, manifest.execution_id)
+            return None
+        return manifest
+
+    @staticmethod
+    def _part_encoder(data, rows_per_part, compresslevel, encode_processes=None):
+        if encode_processes:
+            return ProcessPartEncoder(data, rows_per_part, compresslevel, encode_processes)
+        return CsvPartEncoder(data, rows_per_part, compresslevel)
+
+    def _auto_compression(self, data, compresslevel, part_count, parts, submit, uploader):
+        """Pick the compression of the remaining parts of an 'auto' upload.
+
+        Without a measured link throughput, the first part is uploaded as
+        is to time it, while sample rows are compressed to time gzip.
+        """
+        link_throughput = self.link_throughput
+        probing = link_throughput is None and part_count > 1
+        if probing:
+            part_num, start = next(parts)
+            submit(part_num, start, None)
+        ratio, compress_speed = self.measure_compression(data, compresslevel)
+        if probing:
+            uploader.wait()
+            link_throughput = uploader.upload_throughput()
+        compression = self.choose_compression(ratio, compress_speed, link_throughput)
+        self.logger.debug('Part compression {}: gzip ratio {}, {} B/s compressing, {} B/s uploading'
+                          .format(compression, ratio, compress_speed, link_throughput))
+        return compression
+
+    @staticmethod
+    def _upload_stats(rows, rows_per_part, part_kbytes, estimated_part_bytes, part_sizes, seconds):
+        sizes = [part_sizes[part] for part in sorted(part_sizes)]
+        bytes_sent = sum(sizes)
+        return {
+            'rows': rows,
+            'rows_per_part': rows_per_part,
+            'parts': len(sizes),
+            'target_part_bytes': part_kbytes * 1000,
+            'estimated_part_bytes': estimated_part_bytes,
+            'part_bytes': sizes,
+            'bytes_sent': bytes_sent,
+            'seconds': seconds,
+            'bytes_per_second': bytes_sent / seconds if seconds > 0 else 0.0,
+        }
+
+    def _create_execution(self, stream_id, update_method=None):
+        if update_method is None:
+            return self.stream.create_execution(stream_id)
+        return self.stream.create_execution(stream_id, update_method)
+
+    def _exclusive(self, stream_id):
+        if self.coordinator is None:
+            return contextlib.nullcontext()
+        return self.coordinator.exclusive(self.stream, stream_id)
+
+    def _abort_execution(self, stream_id, exec_id):
+        try:
+            self.stream.abort_execution(stream_id, exec_id)
+        except Exception as err:
+            self.logger.debug('Error aborting execution {} on stream {}: {}'
+                              .format(exec_id, stream_id, err))
+
     def stream_create(self, up_ds, name, description, updateMethod='REPLACE', keyColumnNames=[]):
         df_schema = self.data_schema(up_ds)
         req_body = {'dataSet': {'name': name, 'description': description, 'schema': {'columns': df_schema}}, 'updateMethod': updateMethod}
@@ -140,4 +584,7 @@ class UtilitiesClient(DomoAPIClient):
             req_body['keyColumnNames'] = keyColumnNames
         # return req_body
         st_created = self.transport.post('/v1/streams/', req_body, {})
-        return json.loads(st_created.content.decode('utf-8'))
+        new_stream = json.loads(st_created.content.decode('utf-8'))
+        if 'dataSet' in new_stream and 'id' in new_stream:
+            self._remember_stream_ids({new_stream['dataSet']['id']: new_stream['id']})
+        return new_stream
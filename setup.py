@@ -22,5 +22,8 @@ setup(
         'requests',
         'requests_toolbelt',
     ],
+    extras_require={
+        'async': ['aiohttp'],
+    },
     python_requires='>=3',
 )
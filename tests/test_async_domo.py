@@ -0,0 +1,284 @@
+import asyncio
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+import pandas as pd
+
+try:
+    from pydomo.aio import AsyncDomo
+except ImportError:
+    AsyncDomo = None
+from pydomo.RetryPolicy import RetryPolicy
+from pydomo.streams import StreamIndex
+from tests.test_transport import FakeDomoServer
+
+DATASETS = [{'id': 'ds-{}'.format(i), 'name': 'DataSet {}'.format(i)} for i in range(7)]
+
+
+def unavailable_once(parts, part_num):
+    """Part route handler answering 503 to the first attempt, recording the next."""
+    attempts = []
+
+    def handler(request, body):
+        attempts.append(body)
+        if len(attempts) == 1:
+            return 503, b'Service Unavailable', {}
+        parts[part_num] = body
+        return 200, b'', {}
+    return handler
+
+
+class ThreadRecordingIndex(StreamIndex):
+    """StreamIndex that records the thread running each query."""
+
+    def __init__(self, *args):
+        super(ThreadRecordingIndex, self).__init__(*args)
+        self.threads = []
+
+    def get(self, dataset_id):
+        self.threads.append(threading.get_ident())
+        return super(ThreadRecordingIndex, self).get(dataset_id)
+
+    def put_many(self, pairs):
+        self.threads.append(threading.get_ident())
+        super(ThreadRecordingIndex, self).put_many(pairs)
+
+
+def paged(items):
+    """Route handler serving `items` according to the limit/offset query."""
+    def handler(request, body):
+        query = dict(p.split('=') for p in request.path.split('?')[1].split('&'))
+        offset, limit = int(query['offset']), int(query['limit'])
+        return 200, items[offset:offset + limit], {}
+    return handler
+
+
+@unittest.skipIf(AsyncDomo is None, 'aiohttp is not installed')
+class TestAsyncDomo(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakeDomoServer()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def run_with_domo(self, coroutine_function, **kwargs):
+        async def run():
+            async with AsyncDomo('id', 'secret', api_host=self.server.host, use_https=False, **kwargs) as domo:
+                return await coroutine_function(domo)
+        return asyncio.run(run())
+
+    def test_list_is_an_async_generator(self):
+        self.server.route('GET', '/v1/datasets', paged(DATASETS))
+
+        async def run(domo):
+            return [ds['id'] async for ds in domo.datasets.list(per_page=3)]
+
+        self.assertEqual(self.run_with_domo(run), [ds['id'] for ds in DATASETS])
+
+    def test_concurrent_calls_share_one_token(self):
+        self.server.route('GET', '/v1/users/7', lambda h, b: (200, {'id': 7}, {}))
+
+        async def run(domo):
+            return await asyncio.gather(*[domo.users_get(7) for _ in range(50)])
+
+        users = self.run_with_domo(run)
+        self.assertEqual(len(users), 50)
+        self.assertEqual(self.server.token_calls, 1)
+
+    def test_errors_are_raised(self):
+        self.server.route('GET', '/v1/groups/1', lambda h, b: (403, b'Forbidden', {}))
+
+        async def run(domo):
+            return await domo.groups.get(1)
+
+        with self.assertRaises(Exception) as context:
+            self.run_with_domo(run)
+        self.assertIn('Forbidden', str(context.exception))
+
+    def test_ds_get(self):
+        schema = {'schema': {'columns': [{'type': 'LONG', 'name': 'a'}, {'type': 'STRING', 'name': 'b'}]}}
+        self.server.route('GET', '/v1/datasets/abc', lambda h, b: (200, schema, {}))
+        self.server.route('GET', '/v1/datasets/abc/data', lambda h, b: (200, b'a,b\n1,x\n2,y\n', {}))
+
+        df = self.run_with_domo(lambda domo: domo.ds_get('abc'))
+
+        self.assertEqual(list(df['a']), [1, 2])
+        self.assertEqual(str(df['a'].dtype), 'Int64')
+
+    def test_data_export_stream(self):
+        self.server.route('GET', '/v1/datasets/abc/data', lambda h, b: (200, b'a,b\n1,x\n', {}))
+
+        async def run(domo):
+            async with await domo.datasets.data_export_stream('abc', True) as response:
+                return await response.content.read()
+
+        self.assertEqual(self.run_with_domo(run), b'a,b\n1,x\n')
+
+    def test_data_export_stream_error_is_raised(self):
+        self.server.route('GET', '/v1/datasets/abc/data', lambda h, b: (403, b'Forbidden', {}))
+
+        with self.assertRaises(Exception) as context:
+            self.run_with_domo(lambda domo: domo.datasets.data_export_stream('abc', True))
+        self.assertIn('Forbidden', str(context.exception))
+
+    def test_ds_update_uploads_parts_concurrently(self):
+        schema = {'schema': {'columns': [{'type': 'LONG', 'name': 'a'}]}}
+        self.server.route('GET', '/v1/datasets/abc', lambda h, b: (200, schema, {}))
+        self.server.route('GET', '/v1/streams/search', lambda h, b: (200, [{'id': 5}], {}))
+        self.server.route('POST', '/v1/streams/5/executions', lambda h, b: (201, {'id': 9}, {}))
+        self.server.route('PUT', '/v1/streams/5/executions/9/commit', lambda h, b: (200, {'id': 9}, {}))
+        parts = {}
+        for i in range(4):
+            def handler(request, body, i=i):
+                parts[i] = body
+                return 200, b'', {}
+            self.server.route('PUT', '/v1/streams/5/executions/9/part/{}'.format(i), handler)
+
+        async def run(domo):
+            domo.utilities.estimate_chunk_rows = lambda df, *args, **kwargs: 3
+            return await domo.ds_update('abc', pd.DataFrame({'a': range(10)}))
+
+        result = self.run_with_domo(run)
+
+        self.assertEqual(result, {'id': 9})
+        self.assertEqual(sorted(parts), [0, 1, 2, 3])
+        rows = b''.join(parts[i] for i in range(4)).split()
+        self.assertEqual(rows, [str(i).encode('utf-8') for i in range(10)])
+
+    def test_ds_update_part_is_retried_after_503(self):
+        schema = {'schema': {'columns': [{'type': 'LONG', 'name': 'a'}]}}
+        self.server.route('GET', '/v1/datasets/abc', lambda h, b: (200, schema, {}))
+        self.server.route('GET', '/v1/streams/search', lambda h, b: (200, [{'id': 5}], {}))
+        self.server.route('POST', '/v1/streams/5/executions', lambda h, b: (201, {'id': 9}, {}))
+        self.server.route('PUT', '/v1/streams/5/executions/9/commit', lambda h, b: (200, {'id': 9}, {}))
+        parts = {}
+        self.server.route('PUT', '/v1/streams/5/executions/9/part/0', unavailable_once(parts, 0))
+
+        async def run(domo):
+            return await domo.ds_update('abc', pd.DataFrame({'a': range(3)}))
+
+        result = self.run_with_domo(run, retry_policy=RetryPolicy(backoff_factor=0))
+
+        self.assertEqual(result, {'id': 9})
+        self.assertEqual(parts[0].split(), [b'0', b'1', b'2'])
+
+    def test_stream_index_is_queried_off_the_event_loop(self):
+        searches = []
+        self.server.route('GET', '/v1/streams/search',
+                          lambda h, b: searches.append(1) or (200, [{'id': 5}], {}))
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        index = ThreadRecordingIndex('host', os.path.join(cache_dir, 'index.sqlite3'))
+
+        async def run(domo):
+            domo.utilities.stream_index = index
+            first = await domo.utilities.get_stream_id('abc')
+            domo.utilities._stream_ids.clear()
+            second = await domo.utilities.get_stream_id('abc')
+            return threading.get_ident(), first, second
+
+        loop_thread, first, second = self.run_with_domo(run)
+
+        self.assertEqual((first, second), (5, 5))
+        self.assertEqual(len(searches), 1)
+        self.assertEqual(len(index.threads), 3)
+        self.assertNotIn(loop_thread, index.threads)
+
+    def test_ds_update_gzip_parts(self):
+        schema = {'schema': {'columns': [{'type': 'LONG', 'name': 'a'}]}}
+        self.server.route('GET', '/v1/datasets/abc', lambda h, b: (200, schema, {}))
+        self.server.route('GET', '/v1/streams/search', lambda h, b: (200, [{'id': 5}], {}))
+        self.server.route('POST', '/v1/streams/5/executions', lambda h, b: (201, {'id': 9}, {}))
+        self.server.route('PUT', '/v1/streams/5/executions/9/commit', lambda h, b: (200, {'id': 9}, {}))
+        parts = {}
+        for i in range(2):
+            def handler(request, body, i=i):
+                parts[i] = (request.headers.get('Content-Encoding'), gzip.decompress(body))
+                return 200, b'', {}
+            self.server.route('PUT', '/v1/streams/5/executions/9/part/{}'.format(i), handler)
+
+        async def run(domo):
+            domo.utilities.estimate_chunk_rows = lambda df, *args, **kwargs: 5
+            return await domo.ds_update('abc', pd.DataFrame({'a': range(10)}), compression='gzip')
+
+        self.run_with_domo(run)
+
+        self.assertEqual(parts[0], ('gzip', b'0\n1\n2\n3\n4\n'))
+        self.assertEqual(parts[1][1].split(), [str(i).encode('utf-8') for i in range(5, 10)])
+
+    def test_upload_file(self):
+        self.server.route('POST', '/v1/streams/5/executions', lambda h, b: (201, {'id': 9}, {}))
+        self.server.route('PUT', '/v1/streams/5/executions/9/commit', lambda h, b: (200, {'id': 9}, {}))
+        parts = {}
+        for i in range(3):
+            def handler(request, body, i=i):
+                parts[i] = gzip.decompress(body)
+                return 200, b'', {}
+            self.server.route('PUT', '/v1/streams/5/executions/9/part/{}'.format(i), handler)
+        handle, path = tempfile.mkstemp(suffix='.csv')
+        with os.fdopen(handle, 'wb') as csvfile:
+            csvfile.write(b'a\n' + b'1,hello\n' * 30)
+        self.addCleanup(os.remove, path)
+
+        async def run(domo):
+            return await domo.streams.upload_file(5, path, part_size=80, compression='gzip',
+                                                  skip_header=True)
+
+        self.assertEqual(self.run_with_domo(run), {'id': 9})
+        self.assertEqual([parts[i] for i in range(3)], [b'1,hello\n' * 10] * 3)
+
+    def test_upload_file_part_is_retried_after_503(self):
+        self.server.route('POST', '/v1/streams/5/executions', lambda h, b: (201, {'id': 9}, {}))
+        self.server.route('PUT', '/v1/streams/5/executions/9/commit', lambda h, b: (200, {'id': 9}, {}))
+        parts = {}
+        self.server.route('PUT', '/v1/streams/5/executions/9/part/0', unavailable_once(parts, 0))
+        self.server.route('PUT', '/v1/streams/5/executions/9/part/1', unavailable_once(parts, 1))
+        handle, path = tempfile.mkstemp(suffix='.csv')
+        with os.fdopen(handle, 'wb') as csvfile:
+            csvfile.write(b'1,hello\n' * 20)
+        self.addCleanup(os.remove, path)
+
+        async def run(domo):
+            return await domo.streams.upload_file(5, path, part_size=80)
+
+        result = self.run_with_domo(run, retry_policy=RetryPolicy(backoff_factor=0))
+
+        self.assertEqual(result, {'id': 9})
+        self.assertEqual([parts[0], parts[1]], [b'1,hello\n' * 10] * 2)
+
+    def test_groups_sync_members(self):
+        self.server.route('GET', '/v1/groups/1/users', paged([1, 2, 3]))
+        for user_id in (1, 4, 5):
+            status = 404 if user_id == 5 else 204
+            self.server.route('PUT' if user_id > 3 else 'DELETE', '/v1/groups/1/users/{}'.format(user_id),
+                              lambda h, b, status=status: (status, b'', {}))
+
+        report = self.run_with_domo(lambda domo: domo.groups_sync_members(1, [2, 3, 4, 5]))
+
+        self.assertEqual(report['added']['succeeded'], [4])
+        self.assertEqual(list(report['added']['failed']), [5])
+        self.assertEqual(report['removed'], {'succeeded': [1], 'failed': {}})
+
+    def test_unauthorized_is_retried_with_new_token(self):
+        seen = []
+
+        def handler(request, body):
+            seen.append(request.headers['Authorization'])
+            return (401, b'expired', {}) if len(seen) == 1 else (200, json.loads(body), {})
+        self.server.route('PUT', '/v1/groups/1', handler)
+
+        result = self.run_with_domo(lambda domo: domo.groups.update(1, {'name': 'g'}))
+
+        self.assertEqual(result, {'name': 'g'})
+        self.assertEqual(self.server.token_calls, 2)
+        self.assertNotEqual(seen[0], seen[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import gzip
+import unittest
+
+from pydomo import Domo
+from tests.test_transport import FakeDomoServer
+
+DATASET_ID = 'abc'
+CSV_BODY = b'id,name,created\n1,alpha,2024-01-01\n2,beta,2024-01-02\n3,,2024-01-03\n'
+SCHEMA = {'id': DATASET_ID, 'schema': {'columns': [
+    {'type': 'LONG', 'name': 'id'},
+    {'type': 'STRING', 'name': 'name'},
+    {'type': 'DATE', 'name': 'created'},
+]}}
+
+
+class TestDataSetExport(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakeDomoServer()
+        self.server.route('GET', '/v1/datasets/' + DATASET_ID, lambda h, b: (200, SCHEMA, {}))
+        self.server.route('GET', '/v1/datasets/{}/data'.format(DATASET_ID),
+                          lambda h, b: (200, CSV_BODY, {'Content-Type': 'text/csv'}))
+        self.domo = Domo('id', 'secret', api_host=self.server.host, use_https=False)
+
+    def tearDown(self):
+        self.domo.close()
+        self.server.stop()
+
+    def test_ds_get_uses_schema_types(self):
+        df = self.domo.ds_get(DATASET_ID)
+
+        self.assertEqual(list(df['id']), [1, 2, 3])
+        self.assertEqual(str(df['id'].dtype), 'Int64')
+        self.assertEqual(str(df['name'].dtype), 'string')
+        self.assertTrue(str(df['created'].dtype).startswith('datetime64'))
+
+    def test_ds_get_decodes_compressed_stream(self):
+        self.server.route('GET', '/v1/datasets/{}/data'.format(DATASET_ID),
+                          lambda h, b: (200, gzip.compress(CSV_BODY), {'Content-Encoding': 'gzip'}))
+
+        df = self.domo.ds_get(DATASET_ID)
+
+        self.assertEqual(len(df.index), 3)
+        self.assertEqual(df['name'][1], 'beta')
+
+    def test_ds_get_without_schema(self):
+        df = self.domo.ds_get(DATASET_ID, use_schema=False)
+
+        self.assertEqual(list(df['id']), [1, 2, 3])
+        self.assertEqual(list(df['name'][:2]), ['alpha', 'beta'])
+        self.assertTrue(str(df['created'].dtype).startswith('datetime64'))
+
+    def test_ds_get_chunks(self):
+        chunks = list(self.domo.ds_get_chunks(DATASET_ID, rows_per_chunk=2))
+
+        self.assertEqual([len(c.index) for c in chunks], [2, 1])
+        for chunk in chunks:
+            self.assertEqual(str(chunk['id'].dtype), 'Int64')
+            self.assertTrue(str(chunk['created'].dtype).startswith('datetime64'))
+        self.assertEqual(list(chunks[1]['id']), [3])
+
+    def test_ds_get_dict(self):
+        rows = self.domo.ds_get_dict(DATASET_ID)
+
+        self.assertEqual(rows[0], {'id': '1', 'name': 'alpha', 'created': '2024-01-01'})
+        self.assertEqual(len(rows), 3)
+
+    def test_export_error_is_raised(self):
+        self.server.route('GET', '/v1/datasets/{}/data'.format(DATASET_ID),
+                          lambda h, b: (403, b'Forbidden', {}))
+
+        with self.assertRaises(Exception):
+            self.domo.ds_get(DATASET_ID, use_schema=False)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,263 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import Mock
+
+import pandas as pd
+
+from pydomo.streams import ExecutionCoordinator
+from pydomo.utilities.UtilitiesClient import UtilitiesClient
+from tests.test_part_uploader import RecordingStreamClient
+
+
+class ExecutionStreamClient(RecordingStreamClient):
+    """Records parts by execution and how many executions were open at once."""
+
+    def __init__(self, fail_part=None):
+        super(ExecutionStreamClient, self).__init__(fail_part=fail_part)
+        self.transport = Mock(apiHost='api.domo.com')
+        self.logger = Mock()
+        self.executions = []
+        self.execution_parts = {}
+        self.open = 0
+        self.max_open = 0
+
+    def create_execution(self, stream_id, update_method=None):
+        with self.lock:
+            self.executions.append(update_method)
+            self.open += 1
+            self.max_open = max(self.max_open, self.open)
+            return {'id': len(self.executions)}
+
+    def upload_part(self, stream_id, execution_id, part_num, csv, compression=None):
+        super(ExecutionStreamClient, self).upload_part(stream_id, execution_id, part_num, csv, compression)
+        with self.lock:
+            self.execution_parts.setdefault(execution_id, []).append(part_num)
+
+    def commit_execution(self, stream_id, execution_id):
+        with self.lock:
+            self.open -= 1
+        return super(ExecutionStreamClient, self).commit_execution(stream_id, execution_id)
+
+    def abort_execution(self, stream_id, execution_id):
+        with self.lock:
+            self.open -= 1
+        super(ExecutionStreamClient, self).abort_execution(stream_id, execution_id)
+
+
+def upload_parts(stream, stream_id, part_count, started=None):
+    def upload(execution_id, first_part):
+        if started is not None:
+            started.wait()
+        for part_num in range(first_part, first_part + part_count):
+            stream.upload_part(stream_id, execution_id, part_num, 'x')
+    return upload
+
+
+class TestExecutionCoordinator(unittest.TestCase):
+
+    def run_appends(self, coordinator, stream, uploads):
+        results = [None] * len(uploads)
+
+        def append(i, part_count, upload):
+            try:
+                results[i] = coordinator.append(stream, 5, part_count, upload)
+            except Exception as err:
+                results[i] = err
+
+        threads = [threading.Thread(target=append, args=(i, part_count, upload))
+                   for i, (part_count, upload) in enumerate(uploads)]
+        return threads, results
+
+    def wait_queued(self, coordinator, stream, count):
+        state = coordinator._state(stream, 5)
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            with state.lock:
+                if state.open_batch is not None and len(state.open_batch.part_counts) == count:
+                    return
+            time.sleep(0.005)
+        self.fail('{} appends were not queued'.format(count))
+
+    def test_queued_appends_share_one_execution(self):
+        coordinator = ExecutionCoordinator()
+        stream = ExecutionStreamClient()
+        first_started = threading.Event()
+        first = [(1, upload_parts(stream, 5, 1, first_started))]
+        queued = [(2, upload_parts(stream, 5, 2)), (3, upload_parts(stream, 5, 3)),
+                  (1, upload_parts(stream, 5, 1))]
+
+        first_threads, first_results = self.run_appends(coordinator, stream, first)
+        first_threads[0].start()
+        while not stream.executions:
+            time.sleep(0.005)
+        threads, results = self.run_appends(coordinator, stream, queued)
+        for thread in threads:
+            thread.start()
+        self.wait_queued(coordinator, stream, 3)
+        first_started.set()
+        for thread in first_threads + threads:
+            thread.join()
+
+        self.assertEqual(stream.executions, ['APPEND', 'APPEND'])
+        self.assertEqual(stream.max_open, 1)
+        self.assertEqual(stream.committed, [1, 2])
+        self.assertEqual(stream.execution_parts[1], [0])
+        self.assertEqual(sorted(stream.execution_parts[2]), list(range(6)))
+        self.assertEqual([result['id'] for result in results], [2, 2, 2])
+        self.assertEqual(coordinator.metrics.get('batches'), 2)
+        self.assertEqual(coordinator.metrics.get('merged_uploads'), 4)
+
+    def test_failed_append_aborts_its_batch(self):
+        coordinator = ExecutionCoordinator()
+        stream = ExecutionStreamClient(fail_part=2)
+        with coordinator.exclusive(stream, 5):
+            threads, results = self.run_appends(coordinator, stream, [
+                (2, upload_parts(stream, 5, 2)), (2, upload_parts(stream, 5, 2))])
+            for thread in threads:
+                thread.start()
+            self.wait_queued(coordinator, stream, 2)
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(stream.executions, ['APPEND'])
+        self.assertEqual(stream.aborted, [1])
+        self.assertEqual(stream.committed, [])
+        self.assertTrue(all(isinstance(result, Exception) for result in results))
+
+    def test_failed_abort_is_logged(self):
+        coordinator = ExecutionCoordinator()
+        stream = ExecutionStreamClient(fail_part=0)
+        stream.abort_execution = Mock(side_effect=Exception('abort refused'))
+
+        with self.assertRaises(Exception):
+            coordinator.append(stream, 5, 1, upload_parts(stream, 5, 1))
+
+        stream.abort_execution.assert_called_once_with(5, 1)
+        self.assertIn('abort refused', stream.logger.debug.call_args[0][0])
+
+    def test_failed_lock_fails_the_whole_batch(self):
+        coordinator = ExecutionCoordinator()
+        stream = ExecutionStreamClient()
+        acquire = coordinator._acquire
+        entered, proceed = threading.Event(), threading.Event()
+
+        def failing_acquire(state):
+            entered.set()
+            proceed.wait()
+            raise OSError('lock file unavailable')
+        coordinator._acquire = failing_acquire
+        threads, results = self.run_appends(coordinator, stream, [(1, upload_parts(stream, 5, 1))] * 3)
+        threads[0].start()
+        entered.wait()
+        for thread in threads[1:]:
+            thread.start()
+        self.wait_queued(coordinator, stream, 3)
+        proceed.set()
+        for thread in threads:
+            thread.join(5)
+            self.assertFalse(thread.is_alive())
+
+        self.assertTrue(all(isinstance(result, OSError) for result in results))
+        self.assertEqual(stream.executions, [])
+        # The failed batch is not left open for later appends
+        coordinator._acquire = acquire
+        self.assertEqual(coordinator.append(stream, 5, 1, upload_parts(stream, 5, 1))['id'], 1)
+
+    def test_missing_lock_dir_is_created(self):
+        stream = ExecutionStreamClient()
+        with tempfile.TemporaryDirectory() as cache_dir:
+            lock_dir = os.path.join(cache_dir, 'missing', 'locks')
+            coordinator = ExecutionCoordinator(file_locks=True, lock_dir=lock_dir)
+            coordinator.append(stream, 5, 1, upload_parts(stream, 5, 1))
+
+            self.assertEqual(len(os.listdir(lock_dir)), 1)
+        self.assertEqual(stream.committed, [1])
+
+    def test_exclusive_holds_back_appends(self):
+        coordinator = ExecutionCoordinator()
+        stream = ExecutionStreamClient()
+        threads, results = self.run_appends(coordinator, stream, [(1, upload_parts(stream, 5, 1))])
+        with coordinator.exclusive(stream, 5):
+            threads[0].start()
+            self.wait_queued(coordinator, stream, 1)
+            self.assertEqual(stream.executions, [])
+        threads[0].join()
+
+        self.assertEqual(stream.committed, [1])
+        self.assertEqual(coordinator.metrics.get('exclusive'), 1)
+
+    def test_file_locks_serialize_coordinators(self):
+        stream = ExecutionStreamClient()
+        with tempfile.TemporaryDirectory() as lock_dir:
+            holder = ExecutionCoordinator(file_locks=True, lock_dir=lock_dir)
+            waiter = ExecutionCoordinator(file_locks=True, lock_dir=lock_dir)
+            threads, results = self.run_appends(waiter, stream, [(1, upload_parts(stream, 5, 1))])
+            with holder.exclusive(stream, 5):
+                threads[0].start()
+                time.sleep(0.1)
+                self.assertEqual(stream.executions, [])
+            threads[0].join()
+
+        self.assertEqual(stream.committed, [1])
+
+
+class TestCoordinatedStreamUpload(unittest.TestCase):
+
+    def setUp(self):
+        self.coordinator = ExecutionCoordinator()
+        self.client = UtilitiesClient(Mock(), Mock(), coordinator=self.coordinator)
+        self.client.domo_schema = Mock(return_value=[{'type': 'LONG', 'name': 'a'}])
+        self.client.get_stream_id = Mock(return_value=42)
+        self.client.estimate_chunk_rows = Mock(return_value=3)
+        self.client.stream = ExecutionStreamClient()
+
+    def test_append_goes_through_coordinator(self):
+        result = self.client.stream_upload('ds-1', pd.DataFrame({'a': range(10)}), update_method='APPEND')
+
+        self.assertEqual(result['id'], 1)
+        self.assertEqual(self.client.stream.executions, ['APPEND'])
+        self.assertEqual(sorted(self.client.stream.execution_parts[1]), [0, 1, 2, 3])
+        self.assertEqual(self.coordinator.metrics.get('batches'), 1)
+        self.assertEqual(self.client.last_upload_stats['parts'], 4)
+
+    def test_stale_cached_stream_is_refreshed(self):
+        self.client._stream_ids['ds-1'] = 111
+        stream = self.client.stream
+        create_execution = stream.create_execution
+
+        def reject_stale(stream_id, update_method=None):
+            if stream_id == 111:
+                raise Exception('Stream 111 not found')
+            return create_execution(stream_id, update_method)
+        stream.create_execution = reject_stale
+
+        result = self.client.stream_upload('ds-1', pd.DataFrame({'a': range(4)}), update_method='APPEND')
+
+        self.assertEqual(result['id'], 1)
+        self.client.get_stream_id.assert_called_once_with('ds-1', refresh=True)
+        self.assertNotIn('ds-1', self.client._stream_ids)
+        self.assertEqual(sorted(stream.execution_parts[1]), [0, 1])
+
+    def test_failed_merged_upload_is_not_retried(self):
+        self.client._stream_ids['ds-1'] = 111
+        self.client.stream.fail_part = 0
+
+        with self.assertRaises(Exception):
+            self.client.stream_upload('ds-1', pd.DataFrame({'a': range(4)}), update_method='APPEND')
+
+        self.client.get_stream_id.assert_not_called()
+        self.assertEqual(self.client.stream.executions, ['APPEND'])
+
+    def test_replace_is_exclusive(self):
+        self.client.stream_upload('ds-1', pd.DataFrame({'a': range(10)}))
+
+        self.assertEqual(self.client.stream.executions, [None])
+        self.assertEqual(self.coordinator.metrics.get('exclusive'), 1)
+        self.assertEqual(self.coordinator.metrics.get('batches'), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+import gzip
+import io
+import logging
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import Mock
+
+from pydomo.streams import CsvFileSplitter, StreamClient
+from pydomo.Transport import DomoAPITransport
+from tests.test_transport import FakeDomoServer
+
+
+class SplitterTestCase(unittest.TestCase):
+
+    def write(self, content):
+        handle, path = tempfile.mkstemp(suffix='.csv')
+        with os.fdopen(handle, 'wb') as csvfile:
+            csvfile.write(content)
+        self.addCleanup(os.remove, path)
+        return path
+
+
+class TestCsvFileSplitter(SplitterTestCase):
+
+    def parts(self, content, **kwargs):
+        with CsvFileSplitter(self.write(content), **kwargs) as splitter:
+            return [splitter.open_part(start, end).read() for start, end in splitter.boundaries()]
+
+    def test_parts_end_on_newlines(self):
+        content = b''.join(b'%d,row\n' % i for i in range(1000))
+        parts = self.parts(content, part_size=100)
+
+        self.assertEqual(b''.join(parts), content)
+        self.assertTrue(all(part.endswith(b'\n') for part in parts))
+        self.assertTrue(all(len(part) >= 100 for part in parts[:-1]))
+        self.assertTrue(all(len(part) < 110 for part in parts))
+
+    def test_last_line_without_newline(self):
+        self.assertEqual(self.parts(b'1,a\n2,b', part_size=5), [b'1,a\n2,b'])
+
+    def test_quoted_newlines(self):
+        content = b'1,"first\nline"\n2,"say ""hi""\nthere"\n3,x\n'
+
+        self.assertEqual(self.parts(content, part_size=3, quoted_newlines=True),
+                         [b'1,"first\nline"\n', b'2,"say ""hi""\nthere"\n', b'3,x\n'])
+        self.assertEqual(self.parts(content, part_size=3)[0], b'1,"first\n')
+
+    def test_skip_header(self):
+        self.assertEqual(self.parts(b'a,b\n1,2\n3,4\n', part_size=1, skip_header=True),
+                         [b'1,2\n', b'3,4\n'])
+        self.assertEqual(self.parts(b'a,b\n', skip_header=True), [])
+        self.assertEqual(self.parts(b''), [])
+
+    def test_gzip_parts(self):
+        content = b'1,a\n' * 100
+        with CsvFileSplitter(self.write(content), part_size=200) as splitter:
+            parts = [gzip.decompress(splitter.encode(start, end, 'gzip').read())
+                     for start, end in splitter.boundaries()]
+
+        self.assertEqual(len(parts), 2)
+        self.assertEqual(b''.join(parts), content)
+
+    def test_part_reader_seeks_within_its_range(self):
+        with CsvFileSplitter(self.write(b'1,a\n2,b\n3,c\n')) as splitter:
+            part = splitter.open_part(4, 8)
+            self.assertEqual(part.read(2), b'2,')
+            self.assertEqual(part.seek(0, io.SEEK_END), 4)
+            self.assertEqual(part.read(), b'')
+            part.seek(0)
+            self.assertEqual(part.read(), b'2,b\n')
+
+
+class TestUploadFile(SplitterTestCase):
+
+    def setUp(self):
+        self.client = StreamClient(Mock(), Mock())
+        self.client.create_execution = Mock(return_value={'id': 7})
+        self.client.commit_execution = Mock(return_value={'id': 7, 'currentState': 'SUCCESS'})
+        self.client.abort_execution = Mock()
+        self.parts = {}
+        self.lock = threading.Lock()
+
+        def upload_part(stream_id, execution_id, part_num, body, compression=None):
+            data = body.read()
+            if compression == 'gzip':
+                data = gzip.decompress(data)
+            with self.lock:
+                self.parts[part_num] = data
+        self.client.upload_part = upload_part
+
+    def test_parts_are_uploaded_and_committed(self):
+        content = b'h1,h2\n' + b''.join(b'%d,"v\nv"\n' % i for i in range(500))
+        path = self.write(content)
+
+        result = self.client.upload_file(1, path, part_size=256, compression='gzip', max_workers=3,
+                                         quoted_newlines=True, skip_header=True)
+
+        self.assertEqual(result['currentState'], 'SUCCESS')
+        self.assertEqual(sorted(self.parts), list(range(len(self.parts))))
+        self.assertGreater(len(self.parts), 10)
+        self.assertEqual(b''.join(self.parts[i] for i in range(len(self.parts))), content[6:])
+
+    def test_failed_part_aborts_execution(self):
+        self.client.upload_part = Mock(side_effect=Exception('Error uploading part'))
+
+        with self.assertRaises(Exception):
+            self.client.upload_file(1, self.write(b'1,a\n' * 100), part_size=40)
+
+        self.client.abort_execution.assert_called_once_with(1, 7)
+        self.client.commit_execution.assert_not_called()
+
+
+class TestUploadFileOverHttp(SplitterTestCase):
+
+    def test_ranges_are_sent_with_content_length(self):
+        server = FakeDomoServer()
+        self.addCleanup(server.stop)
+        server.route('POST', '/v1/streams/1/executions', lambda h, b: (201, {'id': 2}, {}))
+        server.route('PUT', '/v1/streams/1/executions/2/commit', lambda h, b: (200, {'id': 2}, {}))
+        for i in range(3):
+            server.route('PUT', '/v1/streams/1/executions/2/part/{}'.format(i), lambda h, b: (200, b'', {}))
+        transport = DomoAPITransport('id', 'secret', server.host, False,
+                                     logging.getLogger('pydomo.tests'), request_timeout=5, scope=None)
+        client = StreamClient(transport, transport.logger)
+
+        client.upload_file(1, self.write(b'1,hello\n' * 30), part_size=80, max_workers=1)
+
+        parts = [(headers, body) for method, path, headers, body in server.calls if '/part/' in path]
+        self.assertEqual([body for headers, body in parts], [b'1,hello\n' * 10] * 3)
+        self.assertEqual([int(headers.get('Content-Length')) for headers, body in parts], [80] * 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import threading
+import time
+import unittest
+from unittest.mock import Mock
+
+from pydomo import Domo
+from pydomo.groups import GroupClient
+
+
+class FakeGroupClient(GroupClient):
+    """GroupClient whose membership calls act on an in-memory set."""
+
+    def __init__(self, members=(), fail_users=(), delay=0.0):
+        super(FakeGroupClient, self).__init__(Mock(), Mock())
+        self.members = set(members)
+        self.fail_users = set(fail_users)
+        self.delay = delay
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def _change(self, action, user_id):
+        with self.lock:
+            self.calls.append((action, user_id))
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            if user_id in self.fail_users:
+                raise Exception('Error updating a User in a Group: 404')
+            with self.lock:
+                action(user_id)
+        finally:
+            with self.lock:
+                self.active -= 1
+
+    def add_user(self, group_id, user_id):
+        self._change(self.members.add, user_id)
+
+    def remove_user(self, group_id, user_id):
+        self._change(self.members.discard, user_id)
+
+    def list_users(self, group_id, limit, offset):
+        return sorted(self.members)[offset:offset + limit]
+
+
+class TestGroupMembership(unittest.TestCase):
+
+    def test_add_users_runs_concurrently(self):
+        groups = FakeGroupClient(delay=0.02)
+        report = groups.add_users(1, list(range(20)), max_workers=5)
+
+        self.assertEqual(report, {'succeeded': list(range(20)), 'failed': {}})
+        self.assertEqual(groups.members, set(range(20)))
+        self.assertGreater(groups.max_active, 1)
+        self.assertLessEqual(groups.max_active, 5)
+
+    def test_failures_are_reported_per_user(self):
+        groups = FakeGroupClient(members=range(5), fail_users={2})
+        report = groups.remove_users(1, [0, 1, 2, 3])
+
+        self.assertEqual(report['succeeded'], [0, 1, 3])
+        self.assertEqual(list(report['failed']), [2])
+        self.assertIn('404', report['failed'][2])
+        self.assertEqual(groups.members, {2, 4})
+
+    def test_sync_members_makes_only_needed_calls(self):
+        groups = FakeGroupClient(members=range(1000))
+        report = groups.sync_members(1, list(range(10, 1005)))
+
+        self.assertEqual(report['added']['succeeded'], list(range(1000, 1005)))
+        self.assertEqual(sorted(report['removed']['succeeded']), list(range(10)))
+        self.assertEqual(len(groups.calls), 15)
+        self.assertEqual(groups.members, set(range(10, 1005)))
+
+    def test_domo_helpers_raise_unless_report(self):
+        domo = Domo.__new__(Domo)
+        domo.__dict__['groups'] = FakeGroupClient(fail_users={3})
+
+        self.assertEqual(domo.groups_add_users(1, [1, 2]), 'success')
+        with self.assertRaises(Exception) as context:
+            domo.groups_add_users(1, [3, 4])
+        self.assertIn('1 of 2', str(context.exception))
+        report = domo.groups_add_users(1, 3, report=True)
+        self.assertEqual(list(report['failed']), [3])
+
+
+if __name__ == '__main__':
+    unittest.main()
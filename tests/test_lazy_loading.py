@@ -0,0 +1,52 @@
+import subprocess
+import sys
+import unittest
+
+from pydomo import Domo
+from tests.test_transport import FakeDomoServer
+
+USERS_SCRIPT = '''
+import sys
+from pydomo import Domo
+domo = Domo('id', 'secret', api_host='{host}', use_https=False, lazy_auth=True)
+assert domo.users.list(10, 0) == []
+print([name for name in ('pandas', 'pydomo.streams', 'pydomo.datasets', 'pydomo.utilities')
+       if name in sys.modules])
+'''
+
+
+class TestLazyLoading(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakeDomoServer()
+        self.server.route('GET', '/v1/users/', lambda h, b: (200, [], {}))
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_lazy_auth_defers_token_request(self):
+        domo = Domo('id', 'secret', api_host=self.server.host, use_https=False, lazy_auth=True)
+        self.assertEqual(self.server.token_calls, 0)
+
+        domo.users.list(10, 0)
+        domo.users.list(10, 0)
+        self.assertEqual(self.server.token_calls, 1)
+        domo.close()
+
+    def test_clients_are_built_once_and_share_transport(self):
+        domo = Domo('id', 'secret', api_host=self.server.host, use_https=False, lazy_auth=True)
+
+        self.assertIs(domo.datasets, domo.datasets)
+        self.assertIs(domo.groups.transport, domo.transport)
+        self.assertIs(domo.utilities.transport, domo.transport)
+
+    def test_user_scripts_do_not_load_pandas_or_other_clients(self):
+        script = USERS_SCRIPT.format(host=self.server.host)
+        output = subprocess.run([sys.executable, '-c', script], check=True,
+                                capture_output=True, text=True).stdout
+
+        self.assertEqual(output.strip(), '[]')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import logging
+import time
+import unittest
+
+from pydomo.MetadataCache import MetadataCache
+from pydomo.Transport import DomoAPITransport
+from tests.test_transport import FakeDomoServer
+
+
+class TestMetadataCache(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakeDomoServer()
+        self.cache = MetadataCache(ttl=60)
+        self.transport = DomoAPITransport('id', 'secret', self.server.host, False,
+                                          logging.getLogger('pydomo.tests'), request_timeout=5,
+                                          scope=None, metadata_cache=self.cache)
+        self.gets = 0
+
+        def get_dataset(request, body):
+            self.gets += 1
+            return 200, {'id': 'abc', 'version': self.gets}, {}
+        self.server.route('GET', '/v1/datasets/abc', get_dataset)
+        self.server.route('GET', '/v1/datasets/xyz', get_dataset)
+        self.server.route('PUT', '/v1/datasets/abc', lambda h, b: (200, {'id': 'abc'}, {}))
+
+    def tearDown(self):
+        self.transport.close()
+        self.server.stop()
+
+    def get(self, path):
+        return self.transport.get(path, {}).json()
+
+    def test_hits_are_served_from_cache(self):
+        self.assertEqual(self.get('/v1/datasets/abc'), self.get('/v1/datasets/abc'))
+        self.assertEqual(self.gets, 1)
+        self.assertEqual(self.cache.metrics.get('hits'), 1)
+        self.assertEqual(self.cache.metrics.get('misses'), 1)
+
+    def test_writes_invalidate_the_object(self):
+        self.get('/v1/datasets/abc')
+        self.get('/v1/datasets/xyz')
+        self.transport.put('/v1/datasets/abc', {'name': 'new'})
+
+        self.assertEqual(self.get('/v1/datasets/abc')['version'], 3)
+        self.get('/v1/datasets/xyz')
+        self.assertEqual(self.gets, 3)
+        self.assertEqual(self.cache.metrics.get('invalidations'), 1)
+
+    def test_expired_entries_are_revalidated(self):
+        self.cache.ttl = 0
+        self.server.route('GET', '/v1/users/1', lambda request, body: (
+            (304, b'', {}) if request.headers.get('If-None-Match') == '"v1"'
+            else (200, {'id': 1}, {'ETag': '"v1"'})))
+
+        self.assertEqual(self.get('/v1/users/1'), {'id': 1})
+        self.assertEqual(self.get('/v1/users/1'), {'id': 1})
+        self.assertEqual(self.cache.metrics.get('revalidations'), 1)
+
+    def test_data_endpoints_are_not_cached(self):
+        self.server.route('GET', '/v1/streams/1/executions/2', lambda h, b: (200, {'state': 'ACTIVE'}, {}))
+        self.get('/v1/streams/1/executions/2')
+        self.get('/v1/streams/1/executions/2')
+        self.assertEqual(self.cache.stats()['entries'], 0)
+
+
+class TestMetadataCacheEviction(unittest.TestCase):
+
+    class Response(object):
+        status_code = 200
+        headers = {}
+
+        def __init__(self, size):
+            self.content = b'x' * size
+
+    def test_lru_eviction_and_size_cap(self):
+        cache = MetadataCache(max_entries=2, max_bytes=100)
+        for path in ('/v1/users/1', '/v1/users/2'):
+            cache.fetch(path, {}, lambda headers: self.Response(10))
+        cache.fetch('/v1/users/1', {}, lambda headers: self.Response(10))
+        cache.fetch('/v1/users/3', {}, lambda headers: self.Response(10))
+
+        self.assertEqual(cache.metrics.get('hits'), 1)
+        self.assertEqual(cache.metrics.get('evictions'), 1)
+        # users/2 was least recently used
+        sent = []
+        cache.fetch('/v1/users/2', {}, lambda headers: sent.append(1) or self.Response(10))
+        self.assertEqual(sent, [1])
+
+        cache.fetch('/v1/users/4', {}, lambda headers: self.Response(95))
+        self.assertLessEqual(cache.stats()['bytes'], 100)
+
+    def test_invalidation_scope(self):
+        self.assertEqual(MetadataCache.resource('/v1/streams/search'), ('streams', None))
+        self.assertEqual(MetadataCache.resource('/v1/datasets/abc/policies/3'), ('datasets', 'abc'))
+        cache = MetadataCache()
+        for path in ('/v1/datasets/abc', '/v1/datasets/abc/policies', '/v1/datasets/xyz',
+                     '/v1/datasets', '/v1/streams/search', '/v1/streams/5'):
+            cache.fetch(path, {}, lambda headers: self.Response(1))
+
+        cache.invalidate('/v1/datasets/abc/policies/3')
+
+        self.assertEqual(cache.stats()['entries'], 2)
+        self.assertEqual(sorted(key[0] for key in cache._entries), ['/v1/datasets/xyz', '/v1/streams/5'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+import math
+import threading
+import time
+import unittest
+from unittest.mock import Mock
+
+import pandas as pd
+
+from pydomo.accounts import AccountClient
+from pydomo.common import Paginator, fetch_all_pages, pages_to_frame, records_to_columns
+from pydomo.datasets import DataSetClient
+from pydomo.pages import PageClient
+from pydomo.users import UserClient
+
+
+class FakeEndpoint(object):
+    """Paged list endpoint over `total` integers, recording its calls."""
+
+    def __init__(self, total, delay=0.0):
+        self.total = total
+        self.delay = delay
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, limit, offset):
+        with self.lock:
+            self.calls.append((limit, offset))
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        return list(range(offset, min(offset + limit, self.total)))
+
+
+class TestPaginator(unittest.TestCase):
+
+    def test_serial_pages(self):
+        endpoint = FakeEndpoint(7)
+        self.assertEqual(list(Paginator(endpoint, 3)), list(range(7)))
+        self.assertEqual(endpoint.calls, [(3, 0), (3, 3), (3, 6), (3, 9)])
+
+    def test_limit_and_offset(self):
+        endpoint = FakeEndpoint(100)
+        self.assertEqual(list(Paginator(endpoint, 3, offset=10, limit=7)), list(range(10, 17)))
+        self.assertEqual(endpoint.calls, [(3, 10), (3, 13), (1, 16)])
+
+    def test_stop_on_short_page(self):
+        endpoint = FakeEndpoint(7)
+        self.assertEqual(list(Paginator(endpoint, 3, stop_on_short_page=True)), list(range(7)))
+        self.assertEqual(len(endpoint.calls), 3)
+
+    def test_prefetch_overlaps_requests(self):
+        endpoint = FakeEndpoint(40, delay=0.02)
+        self.assertEqual(list(Paginator(endpoint, 5, prefetch=3)), list(range(40)))
+        self.assertGreater(endpoint.max_active, 1)
+        self.assertLessEqual(endpoint.max_active, 3)
+        # at most `prefetch` speculative requests past the end
+        self.assertLessEqual(len(endpoint.calls), 9 + 3)
+
+    def test_prefetch_respects_limit(self):
+        endpoint = FakeEndpoint(100)
+        self.assertEqual(list(Paginator(endpoint, 5, limit=12, prefetch=4)), list(range(12)))
+        self.assertEqual(sorted(endpoint.calls, key=lambda c: c[1]), [(5, 0), (5, 5), (2, 10)])
+
+    def test_prefetch_errors_are_raised(self):
+        def fetch_page(limit, offset):
+            if offset >= 10:
+                raise Exception('Error listing')
+            return list(range(offset, offset + limit))
+
+        with self.assertRaises(Exception):
+            list(Paginator(fetch_page, 5, prefetch=2))
+
+
+class TestClientListing(unittest.TestCase):
+
+    def check_client(self, client_class, **kwargs):
+        client = client_class(Mock(), Mock())
+        endpoint = FakeEndpoint(120)
+        client._list = Mock(side_effect=lambda url, params, desc: endpoint(params['limit'], params['offset']))
+
+        self.assertEqual(list(client.list(**kwargs)), list(range(120)))
+        self.assertEqual(list(client.list(offset=20, limit=60, **kwargs)), list(range(20, 80)))
+
+    def test_datasets(self):
+        self.check_client(DataSetClient, per_page=50)
+
+    def test_pages(self):
+        self.check_client(PageClient, prefetch=0)
+
+    def test_accounts(self):
+        self.check_client(AccountClient, per_account=25)
+
+
+class TestFanOutListing(unittest.TestCase):
+
+    def test_fetch_all_pages_stops_at_short_page(self):
+        endpoint = FakeEndpoint(1234, delay=0.01)
+        pages = fetch_all_pages(endpoint, 100, max_workers=4)
+
+        self.assertEqual([len(page) for page in pages], [100] * 12 + [34])
+        self.assertGreater(endpoint.max_active, 1)
+        self.assertLessEqual(len(endpoint.calls), 13 + 4)
+
+    def test_records_to_columns(self):
+        columns = records_to_columns([[{'id': 1, 'name': 'a'}], [{'id': 2}, {'id': 3, 'role': 'x'}]])
+
+        self.assertEqual(list(columns), ['id', 'name', 'role'])
+        self.assertEqual(columns['id'], [1, 2, 3])
+        self.assertEqual(columns['name'][0], 'a')
+        self.assertTrue(all(len(column) == 3 for column in columns.values()))
+        self.assertTrue(math.isnan(columns['role'][0]) and math.isnan(columns['name'][2]))
+
+    def test_pages_to_frame_columnar_matches_records(self):
+        pages = [[{'id': 1, 'name': 'a'}], [{'id': 2}, {'id': 3, 'role': 'x'}]]
+
+        pd.testing.assert_frame_equal(pages_to_frame(pages, columnar=True), pages_to_frame(pages))
+
+    def test_users_list_all(self):
+        client = UserClient(Mock(), Mock())
+        endpoint = FakeEndpoint(1100)
+        client.list = Mock(side_effect=lambda limit, offset: [{'id': i} for i in endpoint(limit, offset)])
+
+        users = client.list_all(df_output=False)
+        df = client.list_all()
+
+        self.assertEqual([user['id'] for user in users], list(range(1100)))
+        self.assertEqual(list(df['id']), list(range(1100)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import asyncio
+import logging
+import threading
+import time
+import unittest
+
+from pydomo.RateLimiter import RateLimiter, TokenBucket
+from pydomo.Transport import DomoAPITransport
+from tests.test_transport import FakeDomoServer
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_burst_then_paced(self):
+        bucket = TokenBucket(rate=10, capacity=2)
+        waits = [bucket.reserve() for _ in range(4)]
+
+        self.assertEqual(waits[:2], [0.0, 0.0])
+        self.assertAlmostEqual(waits[2], 0.1, places=2)
+        self.assertAlmostEqual(waits[3], 0.2, places=2)
+
+    def test_threads_share_the_rate(self):
+        bucket = TokenBucket(rate=50, capacity=1)
+        start = time.monotonic()
+        threads = [threading.Thread(target=bucket.acquire) for _ in range(11)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertGreaterEqual(time.monotonic() - start, 0.19)
+
+    def test_async_tasks_share_the_rate(self):
+        bucket = TokenBucket(rate=50, capacity=1)
+
+        async def run():
+            start = time.monotonic()
+            await asyncio.gather(*[bucket.acquire_async() for _ in range(11)])
+            return time.monotonic() - start
+
+        self.assertGreaterEqual(asyncio.run(run()), 0.19)
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def test_endpoint_families(self):
+        self.assertEqual(RateLimiter.family('/v1/datasets/abc/data'), 'datasets')
+        self.assertEqual(RateLimiter.family('/v1/groups/?limit=5'), 'groups')
+        self.assertEqual(RateLimiter.family('/oauth/token'), 'oauth')
+        self.assertIsNone(RateLimiter.family('/v1/cards'))
+
+    def test_unknown_family_is_rejected(self):
+        with self.assertRaises(ValueError):
+            RateLimiter(family_rates={'cards': 1})
+
+    def test_family_buckets_are_independent(self):
+        limiter = RateLimiter(family_rates={'groups': 1})
+        self.assertEqual(limiter.reserve('/v1/groups/1'), 0)
+        self.assertGreater(limiter.reserve('/v1/groups/1'), 0)
+        self.assertEqual(limiter.reserve('/v1/users/1'), 0)
+
+    def test_global_bucket_applies_to_all(self):
+        limiter = RateLimiter(global_rate=1)
+        self.assertEqual(limiter.reserve('/v1/groups/1'), 0)
+        self.assertGreater(limiter.reserve('/v1/users/1'), 0)
+
+
+class TestTransportRateLimit(unittest.TestCase):
+
+    def test_requests_wait_for_their_bucket(self):
+        server = FakeDomoServer()
+        server.route('GET', '/v1/users/', lambda h, b: (200, [], {}))
+        limiter = RateLimiter(family_rates={'users': 5}, family_bursts={'users': 1})
+        transport = DomoAPITransport('id', 'secret', server.host, False, logging.getLogger('pydomo.tests'),
+                                     request_timeout=5, scope=None, rate_limiter=limiter)
+        try:
+            for _ in range(5):
+                transport.get('/v1/users/', {}).json()
+            self.assertGreaterEqual(transport.metrics.get('rate_limit_wait_seconds'), 0.4)
+        finally:
+            transport.close()
+            server.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
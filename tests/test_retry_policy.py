@@ -0,0 +1,108 @@
+import io
+import logging
+import unittest
+from unittest.mock import Mock
+
+from pydomo.RetryPolicy import RetryPolicy
+from pydomo.Transport import DomoAPITransport
+from tests.test_transport import FakeDomoServer
+
+
+def flaky(statuses, headers=None):
+    """Route handler answering with each status in turn, then 200."""
+    remaining = list(statuses)
+    bodies = []
+
+    def handler(request, body):
+        bodies.append(body)
+        if remaining:
+            return remaining.pop(0), b'try again', headers or {}
+        return 200, {'ok': True}, {}
+    handler.bodies = bodies
+    return handler
+
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def test_backoff_is_bounded(self):
+        policy = RetryPolicy(backoff_factor=1, max_backoff=4)
+        for attempt in range(10):
+            self.assertLessEqual(policy.backoff(attempt), 4)
+
+    def test_retry_after_seconds_and_dates(self):
+        policy = RetryPolicy(max_retry_after=10)
+        self.assertEqual(policy.backoff(0, Mock(headers={'Retry-After': '3'})), 3)
+        self.assertEqual(policy.backoff(0, Mock(headers={'Retry-After': '120'})), 10)
+        date = 'Wed, 21 Oct 2015 07:28:00 GMT'
+        self.assertEqual(policy.backoff(0, Mock(headers={'Retry-After': date})), 0)
+
+    def test_only_throttling_is_retried_for_post(self):
+        policy = RetryPolicy()
+        self.assertTrue(policy.retry_response('POST', 429, 0))
+        self.assertFalse(policy.retry_response('POST', 503, 0))
+        self.assertTrue(policy.retry_response('PUT', 503, 0))
+        self.assertFalse(policy.retry_response('PUT', 503, policy.max_retries))
+        self.assertFalse(policy.retry_response('GET', 400, 0))
+
+
+class TestTransportRetries(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakeDomoServer()
+        self.transport = DomoAPITransport('id', 'secret', self.server.host, False,
+                                          logging.getLogger('pydomo.tests'), request_timeout=5, scope=None,
+                                          retry_policy=RetryPolicy(max_retries=3, backoff_factor=0.01))
+
+    def tearDown(self):
+        self.transport.close()
+        self.server.stop()
+
+    def test_transient_errors_are_retried(self):
+        self.server.route('GET', '/v1/users/', flaky([503, 502]))
+
+        response = self.transport.get('/v1/users/', {})
+
+        self.assertEqual(response.status_code, 200)
+        metrics = self.transport.metrics.snapshot()
+        self.assertEqual(metrics['retries'], 2)
+        self.assertGreater(metrics['retry_sleep_seconds'], 0)
+
+    def test_retries_are_limited(self):
+        self.server.route('GET', '/v1/users/', flaky([503] * 10))
+
+        response = self.transport.get('/v1/users/', {})
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(self.transport.metrics.get('retries'), 3)
+        self.assertEqual(self.transport.metrics.get('retries_exhausted'), 1)
+
+    def test_retry_after_is_honored(self):
+        self.server.route('POST', '/v1/groups/', flaky([429], {'Retry-After': '0.2'}))
+
+        response = self.transport.post('/v1/groups/', {'name': 'g'}, {})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertAlmostEqual(self.transport.metrics.get('retry_sleep_seconds'), 0.2)
+
+    def test_seekable_body_is_replayed(self):
+        handler = flaky([503])
+        self.server.route('PUT', '/v1/streams/1/executions/2/part/0', handler)
+
+        body = io.BytesIO(b'skip,me\n1,a\n2,b\n')
+        body.readline()
+        response = self.transport.put_csv('/v1/streams/1/executions/2/part/0', body)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(handler.bodies, [b'1,a\n2,b\n', b'1,a\n2,b\n'])
+
+    def test_generator_body_is_not_retried(self):
+        self.server.route('PUT', '/v1/streams/1/executions/2/part/0', flaky([503]))
+
+        response = self.transport.put_gzip('/v1/streams/1/executions/2/part/0', iter([b'a', b'b']))
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(self.transport.metrics.get('retries'), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import gzip
+import io
+import logging
+import os
+import tempfile
+import unittest
+
+from pydomo.streams import StreamClient
+from pydomo.streams.Compression import iter_gzip
+from pydomo.Transport import DomoAPITransport
+from tests.test_transport import FakeDomoServer
+
+
+class TestIterGzip(unittest.TestCase):
+
+    def test_round_trip_in_bounded_chunks(self):
+        with tempfile.TemporaryFile() as raw:
+            raw.write(os.urandom(50000) + b'a,b\n' * 10000)
+            raw.seek(0)
+            expected = raw.read()
+            raw.seek(0)
+            chunks = list(iter_gzip(raw, chunk_size=4096))
+
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(gzip.decompress(b''.join(chunks)), expected)
+
+
+class TestUploadGzipPartFromFile(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakeDomoServer()
+        self.server.route('PUT', '/v1/streams/1/executions/2/part/3', lambda h, b: (200, b'', {}))
+        transport = DomoAPITransport('id', 'secret', self.server.host, False,
+                                     logging.getLogger('pydomo.tests'), request_timeout=5, scope=None)
+        self.client = StreamClient(transport, transport.logger)
+        handle, self.path = tempfile.mkstemp(suffix='.csv')
+        with os.fdopen(handle, 'wb') as csvfile:
+            csvfile.write(b'1,hello\n' * 20000)
+
+    def tearDown(self):
+        self.server.stop()
+        os.remove(self.path)
+
+    def uploaded(self):
+        method, path, headers, body = self.server.calls[-1]
+        return headers, body
+
+    def test_stream_file_uses_chunked_encoding(self):
+        self.client.upload_gzip_part_from_file(1, 2, 3, self.path, stream_file=True, chunk_size=8192)
+
+        headers, body = self.uploaded()
+        self.assertEqual(headers.get('Transfer-Encoding'), 'chunked')
+        self.assertEqual(headers.get('Content-Encoding'), 'gzip')
+        self.assertEqual(gzip.decompress(body), b'1,hello\n' * 20000)
+
+    def test_buffered_upload_sends_content_length(self):
+        self.client.upload_gzip_part_from_file(1, 2, 3, self.path, stream_file=False, chunk_size=8192)
+
+        headers, body = self.uploaded()
+        self.assertEqual(int(headers.get('Content-Length')), len(body))
+        self.assertEqual(gzip.decompress(body), b'1,hello\n' * 20000)
+
+    def test_upload_part_accepts_str_bytes_and_buffers(self):
+        for body in ('1,é\n', '1,é\n'.encode('utf-8'), io.BytesIO('1,é\n'.encode('utf-8'))):
+            self.client.upload_part(1, 2, 3, body)
+
+            headers, sent = self.uploaded()
+            self.assertEqual(sent, '1,é\n'.encode('utf-8'))
+            self.assertEqual(int(headers.get('Content-Length')), len(sent))
+
+    def test_upload_part_sends_gzip_parts_as_gzip(self):
+        body = gzip.compress(b'1,a\n')
+        self.client.upload_part(1, 2, 3, io.BytesIO(body), compression='gzip')
+
+        headers, sent = self.uploaded()
+        self.assertEqual(sent, body)
+        self.assertEqual(headers.get('Content-Encoding'), 'gzip')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+import pandas as pd
+
+from pydomo.streams import StreamIndex
+from pydomo.utilities.UtilitiesClient import UtilitiesClient
+from tests.test_part_uploader import RecordingStreamClient
+
+
+class TestStreamIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.cache_dir, 'index.sqlite3')
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_put_get_and_discard(self):
+        index = StreamIndex('host a', self.path)
+        index.put_many([('ds-1', 1), ('ds-2', 2)])
+
+        self.assertEqual(index.get('ds-1'), 1)
+        self.assertEqual(index.get_many(['ds-1', 'ds-2', 'ds-3']), {'ds-1': 1, 'ds-2': 2})
+        index.discard('ds-1')
+        self.assertIsNone(index.get('ds-1'))
+
+    def test_namespaces_and_persistence(self):
+        StreamIndex('host a', self.path).put('ds-1', 1)
+
+        self.assertEqual(StreamIndex('host a', self.path).get('ds-1'), 1)
+        self.assertIsNone(StreamIndex('host b', self.path).get('ds-1'))
+
+
+class TestStreamIdLookup(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.index = StreamIndex('host', os.path.join(self.cache_dir, 'index.sqlite3'))
+        self.client = UtilitiesClient(Mock(), Mock(), stream_index=self.index)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_lookup_is_cached_across_clients(self):
+        self.client._get = Mock(return_value=[{'id': 5}])
+        self.assertEqual(self.client.get_stream_id('ds-1'), 5)
+        self.assertEqual(self.client.get_stream_id('ds-1'), 5)
+        self.assertEqual(self.client._get.call_count, 1)
+
+        other = UtilitiesClient(Mock(), Mock(), stream_index=self.index)
+        other._get = Mock()
+        self.assertEqual(other.get_stream_id('ds-1'), 5)
+        other._get.assert_not_called()
+
+    def test_resolve_stream_ids_pages_until_all_found(self):
+        streams = [{'id': i, 'dataSet': {'id': 'ds-{}'.format(i)}} for i in range(2000)]
+        self.client.stream.list = Mock(side_effect=lambda limit, offset: streams[offset:offset + limit])
+        self.index.put('ds-1999', 1999)
+
+        resolved = self.client.resolve_stream_ids(['ds-3', 'ds-700', 'ds-1999', 'missing-ds'], max_workers=1)
+
+        self.assertEqual(resolved, {'ds-3': 3, 'ds-700': 700, 'ds-1999': 1999})
+        # all 2000 streams are listed looking for 'missing-ds', 500 at a time
+        self.assertEqual(self.client.stream.list.call_count, 5)
+        self.assertEqual(self.index.get('ds-1500'), 1500)
+
+        self.client.stream.list.reset_mock()
+        self.assertEqual(self.client.resolve_stream_ids(['ds-3', 'ds-4']), {'ds-3': 3, 'ds-4': 4})
+        self.client.stream.list.assert_not_called()
+
+    def test_stale_stream_id_is_refreshed(self):
+        self.index.put('ds-1', 41)
+        stream = RecordingStreamClient()
+        stream.create_execution = Mock(side_effect=lambda stream_id: self.fail_unless_42(stream_id))
+        self.client.stream = stream
+        self.client.domo_schema = Mock(return_value=[{'type': 'LONG', 'name': 'a'}])
+        self.client._get = Mock(return_value=[{'id': 42}])
+
+        result = self.client.stream_upload('ds-1', pd.DataFrame({'a': [1, 2]}))
+
+        self.assertEqual(result['currentState'], 'SUCCESS')
+        self.assertEqual(self.index.get('ds-1'), 42)
+
+    @staticmethod
+    def fail_unless_42(stream_id):
+        if stream_id != 42:
+            raise Exception('Error creating a Stream Execution: 404')
+        return {'id': 7}
+
+
+if __name__ == '__main__':
+    unittest.main()
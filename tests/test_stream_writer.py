@@ -0,0 +1,97 @@
+import time
+import unittest
+from unittest.mock import Mock
+
+import pandas as pd
+
+from pydomo.streams import StreamWriter
+from tests.test_part_uploader import RecordingStreamClient
+
+
+class FlakyStreamClient(RecordingStreamClient):
+    """Fails the first upload attempt of each part listed in `fail_once`."""
+
+    def __init__(self, fail_once=()):
+        super(FlakyStreamClient, self).__init__()
+        self.fail_once = set(fail_once)
+        self.logger = Mock()
+        self.executions = []
+
+    def create_execution(self, stream_id, update_method=None):
+        self.executions.append(update_method)
+        return {'id': len(self.executions)}
+
+    def upload_part(self, stream_id, execution_id, part_num, csv, compression=None):
+        if part_num in self.fail_once:
+            self.fail_once.discard(part_num)
+            raise Exception('Error uploading part {}'.format(part_num))
+        super(FlakyStreamClient, self).upload_part(stream_id, execution_id, part_num, csv, compression)
+
+
+class TestStreamWriter(unittest.TestCase):
+
+    def writer(self, stream, **kwargs):
+        kwargs.setdefault('flush_interval', None)
+        kwargs.setdefault('commit_interval', None)
+        return StreamWriter(stream, 5, **kwargs)
+
+    def test_small_writes_become_one_part(self):
+        stream = FlakyStreamClient()
+        with self.writer(stream) as writer:
+            for i in range(1000):
+                writer.write('{},event'.format(i))
+
+        self.assertEqual(list(stream.parts), [0])
+        self.assertEqual(stream.parts[0].split(), ['{},event'.format(i) for i in range(1000)])
+        self.assertEqual(stream.executions, ['APPEND'])
+        self.assertEqual(stream.committed, [1])
+        self.assertEqual(writer.metrics.get('writes'), 1000)
+        with self.assertRaises(ValueError):
+            writer.write('1,late')
+
+    def test_parts_are_cut_at_part_bytes(self):
+        stream = FlakyStreamClient()
+        writer = self.writer(stream, part_bytes=100, spill_bytes=50)
+        for i in range(30):
+            writer.write(pd.DataFrame({'a': [i], 'b': ['row {}'.format(i)]}))
+        self.assertEqual(stream.committed, [])
+        writer.close()
+
+        self.assertGreater(len(stream.parts), 2)
+        rows = ''.join(stream.parts[i] for i in range(len(stream.parts))).splitlines()
+        self.assertEqual(rows, ['{},row {}'.format(i, i) for i in range(30)])
+        self.assertEqual(stream.committed, [1])
+
+    def test_failed_part_is_sent_again(self):
+        stream = FlakyStreamClient(fail_once=[0])
+        writer = self.writer(stream, compression='gzip')
+        writer.write(b'1,a\n')
+        with self.assertRaises(Exception):
+            writer.flush()
+        writer.write(b'2,b\n')
+        writer.commit()
+
+        self.assertEqual(stream.parts, {0: '1,a\n', 1: '2,b\n'})
+        self.assertEqual(set(stream.compressions.values()), {'gzip'})
+        self.assertIsNone(writer.commit())
+        self.assertEqual(stream.committed, [1])
+
+    def test_scheduled_flush_and_commit(self):
+        stream = FlakyStreamClient()
+        writer = self.writer(stream, flush_interval=0.02, commit_interval=0.3)
+        try:
+            writer.write('1,a')
+            deadline = time.monotonic() + 2
+            while not stream.parts and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(stream.parts, {0: '1,a\n'})
+            self.assertEqual(stream.committed, [])
+            while not stream.committed and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(stream.committed, [1])
+        finally:
+            writer.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import logging
+import os
+import shutil
+import stat
+import tempfile
+import threading
+import unittest
+
+from pydomo.TokenCache import FileTokenCache
+from pydomo.Transport import DomoAPITransport
+from tests.test_transport import FakeDomoServer, make_token
+
+
+class TestFileTokenCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.server = FakeDomoServer()
+        self.server.route('GET', '/v1/users/', lambda h, b: (200, [], {}))
+
+    def tearDown(self):
+        self.server.stop()
+        shutil.rmtree(self.cache_dir)
+
+    def make_transport(self, scope=None):
+        return DomoAPITransport('id', 'secret', self.server.host, False, logging.getLogger('pydomo.tests'),
+                                request_timeout=5, scope=scope, token_cache=FileTokenCache(self.cache_dir))
+
+    def test_transports_reuse_cached_token(self):
+        first = self.make_transport()
+        second = self.make_transport()
+
+        self.assertEqual(self.server.token_calls, 1)
+        self.assertEqual(first.access_token, second.access_token)
+        first.close()
+        second.close()
+
+    def test_concurrent_startup_fetches_once(self):
+        transports = []
+        threads = [threading.Thread(target=lambda: transports.append(self.make_transport())) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(transports), 8)
+        self.assertEqual(self.server.token_calls, 1)
+
+    def test_scope_is_part_of_key(self):
+        self.make_transport(scope=['data'])
+        self.make_transport(scope=['user'])
+
+        self.assertEqual(self.server.token_calls, 2)
+
+    def test_expiring_token_is_not_reused(self):
+        self.server.token_factory = lambda: make_token(exp_offset=30)
+        self.make_transport()
+        self.server.token_factory = make_token
+        self.make_transport()
+
+        self.assertEqual(self.server.token_calls, 2)
+
+    def test_rejected_token_is_replaced_in_cache(self):
+        first = self.make_transport()
+        rejected = first.access_token
+        first.token_provider.invalidate(rejected)
+        first.get('/v1/users/', {}).json()
+
+        second = self.make_transport()
+        self.assertNotEqual(second.access_token, rejected)
+        self.assertEqual(second.access_token, first.access_token)
+
+    def test_cache_files_are_private(self):
+        self.make_transport()
+        token_files = [f for f in os.listdir(self.cache_dir) if f.endswith('.json')]
+
+        self.assertEqual(len(token_files), 1)
+        mode = os.stat(os.path.join(self.cache_dir, token_files[0])).st_mode
+        self.assertEqual(stat.S_IMODE(mode), 0o600)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import logging
+import threading
+import time
+import unittest
+
+from pydomo.TokenProvider import TokenProvider
+from pydomo.Transport import DomoAPITransport
+from tests.test_transport import FakeDomoServer, make_token
+
+
+class CountingFetch(object):
+
+    def __init__(self, lifetime=3600, delay=0.0):
+        self.lifetime = lifetime
+        self.delay = delay
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self):
+        time.sleep(self.delay)
+        with self.lock:
+            self.calls += 1
+            return 'token-{}'.format(self.calls), time.time() + self.lifetime
+
+
+class TestTokenProvider(unittest.TestCase):
+
+    def setUp(self):
+        self.logger = logging.getLogger('pydomo.tests')
+
+    def test_concurrent_callers_share_one_renewal(self):
+        fetch = CountingFetch(delay=0.05)
+        provider = TokenProvider(fetch, self.logger)
+        tokens = []
+
+        threads = [threading.Thread(target=lambda: tokens.append(provider.get_token())) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(fetch.calls, 1)
+        self.assertEqual(set(tokens), {'token-1'})
+
+    def test_renews_in_background_before_expiry(self):
+        fetch = CountingFetch(lifetime=30)
+        provider = TokenProvider(fetch, self.logger, refresh_margin=60)
+        provider.renew()
+
+        # still valid, so the current token is returned while renewing
+        self.assertEqual(provider.get_token(), 'token-1')
+        for _ in range(100):
+            if provider.access_token == 'token-2':
+                break
+            time.sleep(0.01)
+        self.assertEqual(provider.access_token, 'token-2')
+
+    def test_invalidate_only_affects_matching_token(self):
+        fetch = CountingFetch()
+        provider = TokenProvider(fetch, self.logger)
+        provider.renew()
+
+        provider.invalidate('some-older-token')
+        self.assertEqual(provider.get_token(), 'token-1')
+        provider.invalidate('token-1')
+        self.assertEqual(provider.get_token(), 'token-2')
+
+
+class TestTransportTokenRetry(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakeDomoServer()
+        self.transport = DomoAPITransport('id', 'secret', self.server.host, False,
+                                          logging.getLogger('pydomo.tests'), request_timeout=5, scope=None)
+
+    def tearDown(self):
+        self.transport.close()
+        self.server.stop()
+
+    def test_unauthorized_request_is_retried_with_new_token(self):
+        rejected = self.transport.access_token
+
+        def handler(request, body):
+            if request.headers['Authorization'] == 'bearer ' + rejected:
+                return 401, b'expired', {}
+            return 200, {'ok': True}, {}
+        self.server.route('PUT', '/v1/groups/1', handler)
+
+        response = self.transport.put('/v1/groups/1', {'name': 'g'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.server.token_calls, 2)
+        self.assertNotEqual(self.transport.access_token, rejected)
+
+    def test_expired_token_is_renewed_before_request(self):
+        self.server.token_factory = lambda: make_token(exp_offset=-10)
+        self.transport._renew_access_token()
+        self.server.token_factory = make_token
+        self.server.route('GET', '/v1/users/', lambda h, b: (200, [], {}))
+
+        self.transport.get('/v1/users/', {}).json()
+
+        self.assertEqual(self.server.token_calls, 3)
+        self.assertGreater(self.transport.token_expiration, time.time())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+import base64
+import itertools
+import json
+import logging
+import sys
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from pydomo.Transport import DomoAPITransport
+
+
+TOKEN_IDS = itertools.count()
+
+
+def make_token(exp_offset=3600):
+    """Build a unique unsigned JWT carrying an 'exp' claim."""
+    def encode(obj):
+        raw = json.dumps(obj).encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('utf-8').rstrip('=')
+    payload = {'exp': int(time.time()) + exp_offset, 'jti': next(TOKEN_IDS)}
+    return '{}.{}.sig'.format(encode({'alg': 'none'}), encode(payload))
+
+
+class FakeDomoHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body=b'', headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self):
+        if self.headers.get('Transfer-Encoding') == 'chunked':
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().strip(), 16)
+                chunk = self.rfile.read(size)
+                self.rfile.readline()
+                if not size:
+                    return b''.join(chunks)
+                chunks.append(chunk)
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length)
+
+    def _dispatch(self):
+        server = self.server
+        body = self._read_body()
+        with server.lock:
+            server.calls.append((self.command, self.path, dict(self.headers), body))
+        if self.path.startswith('/oauth/token'):
+            with server.lock:
+                server.token_calls += 1
+            token = server.token_factory()
+            return self._send(200, json.dumps({'access_token': token}).encode('utf-8'),
+                              {'Content-Type': 'application/json'})
+        handler = server.routes.get((self.command, self.path.split('?')[0]))
+        if handler is None:
+            return self._send(404, b'not found')
+        status, payload, headers = handler(self, body)
+        if not isinstance(payload, bytes):
+            payload = json.dumps(payload).encode('utf-8')
+        self._send(status, payload, headers)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _dispatch
+
+
+class FakeDomoServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), FakeDomoHandler)
+        self.lock = threading.Lock()
+        self.calls = []
+        self.routes = {}
+        self.token_calls = 0
+        self.token_factory = make_token
+        self.thread = threading.Thread(target=self.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+
+    @property
+    def host(self):
+        return '127.0.0.1:{}'.format(self.server_address[1])
+
+    def handle_error(self, request, client_address):
+        # Clients dropping keep-alive connections are expected, not errors
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+    def route(self, method, path, handler):
+        self.routes[(method, path)] = handler
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class TestDomoAPITransportPooling(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakeDomoServer()
+        self.server.route('GET', '/v1/users/', lambda h, b: (200, [], {}))
+        self.logger = logging.getLogger('pydomo.tests')
+
+    def tearDown(self):
+        self.server.stop()
+
+    def make_transport(self, **kwargs):
+        return DomoAPITransport('id', 'secret', self.server.host, False, self.logger,
+                                request_timeout=5, scope=None, **kwargs)
+
+    def test_connections_are_reused(self):
+        transport = self.make_transport()
+        for _ in range(5):
+            response = transport.get('/v1/users/', {})
+            self.assertEqual(response.json(), [])
+
+        stats = transport.pool_stats()
+        self.assertEqual(len(stats), 1)
+        host_stats = list(stats.values())[0]
+        # one token request and five API calls over a single connection
+        self.assertEqual(host_stats['requests'], 6)
+        self.assertEqual(host_stats['connections_opened'], 1)
+        transport.close()
+
+    def test_pool_size_is_configurable(self):
+        transport = self.make_transport(pool_maxsize=3)
+        transport.get('/v1/users/', {}).json()
+        host_stats = list(transport.pool_stats().values())[0]
+        self.assertEqual(host_stats['maxsize'], 3)
+        transport.close()
+
+    def test_close_releases_pools(self):
+        transport = self.make_transport()
+        transport.get('/v1/users/', {}).json()
+        transport.close()
+        self.assertEqual(transport.pool_stats(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+import pandas as pd
+
+from pydomo.streams import UploadManifest
+from pydomo.utilities.UtilitiesClient import UtilitiesClient
+from tests.test_part_uploader import RecordingStreamClient
+
+
+class TestUploadManifest(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.path = UploadManifest.path_for('https://api.domo.com', 42, self.cache_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_tracked_parts_are_saved(self):
+        manifest = UploadManifest(self.path, 42, 7, 10, 3)
+        body = io.BytesIO(b'1,a\n')
+        self.assertIs(manifest.track(0, body, 'gzip'), body)
+        manifest.record(0, 4)
+
+        loaded = UploadManifest.load(self.path)
+        self.assertEqual((loaded.stream_id, loaded.execution_id, loaded.rows, loaded.rows_per_part),
+                         (42, 7, 10, 3))
+        self.assertIsNone(loaded.track(0, io.BytesIO(b'1,a\n')))
+        self.assertIsNotNone(loaded.track(0, io.BytesIO(b'1,b\n')))
+        self.assertEqual(loaded.compression_of(0), 'gzip')
+        self.assertEqual(loaded.compression_of(1, 'default'), 'default')
+
+    def test_missing_or_corrupt_manifest(self):
+        self.assertIsNone(UploadManifest.load(self.path))
+        with open(self.path, 'w') as manifest_file:
+            manifest_file.write('{"stream_id": ')
+        self.assertIsNone(UploadManifest.load(self.path))
+
+    def test_paths_are_per_host_and_stream(self):
+        self.assertNotEqual(self.path, UploadManifest.path_for('https://api.domo.com', 43, self.cache_dir))
+        self.assertNotEqual(self.path, UploadManifest.path_for('https://other', 42, self.cache_dir))
+
+
+class TestResumableUpload(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        environ = patch.dict(os.environ, {'PYDOMO_CACHE_DIR': self.cache_dir})
+        environ.start()
+        self.addCleanup(environ.stop)
+        self.client = UtilitiesClient(Mock(), Mock())
+        self.client.transport.apiHost = 'https://api.domo.com'
+        self.client.domo_schema = Mock(return_value=[{'type': 'LONG', 'name': 'a'}])
+        self.client.get_stream_id = Mock(return_value=42)
+        self.client.estimate_chunk_rows = Mock(return_value=3)
+        self.df = pd.DataFrame({'a': range(10)})
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def manifest(self):
+        return UploadManifest.load(UploadManifest.path_for('https://api.domo.com', 42))
+
+    def test_rerun_uploads_only_missing_parts(self):
+        self.client.stream = RecordingStreamClient(fail_part=2)
+        with self.assertRaises(Exception):
+            self.client.stream_upload(42, self.df, max_workers=1, resumable=True)
+        self.assertEqual(self.client.stream.aborted, [])
+        self.assertEqual(sorted(self.manifest().parts), [0, 1])
+
+        self.client.stream = RecordingStreamClient()
+        self.client.stream.create_execution = Mock(side_effect=AssertionError('new execution'))
+        self.client.stream_upload(42, self.df, resumable=True)
+
+        self.assertEqual(sorted(self.client.stream.parts), [2, 3])
+        self.assertEqual(self.client.stream.parts[2], '6\n7\n8\n')
+        self.assertEqual(self.client.stream.committed, [7])
+        self.assertIsNone(self.manifest())
+
+    def test_changed_parts_are_uploaded_again(self):
+        self.client.stream = RecordingStreamClient(fail_part=3)
+        with self.assertRaises(Exception):
+            self.client.stream_upload(42, self.df, max_workers=1, compression='gzip', resumable=True)
+
+        self.client.stream = RecordingStreamClient()
+        changed = self.df.copy()
+        changed.loc[4, 'a'] = 40
+        self.client.stream_upload(42, changed, compression='gzip', resumable=True)
+
+        self.assertEqual(sorted(self.client.stream.parts), [1, 3])
+        self.assertEqual(self.client.stream.parts[1], '3\n40\n5\n')
+
+    def test_closed_or_mismatched_execution_starts_over(self):
+        self.client.stream = RecordingStreamClient(fail_part=2)
+        with self.assertRaises(Exception):
+            self.client.stream_upload(42, self.df, max_workers=1, resumable=True)
+
+        self.client.stream = RecordingStreamClient()
+        self.client.stream.create_execution = Mock(return_value={'id': 8})
+        self.client.stream_upload(42, self.df.iloc[:9], resumable=True)
+
+        self.assertEqual(self.client.stream.aborted, [7])
+        self.assertEqual(sorted(self.client.stream.parts), [0, 1, 2])
+        self.assertEqual(self.client.stream.committed, [8])
+
+
+if __name__ == '__main__':
+    unittest.main()
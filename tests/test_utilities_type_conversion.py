@@ -156,6 +156,66 @@ class TestUtilitiesTypeConversion(unittest.TestCase):
             self.assertEqual(result, expected_output,
                            f'Failed for string input: {input_str}')
 
+    def test_schema_to_pandas_types(self):
+        columns = [
+            {'type': 'LONG', 'name': 'id'},
+            {'type': 'DATETIME', 'name': 'updated'},
+            {'type': 'DOUBLE', 'name': 'amount'},
+            {'type': 'DATE', 'name': 'day'},
+        ]
+
+        dtype_dict, date_columns = self.client.schema_to_pandas_types(columns)
+
+        self.assertEqual(dtype_dict, {'id': 'Int64', 'amount': 'Float64'})
+        self.assertEqual(date_columns, ['updated', 'day'])
+
+
+class TestDateInference(unittest.TestCase):
+
+    CSV = ('id,name,day,stamp,code\n'
+           '1,alpha,2024-01-31,2024-01-31T10:00:00,2024-XX\n'
+           '2,beta,2024-02-01,2024-02-01T11:30:00,2024-YY\n'
+           '3,,2024-02-02,,2024-ZZ\n')
+
+    def setUp(self):
+        self.client = UtilitiesClient(Mock(), Mock())
+
+    def read(self, **kwargs):
+        from io import StringIO
+        return self.client.read_content_to_dataframe(StringIO(self.CSV), **kwargs)
+
+    def test_only_date_columns_are_converted(self):
+        df = self.read()
+
+        self.assertTrue(str(df['day'].dtype).startswith('datetime64'))
+        self.assertTrue(str(df['stamp'].dtype).startswith('datetime64'))
+        self.assertEqual(df['stamp'][1], pd.Timestamp('2024-02-01 11:30:00'))
+        self.assertTrue(pd.isna(df['stamp'][2]))
+        self.assertFalse(str(df['name'].dtype).startswith('datetime64'))
+        self.assertFalse(str(df['code'].dtype).startswith('datetime64'))
+        self.assertEqual(str(df['id'].dtype), 'int64')
+
+    def test_detect_date_format(self):
+        self.assertEqual(self.client.detect_date_format(pd.Series(['01/31/2024', None])), '%m/%d/%Y')
+        self.assertIsNone(self.client.detect_date_format(pd.Series(['tomorrow', 'later'])))
+        self.assertIsNone(self.client.detect_date_format(pd.Series([None, None], dtype=object)))
+
+    def test_formats_are_cached_per_dataset(self):
+        self.read(dataset_id='ds')
+        self.client.detect_date_format = Mock(side_effect=AssertionError('detection should be skipped'))
+
+        df = self.read(dataset_id='ds')
+
+        self.assertTrue(str(df['day'].dtype).startswith('datetime64'))
+        self.assertFalse(str(df['code'].dtype).startswith('datetime64'))
+
+    def test_explicit_formats(self):
+        df = self.read(date_formats={'code': '%Y-XX', 'day': None})
+
+        self.assertFalse(str(df['day'].dtype).startswith('datetime64'))
+        # a format that does not fit the whole column leaves it as text
+        self.assertFalse(str(df['code'].dtype).startswith('datetime64'))
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file